@@ -293,8 +293,7 @@ async def convert_sam_to_bam(
         sam_data = content.decode('utf-8')
         
         # Use external tool manager for conversion
-        from ..services.external_tool_manager import ExternalToolManager
-        tool_manager = ExternalToolManager()
+        from ..services.external_tool_manager import external_tool_manager as tool_manager
         
         # This would use samtools in Docker container
         result = await tool_manager.execute_custom_container(
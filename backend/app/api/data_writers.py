@@ -20,6 +20,9 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/v1/data-writers", tags=["Data Writers"])
 
+# Read size for streamed downloads
+STREAM_CHUNK_SIZE = 1024 * 1024
+
 # Initialize services
 data_writers_service = DataWritersService()
 file_handler = FileHandler()
@@ -35,29 +38,10 @@ async def write_fasta_file(
     parameters: Dict[str, Any] = {}
 ):
     """Write sequences to FASTA format"""
-    try:
-        if not sequences:
-            raise HTTPException(status_code=400, detail="No sequences provided")
-        
-        result = await data_writers_service.write_sequences(
-            sequences=sequences,
-            format_type="fasta",
-            filename=filename,
-            parameters=parameters
-        )
-        
-        if "error" in result:
-            raise HTTPException(status_code=400, detail=result["error"])
-        
-        return {
-            "status": "success",
-            "operation": result,
-            "download_url": f"/api/v1/data-writers/download/{result['operation_id']}"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error writing FASTA file: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to write FASTA: {str(e)}")
+    if not sequences:
+        raise HTTPException(status_code=400, detail="No sequences provided")
+    
+    return await _write_format(sequences, "fasta", filename, parameters)
 
 @router.post("/write-fastq", response_model=Dict[str, Any])
 async def write_fastq_file(
@@ -66,37 +50,18 @@ async def write_fastq_file(
     parameters: Dict[str, Any] = {}
 ):
     """Write sequences with quality scores to FASTQ format"""
-    try:
-        if not sequences:
-            raise HTTPException(status_code=400, detail="No sequences provided")
-        
-        # Validate that sequences have quality scores
-        for seq in sequences:
-            if 'quality' not in seq:
-                raise HTTPException(
-                    status_code=400, 
-                    detail=f"Sequence {seq.get('id', 'unknown')} missing quality scores for FASTQ format"
-                )
-        
-        result = await data_writers_service.write_sequences(
-            sequences=sequences,
-            format_type="fastq",
-            filename=filename,
-            parameters=parameters
-        )
-        
-        if "error" in result:
-            raise HTTPException(status_code=400, detail=result["error"])
-        
-        return {
-            "status": "success",
-            "operation": result,
-            "download_url": f"/api/v1/data-writers/download/{result['operation_id']}"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error writing FASTQ file: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to write FASTQ: {str(e)}")
+    if not sequences:
+        raise HTTPException(status_code=400, detail="No sequences provided")
+    
+    # Validate that sequences have quality scores
+    for seq in sequences:
+        if 'quality' not in seq:
+            raise HTTPException(
+                status_code=400, 
+                detail=f"Sequence {seq.get('id', 'unknown')} missing quality scores for FASTQ format"
+            )
+    
+    return await _write_format(sequences, "fastq", filename, parameters)
 
 @router.post("/write-gff3", response_model=Dict[str, Any])
 async def write_gff3_file(
@@ -105,29 +70,10 @@ async def write_gff3_file(
     parameters: Dict[str, Any] = {}
 ):
     """Write annotations to GFF3 format"""
-    try:
-        if not annotations:
-            raise HTTPException(status_code=400, detail="No annotations provided")
-        
-        result = await data_writers_service.write_sequences(
-            sequences=annotations,
-            format_type="gff3",
-            filename=filename,
-            parameters=parameters
-        )
-        
-        if "error" in result:
-            raise HTTPException(status_code=400, detail=result["error"])
-        
-        return {
-            "status": "success",
-            "operation": result,
-            "download_url": f"/api/v1/data-writers/download/{result['operation_id']}"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error writing GFF3 file: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to write GFF3: {str(e)}")
+    if not annotations:
+        raise HTTPException(status_code=400, detail="No annotations provided")
+    
+    return await _write_format(annotations, "gff3", filename, parameters)
 
 @router.post("/write-bed", response_model=Dict[str, Any])
 async def write_bed_file(
@@ -136,29 +82,10 @@ async def write_bed_file(
     parameters: Dict[str, Any] = {}
 ):
     """Write genomic features to BED format"""
-    try:
-        if not features:
-            raise HTTPException(status_code=400, detail="No features provided")
-        
-        result = await data_writers_service.write_sequences(
-            sequences=features,
-            format_type="bed",
-            filename=filename,
-            parameters=parameters
-        )
-        
-        if "error" in result:
-            raise HTTPException(status_code=400, detail=result["error"])
-        
-        return {
-            "status": "success",
-            "operation": result,
-            "download_url": f"/api/v1/data-writers/download/{result['operation_id']}"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error writing BED file: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to write BED: {str(e)}")
+    if not features:
+        raise HTTPException(status_code=400, detail="No features provided")
+    
+    return await _write_format(features, "bed", filename, parameters)
 
 @router.post("/write-vcf", response_model=Dict[str, Any])
 async def write_vcf_file(
@@ -167,29 +94,10 @@ async def write_vcf_file(
     parameters: Dict[str, Any] = {}
 ):
     """Write variants to VCF format"""
-    try:
-        if not variants:
-            raise HTTPException(status_code=400, detail="No variants provided")
-        
-        result = await data_writers_service.write_sequences(
-            sequences=variants,
-            format_type="vcf",
-            filename=filename,
-            parameters=parameters
-        )
-        
-        if "error" in result:
-            raise HTTPException(status_code=400, detail=result["error"])
-        
-        return {
-            "status": "success",
-            "operation": result,
-            "download_url": f"/api/v1/data-writers/download/{result['operation_id']}"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error writing VCF file: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to write VCF: {str(e)}")
+    if not variants:
+        raise HTTPException(status_code=400, detail="No variants provided")
+    
+    return await _write_format(variants, "vcf", filename, parameters)
 
 @router.post("/write-sam", response_model=Dict[str, Any])
 async def write_sam_file(
@@ -198,29 +106,10 @@ async def write_sam_file(
     parameters: Dict[str, Any] = {}
 ):
     """Write alignments to SAM format"""
-    try:
-        if not alignments:
-            raise HTTPException(status_code=400, detail="No alignments provided")
-        
-        result = await data_writers_service.write_sequences(
-            sequences=alignments,
-            format_type="sam",
-            filename=filename,
-            parameters=parameters
-        )
-        
-        if "error" in result:
-            raise HTTPException(status_code=400, detail=result["error"])
-        
-        return {
-            "status": "success",
-            "operation": result,
-            "download_url": f"/api/v1/data-writers/download/{result['operation_id']}"
-        }
-        
-    except Exception as e:
-        logger.error(f"Error writing SAM file: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"Failed to write SAM: {str(e)}")
+    if not alignments:
+        raise HTTPException(status_code=400, detail="No alignments provided")
+    
+    return await _write_format(alignments, "sam", filename, parameters)
 
 # ============================================================================
 # MULTI-FORMAT WRITING ENDPOINTS
@@ -619,8 +508,11 @@ async def stream_large_file(operation_id: str):
         file_path = matching_files[0]
         
         def iterfile():
+            # Fixed-size reads; iterating a binary file splits on newlines, which
+            # turns a FASTA/VCF download into millions of tiny chunks
             with open(file_path, mode="rb") as file_like:
-                yield from file_like
+                while chunk := file_like.read(STREAM_CHUNK_SIZE):
+                    yield chunk
         
         return StreamingResponse(
             iterfile(),
@@ -691,8 +583,8 @@ async def validate_data_for_format(
 
 @router.post("/cleanup")
 async def cleanup_old_files(
-    max_age_hours: int = Query(24, ge=1, le=168),  # 1 hour to 1 week
-    background_tasks: BackgroundTasks
+    background_tasks: BackgroundTasks,
+    max_age_hours: int = Query(24, ge=1, le=168)  # 1 hour to 1 week
 ):
     """Clean up old output files"""
     try:
@@ -750,6 +642,29 @@ async def get_disk_usage():
 # HELPER FUNCTIONS
 # ============================================================================
 
+async def _write_format(
+    records: List[Dict[str, Any]],
+    format_type: str,
+    filename: Optional[str],
+    parameters: Dict[str, Any]
+) -> Dict[str, Any]:
+    """Write records in one format and build the endpoint response"""
+    result = await data_writers_service.write_sequences(
+        sequences=records,
+        format_type=format_type,
+        filename=filename,
+        parameters=parameters
+    )
+    
+    if "error" in result:
+        raise HTTPException(status_code=400, detail=result["error"])
+    
+    return {
+        "status": "success",
+        "operation": result,
+        "download_url": f"/api/v1/data-writers/download/{result['file_info']['filename']}"
+    }
+
 async def _execute_batch_write(
     batch_id: str,
     sequence_batches: List[List[Dict[str, Any]]],
@@ -772,10 +687,12 @@ def _get_format_example_parameters(format_name: str) -> Dict[str, Any]:
     examples = {
         "fasta": {
             "line_length": 80,
-            "include_description": True
+            "include_description": True,
+            "strict_schema": False
         },
         "fastq": {
-            "quality_encoding": "phred33"
+            "quality_encoding": "phred33",
+            "strict_schema": False
         },
         "gff3": {
             "version": "3.2.1",
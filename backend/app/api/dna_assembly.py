@@ -428,13 +428,13 @@ async def analyze_assembly_statistics(contigs: List[Dict[str, Any]]):
         
         # Add additional analysis
         contig_lengths = [contig.get("length", 0) for contig in contigs]
-        total_length = sum(contig_lengths)
+        nx_stats = dna_assembly_service._calculate_nx_stats(contig_lengths)
         
         enhanced_stats = {
             **basic_stats,
             "contiguity_metrics": {
-                "n50": dna_assembly_service._calculate_n50(sorted(contig_lengths, reverse=True), total_length),
-                "l50": dna_assembly_service._calculate_l50(sorted(contig_lengths, reverse=True), total_length),
+                "n50": nx_stats["n50"],
+                "l50": nx_stats["l50"],
                 "largest_contig": max(contig_lengths) if contig_lengths else 0,
                 "smallest_contig": min(contig_lengths) if contig_lengths else 0
             },
@@ -706,8 +706,7 @@ def _evaluate_assembly_score(result: Dict[str, Any], metric: str) -> float:
     
     if metric == "n50":
         lengths = [contig.get("length", 0) for contig in contigs]
-        total_length = sum(lengths)
-        return dna_assembly_service._calculate_n50(sorted(lengths, reverse=True), total_length)
+        return dna_assembly_service._calculate_nx_stats(lengths)["n50"]
     
     elif metric == "total_length":
         return sum(contig.get("length", 0) for contig in contigs)
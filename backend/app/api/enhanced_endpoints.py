@@ -10,7 +10,7 @@ import logging
 
 from ..models.enhanced_models import *
 from ..builders.sequence_builder import SequenceBuilder, AnalysisPipelineBuilder
-from ..services.external_tool_manager import ExternalToolManager
+from ..services.external_tool_manager import external_tool_manager
 from ..services.caching_manager import BioinformaticsCacheManager, cache_blast_search, cache_alignment
 from ..database.database_setup import DatabaseManager
 from ..utils.file_handlers import FileHandler
@@ -21,7 +21,7 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/v1", tags=["Enhanced Bioinformatics API"])
 
 # Initialize services
-external_tools = ExternalToolManager()
+external_tools = external_tool_manager
 cache_manager = BioinformaticsCacheManager()
 connection_manager = ConnectionManager()
 file_handler = FileHandler()
@@ -422,12 +422,12 @@ async def execute_pipeline_background(
             )
             
             if step_type == "blast_search":
-                for seq in sequences:
-                    result = await external_tools.execute_blast_search(
-                        seq["sequence"], 
-                        params["database"], 
-                        params
-                    )
+                batch = await external_tools.execute_blast_search_batch(
+                    [seq["sequence"] for seq in sequences],
+                    params["database"],
+                    params
+                )
+                for seq, result in zip(sequences, batch):
                     results[f"{step_type}_{seq['_id']}"] = result
             
             elif step_type == "multiple_alignment":
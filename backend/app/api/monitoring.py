@@ -8,7 +8,7 @@ from datetime import datetime, timedelta
 import logging
 from pydantic import BaseModel, Field
 
-from ..services.external_tool_manager import ExternalToolManager
+from ..services.external_tool_manager import external_tool_manager
 from ..services.caching_manager import BioinformaticsCacheManager
 from ..database.database_setup import DatabaseManager
 from ..websockets.connection_manager import ConnectionManager
@@ -478,8 +478,7 @@ async def get_container_status():
 async def get_container_resource_usage(container_id: str):
     """Get resource usage for specific container"""
     try:
-        external_tools = ExternalToolManager()
-        resource_usage = await external_tools.monitor_container_resources(container_id)
+        resource_usage = await external_tool_manager.monitor_container_resources(container_id)
         
         return {
             "status": "success",
@@ -794,8 +793,7 @@ async def _check_service_health(service_name: str) -> ServiceStatus:
             
         elif service_name == "external_tools":
             # Test external tools
-            tools_manager = ExternalToolManager()
-            if tools_manager._is_docker_available():
+            if external_tool_manager._is_docker_available():
                 status = "healthy"
                 error_message = None
             else:
@@ -568,8 +568,7 @@ async def export_alignments_bam(
         sam_data = await _generate_sam_content(mapped_reads, reference_info)
         
         # Convert to BAM using external tools
-        from ..services.external_tool_manager import ExternalToolManager
-        tool_manager = ExternalToolManager()
+        from ..services.external_tool_manager import external_tool_manager as tool_manager
         
         conversion_result = await tool_manager.execute_custom_container(
             image="biocontainers/samtools:v1.9_cv2",
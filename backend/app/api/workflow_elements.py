@@ -1,8 +1,9 @@
 # backend/app/api/workflow_elements.py
 from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, BackgroundTasks
+from fastapi.responses import JSONResponse
 from typing import List, Dict, Any, Optional
 from ..services.data_readers import DataReaderService
-from ..services.analysis_tools import AnalysisToolsService
+from ..services.analysis_tools import analysis_tools_service
 from ..services.workflow_engine import WorkflowEngine
 from ..models.enhanced_models import *
 from ..database.database_setup import DatabaseManager
@@ -11,7 +12,7 @@ router = APIRouter()
 
 # Initialize services (these would be dependency injected in production)
 data_reader = DataReaderService()
-analysis_tools = AnalysisToolsService()
+analysis_tools = analysis_tools_service
 
 # Workflow Elements Endpoints
 @router.get("/workflow/elements")
@@ -194,9 +195,12 @@ async def read_file_urls_endpoint(urls: List[str]):
 
 
 # Analysis Tool Endpoints
+# BLAST results hold only JSON types; JSONResponse encodes them directly
+# instead of through FastAPI's per-value jsonable_encoder walk, which
+# dominates response time for large hit lists
 @router.post("/analysis/blast")
 async def blast_search_endpoint(request: BlastSearchRequest):
-    return await analysis_tools.run_blast_search(
+    return JSONResponse(await analysis_tools.run_blast_search(
         request.sequences,
         request.database,
         {
@@ -204,7 +208,7 @@ async def blast_search_endpoint(request: BlastSearchRequest):
             "max_hits": request.max_hits,
             "word_size": request.word_size
         }
-    )
+    ))
 
 @router.post("/analysis/alignment")
 async def multiple_alignment_endpoint(request: MultipleAlignmentRequest):
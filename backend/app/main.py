@@ -78,14 +78,27 @@ async def lifespan(app: FastAPI):
             app.state.cache_manager = None
 
         try:
-            from .services.external_tool_manager import ExternalToolManager
-            external_tools = ExternalToolManager()
+            # The shared instance the API routers use, so shutdown stops every warm container
+            from .services.external_tool_manager import external_tool_manager
+            external_tools = external_tool_manager
+            external_tools.start_image_warmup()
             app.state.external_tools = external_tools
             logger.info("✅ External tools manager initialized")
         except Exception as e:
             logger.warning(f"⚠️  External tools initialization failed: {str(e)}.")
             app.state.external_tools = None
 
+        try:
+            # Compile the Numba kernels now, off the event loop, rather than
+            # inside the first alignment or FASTA write that needs them
+            from .services.multiple_alignment import warm_up_kernels as warm_up_alignment_kernels
+            from .services.data_writers import warm_up_kernels as warm_up_writer_kernels
+            await asyncio.to_thread(warm_up_alignment_kernels)
+            await asyncio.to_thread(warm_up_writer_kernels)
+            logger.info("✅ Compiled kernels ready")
+        except Exception as e:
+            logger.warning(f"⚠️  Kernel warm-up failed: {str(e)}. Kernels compile on first use.")
+
         try:
             from .websockets.connection_manager import ConnectionManager, AnalysisProgressTracker
             connection_manager = ConnectionManager()
@@ -153,6 +166,24 @@ async def lifespan(app: FastAPI):
                 logger.info("✅ Database connection closed")
             except Exception as e:
                 logger.error(f"Error closing database connection: {str(e)}")
+        if external_tools:
+            try:
+                await external_tools.close()
+                logger.info("✅ Tool containers stopped")
+            except Exception as e:
+                logger.error(f"Error stopping tool containers: {str(e)}")
+        try:
+            from .api.dna_assembly import dna_assembly_service
+            await dna_assembly_service.close()
+            logger.info("✅ Assembly tool containers stopped")
+        except Exception as e:
+            logger.error(f"Error stopping assembly tool containers: {str(e)}")
+        try:
+            from .services.analysis_tools import analysis_tools_service
+            await analysis_tools_service.close()
+            logger.info("✅ Analysis tool containers stopped")
+        except Exception as e:
+            logger.error(f"Error stopping analysis tool containers: {str(e)}")
         if cache_manager and hasattr(cache_manager, 'close'):
              try:
                 await cache_manager.close()
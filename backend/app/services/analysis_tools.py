@@ -1,23 +1,167 @@
 # backend/app/services/analysis_tools.py - FIXED VERSION
+import asyncio
+import atexit
+import os
 import random
+import shutil
 import tempfile
+import threading
 import subprocess
+import sys
 import logging
+import httpx
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import pandas as pd
+except ImportError:
+    pd = None
 
 logger = logging.getLogger(__name__)
 
+BLAST_IMAGE = "biocontainers/blast:2.12.0_cv1"
+BLAST_DATABASES_DIR = "/opt/blast_databases"
+
+# Seconds between checks on a running tool exec, doubling up to the maximum
+EXEC_POLL_INTERVAL = 0.05
+EXEC_POLL_MAX_INTERVAL = 2.0
+
+def _docker_socket_path() -> Optional[str]:
+    """Path of the Docker daemon's unix socket, or None if DOCKER_HOST is not one"""
+    host = os.environ.get("DOCKER_HOST", "unix:///var/run/docker.sock")
+    return host[len("unix://"):] if host.startswith("unix://") else None
+
+# Columns of BLAST tabular output (-outfmt 6) and their parsed types
+BLAST_TABULAR_COLUMNS = {
+    "query_id": str,
+    "subject_id": str,
+    "identity": float,
+    "alignment_length": int,
+    "mismatches": int,
+    "gap_opens": int,
+    "query_start": int,
+    "query_end": int,
+    "subject_start": int,
+    "subject_end": int,
+    "evalue": float,
+    "bit_score": float
+}
+
+_GAP = ord('-')
+_NUCLEOTIDE_CODES = 'ACGTUNacgtun'
+
+if np is not None:
+    # Shared generator for the mock results
+    _rng = np.random.default_rng()
+    _NUCLEOTIDE_BYTES = np.frombuffer(_NUCLEOTIDE_CODES.encode(), dtype=np.uint8)
+
+def _fasta_records(data: bytes) -> List[Tuple[str, bytes]]:
+    """(id, residues) of each record of FASTA data, records without an id skipped"""
+    # Anything before the first header is ignored
+    if not data.startswith(b'>'):
+        first = data.find(b'\n>')
+        data = data[first + 1:] if first >= 0 else b''
+    
+    # Split on record starts once; each body loses its line breaks in C
+    records = []
+    for record in data[1:].split(b'\n>') if data else []:
+        header, _, body = record.partition(b'\n')
+        seq_id = header.rstrip().decode()
+        if seq_id:
+            records.append((seq_id, body.translate(None, b' \t\r\n\x0b\x0c')))
+    return records
+
+def _alignment_matrix(rows: List[bytes], length: int) -> "np.ndarray":
+    """Aligned ASCII rows as an (N, length) uint8 matrix, short rows padded with gaps"""
+    if all(len(row) == length for row in rows):
+        return np.frombuffer(b"".join(rows), dtype=np.uint8).reshape(len(rows), length)
+    
+    matrix = np.full((len(rows), length), _GAP, dtype=np.uint8)
+    for target, row in zip(matrix, rows):
+        encoded = np.frombuffer(row[:length], dtype=np.uint8)
+        target[:len(encoded)] = encoded
+    return matrix
+
+# Leading characters of a sequence that decide nucleotide or protein;
+# resubmitted queries then classify with one cache lookup
+NUCLEOTIDE_SAMPLE_LENGTH = 256
+
+@lru_cache(maxsize=4096)
+def _sample_is_nucleotide(sample: str) -> bool:
+    """Whether over 80% of the characters of a non-empty sample are nucleotide codes"""
+    if np is None:
+        return sum(map(sample.count, _NUCLEOTIDE_CODES)) / len(sample) > 0.8
+    
+    # Byte histogram, read at the nucleotide codes of either case
+    codes = np.frombuffer(sample.encode('ascii', 'replace'), dtype=np.uint8)
+    counts = np.bincount(codes, minlength=256)
+    return bool(counts[_NUCLEOTIDE_BYTES].sum() / len(codes) > 0.8)
+
+def _alignment_stats_swar(rows: List[bytes], length: int) -> tuple:
+    """(total gaps, conserved columns) of an alignment without NumPy
+
+    Each row is loaded as one integer with a byte lane per column, so the
+    gap and mismatch tests below run over every column per big-int
+    operation. Characters are ASCII, so no lane ever carries into the next.
+    """
+    lows = int.from_bytes(b'\x01' * length, 'little')
+    highs = lows << 7
+    sevens = lows * 0x7F
+    gap_lanes = lows * _GAP
+    
+    def zero_lanes(value: int) -> int:
+        # High bit set in exactly the lanes of value that are zero
+        return ~(value + sevens) & highs
+    
+    total_gaps = 0
+    expected = 0
+    mismatched = 0
+    for row in rows:
+        row = int.from_bytes(row[:length].ljust(length, b'-'), 'little')
+        gaps = zero_lanes(row ^ gap_lanes)
+        total_gaps += bin(gaps).count('1')
+        residues = ~((gaps >> 7) * 0xFF)
+        
+        # The first non-gap character of a column becomes its expected one;
+        # any later non-gap character that differs marks the column
+        unset = (zero_lanes(expected) >> 7) * 0xFF
+        expected |= row & residues & unset
+        mismatched |= ~zero_lanes((expected ^ row) & residues) & highs
+    
+    conserved = ~mismatched & ~zero_lanes(expected) & highs
+    return total_gaps, bin(conserved).count('1')
+
 class AnalysisToolsService:
     """Service for bioinformatics analysis tools with lazy Docker initialization"""
     
     def __init__(self):
         self.docker_client = None
         self._docker_available = None
+        self._init_lock = threading.Lock()
+        
+        # Long-lived tool containers by image, all bind-mounting one host work
+        # directory at /data; each run gets its own subdirectory and is an
+        # exec_run, so container startup is paid once per image
+        self._containers: Dict[str, Any] = {}
+        self._container_lock = asyncio.Lock()
+        self._work_root: Optional[str] = None
+        
+        # Async HTTP client on the daemon's unix socket, used to start and
+        # poll tool execs from the event loop without worker threads
+        self._docker_http: Optional[httpx.AsyncClient] = None
     
     def _init_docker_client(self):
-        """Lazy initialization of Docker client"""
-        if self.docker_client is None:
+        """Lazy initialization of Docker client, attempted once even by concurrent callers"""
+        with self._init_lock:
+            if self.docker_client is not None or self._docker_available is not None:
+                return
             try:
                 import docker
                 self.docker_client = docker.from_env(timeout=10)
@@ -37,12 +181,152 @@ class AnalysisToolsService:
             self._init_docker_client()
         return self._docker_available
     
+    async def _check_docker_available(self) -> bool:
+        """_is_docker_available, making the one-time connection attempt off the event loop"""
+        if self._docker_available is None:
+            await asyncio.to_thread(self._init_docker_client)
+        return self._docker_available
+    
+    async def _get_container(self, image: str, volumes: Dict = None, key: str = None):
+        """Return the warm container for an image, starting it on first use.
+        
+        volumes are mounted in addition to the work root; call after
+        _run_directory, which creates the work root. key separates several
+        warm containers of one image (default: the image).
+        """
+        key = key or image
+        async with self._container_lock:
+            container = self._containers.get(key)
+            if container is None:
+                container = await asyncio.to_thread(
+                    self.docker_client.containers.run,
+                    image,
+                    command=["sleep", "infinity"],
+                    volumes={self._work_root: {"bind": "/data", "mode": "rw"}, **(volumes or {})},
+                    detach=True,
+                    remove=True,
+                    mem_limit="1g"
+                )
+                self._containers[key] = container
+            return container
+    
+    async def _run_tool(self, image: str, command: List[str], volumes: Dict = None, key: str = None) -> int:
+        """Run a command in the image's warm container and return its exit code.
+        
+        The exec is started detached and its state polled from the event
+        loop, so no worker thread is held for the length of the run; with a
+        local daemon the Docker API calls themselves are async too. Tools
+        write their results to files in the run directory.
+        """
+        container = await self._get_container(image, volumes, key)
+        try:
+            exec_id = await self._start_exec(container.id, command)
+            
+            delay = EXEC_POLL_INTERVAL
+            while True:
+                state = await self._inspect_exec(exec_id)
+                if not state['Running'] and state['ExitCode'] is not None:
+                    return state['ExitCode']
+                await asyncio.sleep(delay)
+                delay = min(delay * 2, EXEC_POLL_MAX_INTERVAL)
+        except Exception:
+            # Other runs may be exec'ing in the same container, so it is only
+            # replaced once it has really stopped: then it is dropped from
+            # the pool, removed, and a fresh one starts next time
+            if await self._container_gone(container):
+                if self._containers.get(key or image) is container:
+                    del self._containers[key or image]
+                try:
+                    await asyncio.to_thread(container.remove, force=True)
+                except Exception:
+                    pass
+            raise
+    
+    async def _container_gone(self, container) -> bool:
+        """Whether a pooled container has been removed or is no longer running.
+        
+        False when its state cannot be checked, so a failing daemon call does
+        not cost the runs that share the container.
+        """
+        import docker
+        try:
+            await asyncio.to_thread(container.reload)
+        except docker.errors.NotFound:
+            return True
+        except Exception:
+            return False
+        return container.status != 'running'
+    
+    def _docker_http_client(self) -> Optional[httpx.AsyncClient]:
+        """Async client for the Docker API when the daemon is on a local unix socket"""
+        if self._docker_http is None:
+            api = self.docker_client.api
+            socket_path = _docker_socket_path()
+            if socket_path is None or api.base_url != "http+docker://localhost":
+                return None
+            self._docker_http = httpx.AsyncClient(
+                transport=httpx.AsyncHTTPTransport(uds=socket_path),
+                base_url=f"http://docker/v{api.api_version}",
+                timeout=30
+            )
+        return self._docker_http
+    
+    async def _start_exec(self, container_id: str, command: List[str]) -> str:
+        """Create and start a detached exec in a container; returns the exec id"""
+        http = self._docker_http_client()
+        if http is None:
+            api = self.docker_client.api
+            exec_id = (await asyncio.to_thread(api.exec_create, container_id, command))['Id']
+            await asyncio.to_thread(api.exec_start, exec_id, detach=True)
+            return exec_id
+        
+        response = await http.post(f"/containers/{container_id}/exec", json={"Cmd": command})
+        response.raise_for_status()
+        exec_id = response.json()['Id']
+        response = await http.post(f"/exec/{exec_id}/start", json={"Detach": True})
+        response.raise_for_status()
+        return exec_id
+    
+    async def _inspect_exec(self, exec_id: str) -> Dict:
+        """State of an exec, with 'Running' and 'ExitCode'"""
+        http = self._docker_http_client()
+        if http is None:
+            return await asyncio.to_thread(self.docker_client.api.exec_inspect, exec_id)
+        
+        response = await http.get(f"/exec/{exec_id}/json")
+        response.raise_for_status()
+        return response.json()
+    
+    def _run_directory(self) -> tempfile.TemporaryDirectory:
+        """Temporary run directory under the shared work root"""
+        if self._work_root is None:
+            self._work_root = tempfile.mkdtemp(prefix="analysis_tools_")
+            # Removed at exit too, in case close() is never called
+            atexit.register(shutil.rmtree, self._work_root, True)
+        return tempfile.TemporaryDirectory(dir=self._work_root)
+    
+    async def close(self):
+        """Stop the warm tool containers and remove the shared work directory"""
+        containers = list(self._containers.values())
+        self._containers.clear()
+        for container in containers:
+            try:
+                await asyncio.to_thread(container.stop)
+            except Exception:
+                pass
+        if self._work_root is not None:
+            await asyncio.to_thread(shutil.rmtree, self._work_root, True)
+            self._work_root = None
+        if self._docker_http is not None:
+            await self._docker_http.aclose()
+            self._docker_http = None
+    
     async def run_blast_search(self, sequences: List[str], database: str, parameters: Dict = None) -> Dict:
         """Execute BLAST search using BioContainers or mock results"""
         if parameters is None:
             parameters = {"evalue": "1e-5", "max_hits": 10}
         
-        if self._is_docker_available():
+        if await self._check_docker_available():
             return await self._run_blast_with_docker(sequences, database, parameters)
         else:
             return await self._run_blast_mock(sequences, database, parameters)
@@ -50,14 +334,15 @@ class AnalysisToolsService:
     async def _run_blast_with_docker(self, sequences: List[str], database: str, parameters: Dict) -> Dict:
         """Run BLAST using Docker containers"""
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
+            with self._run_directory() as temp_dir:
                 temp_path = Path(temp_dir)
+                data_dir = f"/data/{temp_path.name}"
                 
                 # Write query sequences
                 query_file = temp_path / "query.fasta"
-                with open(query_file, 'w') as f:
-                    for i, sequence in enumerate(sequences):
-                        f.write(f">query_{i}\n{sequence}\n")
+                query_file.write_text(
+                    "".join(f">query_{i}\n{sequence}\n" for i, sequence in enumerate(sequences))
+                )
                 
                 # Prepare output file
                 output_file = temp_path / "blast_results.txt"
@@ -68,32 +353,26 @@ class AnalysisToolsService:
                 # Build BLAST command
                 blast_cmd = [
                     blast_program,
-                    "-query", "/data/query.fasta",
+                    "-query", f"{data_dir}/query.fasta",
                     "-db", f"/databases/{database}",
-                    "-out", "/data/blast_results.txt",
+                    "-out", f"{data_dir}/blast_results.txt",
                     "-outfmt", "6",
                     "-evalue", str(parameters.get("evalue", "1e-5")),
-                    "-max_target_seqs", str(parameters.get("max_hits", 10))
+                    "-max_target_seqs", str(parameters.get("max_hits", 10)),
+                    "-num_threads", str(parameters.get("num_threads", 2))
                 ]
                 
-                # Execute in container
-                container = self.docker_client.containers.run(
-                    "biocontainers/blast:2.12.0_cv1",
-                    command=" ".join(blast_cmd),
-                    volumes={
-                        str(temp_path): {"bind": "/data", "mode": "rw"},
-                        "/opt/blast_databases": {"bind": "/databases", "mode": "ro"}
-                    },
-                    detach=True,
-                    remove=True,
-                    mem_limit="1g"
+                # Each database has its own warm BLAST container; page cache is
+                # charged to the container's memory limit, so this keeps one
+                # database's pages from evicting another's between queries
+                exit_code = await self._run_tool(
+                    BLAST_IMAGE,
+                    blast_cmd,
+                    {BLAST_DATABASES_DIR: {"bind": "/databases", "mode": "ro"}},
+                    key=f"{BLAST_IMAGE}:{database}"
                 )
                 
-                # Wait for completion
-                result = container.wait()
-                logs = container.logs().decode('utf-8')
-                
-                if result['StatusCode'] == 0 and output_file.exists():
+                if exit_code == 0 and output_file.exists():
                     results = self._parse_blast_results(output_file)
                     return {
                         "results": results,
@@ -102,7 +381,7 @@ class AnalysisToolsService:
                         "method": "docker"
                     }
                 else:
-                    logger.warning(f"BLAST container failed, falling back to mock: {logs}")
+                    logger.warning(f"BLAST exited with code {exit_code}, falling back to mock")
                     return await self._run_blast_mock(sequences, database, parameters)
                     
         except Exception as e:
@@ -111,22 +390,50 @@ class AnalysisToolsService:
     
     async def _run_blast_mock(self, sequences: List[str], database: str, parameters: Dict) -> Dict:
         """Mock BLAST results when Docker is unavailable"""
+        hits_per_query = max(min(int(parameters.get("max_hits", 10)), 5), 0)
+        
+        # Every field of every hit of every query in one draw each; the
+        # sequence of each hit is repeated to match
+        query_lengths = [len(sequence) for sequence in sequences for _ in range(hits_per_query)]
+        size = len(query_lengths)
+        max_evalue = float(parameters.get("evalue", "1e-5"))
+        if np is None:
+            accessions = [random.randint(100000, 999999) for _ in range(size)]
+            proteins = [random.randint(1, 1000) for _ in range(size)]
+            scores = [random.uniform(50, 200) for _ in range(size)]
+            evalues = [random.uniform(1e-10, max_evalue) for _ in range(size)]
+            identities = [random.uniform(0.3, 0.95) for _ in range(size)]
+            lengths = [random.randint(100, 500) for _ in range(size)]
+            subject_starts = [random.randint(1, 50) for _ in range(size)]
+            subject_ends = [random.randint(length - 50, length) for length in query_lengths]
+        else:
+            accessions = _rng.integers(100000, 1000000, size=size).tolist()
+            proteins = _rng.integers(1, 1001, size=size).tolist()
+            scores = _rng.uniform(50, 200, size=size).tolist()
+            evalues = _rng.uniform(1e-10, max_evalue, size=size).tolist()
+            identities = _rng.uniform(0.3, 0.95, size=size).tolist()
+            lengths = _rng.integers(100, 501, size=size).tolist()
+            subject_starts = _rng.integers(1, 51, size=size).tolist()
+            ends = np.array(query_lengths, dtype=np.int64)
+            subject_ends = _rng.integers(ends - 50, ends + 1).tolist()
+        
         results = []
         for i, sequence in enumerate(sequences):
             hits = []
-            for j in range(min(int(parameters.get("max_hits", 10)), 5)):
+            for j in range(hits_per_query):
+                k = i * hits_per_query + j
                 hits.append({
                     "hit_id": f"hit_{i}_{j}",
-                    "accession": f"NP_{random.randint(100000, 999999)}",
-                    "description": f"Hypothetical protein {random.randint(1, 1000)} [mock organism]",
-                    "score": random.uniform(50, 200),
-                    "evalue": random.uniform(1e-10, float(parameters.get("evalue", "1e-5"))),
-                    "identity": random.uniform(0.3, 0.95),
-                    "length": random.randint(100, 500),
+                    "accession": f"NP_{accessions[k]}",
+                    "description": f"Hypothetical protein {proteins[k]} [mock organism]",
+                    "score": scores[k],
+                    "evalue": evalues[k],
+                    "identity": identities[k],
+                    "length": lengths[k],
                     "query_start": 1,
                     "query_end": len(sequence),
-                    "subject_start": random.randint(1, 50),
-                    "subject_end": random.randint(len(sequence) - 50, len(sequence))
+                    "subject_start": subject_starts[k],
+                    "subject_end": subject_ends[k]
                 })
             
             results.append({
@@ -146,7 +453,7 @@ class AnalysisToolsService:
         if parameters is None:
             parameters = {"gap_penalty": -10}
         
-        if self._is_docker_available():
+        if await self._check_docker_available():
             return await self._run_alignment_with_docker(sequences, method, parameters)
         else:
             return await self._run_alignment_mock(sequences, method, parameters)
@@ -154,16 +461,16 @@ class AnalysisToolsService:
     async def _run_alignment_with_docker(self, sequences: List[Dict], method: str, parameters: Dict) -> Dict:
         """Run alignment using Docker containers"""
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
+            with self._run_directory() as temp_dir:
                 temp_path = Path(temp_dir)
+                data_dir = f"/data/{temp_path.name}"
                 
                 # Write input sequences
                 input_file = temp_path / "sequences.fasta"
-                with open(input_file, 'w') as f:
-                    for i, seq in enumerate(sequences):
-                        seq_id = seq.get('id', f'seq_{i}')
-                        sequence = seq.get('sequence', '')
-                        f.write(f">{seq_id}\n{sequence}\n")
+                input_file.write_text("".join(
+                    f">{seq.get('id', f'seq_{i}')}\n{seq.get('sequence', '')}\n"
+                    for i, seq in enumerate(sequences)
+                ))
                 
                 # Prepare output file
                 output_file = temp_path / "alignment.fasta"
@@ -176,30 +483,28 @@ class AnalysisToolsService:
                 }
                 
                 if method == "muscle":
-                    cmd = "muscle -in /data/sequences.fasta -out /data/alignment.fasta"
+                    cmd = ["muscle", "-in", f"{data_dir}/sequences.fasta", "-out", f"{data_dir}/alignment.fasta"]
                 elif method == "clustalw":
-                    cmd = "clustalw2 -infile=/data/sequences.fasta -outfile=/data/alignment.fasta -output=FASTA"
+                    cmd = [
+                        "clustalw2", f"-infile={data_dir}/sequences.fasta",
+                        f"-outfile={data_dir}/alignment.fasta", "-output=FASTA"
+                    ]
                 elif method == "mafft":
-                    cmd = "mafft --auto /data/sequences.fasta > /data/alignment.fasta"
+                    # MAFFT only writes the alignment to stdout, which a detached
+                    # exec does not keep; the shell script is fixed and the
+                    # paths are arguments, and exec leaves only mafft running
+                    cmd = [
+                        "sh", "-c", 'exec mafft --auto "$1" > "$2"', "mafft",
+                        f"{data_dir}/sequences.fasta", f"{data_dir}/alignment.fasta"
+                    ]
                 else:
                     raise ValueError(f"Unsupported alignment method: {method}")
                 
-                # Execute in container
-                container = self.docker_client.containers.run(
-                    tool_images[method],
-                    command=cmd,
-                    volumes={str(temp_path): {"bind": "/data", "mode": "rw"}},
-                    detach=True,
-                    remove=True,
-                    mem_limit="1g"
-                )
-                
-                result = container.wait()
-                logs = container.logs().decode('utf-8')
+                # Execute in the method's warm container
+                exit_code = await self._run_tool(tool_images[method], cmd)
                 
-                if result['StatusCode'] == 0 and output_file.exists():
-                    aligned_sequences = self._parse_fasta_file(output_file)
-                    alignment_stats = self._calculate_alignment_stats(aligned_sequences)
+                if exit_code == 0 and output_file.exists():
+                    aligned_sequences, alignment_stats = self._parse_alignment_file(output_file)
                     
                     return {
                         "aligned_sequences": aligned_sequences,
@@ -208,7 +513,7 @@ class AnalysisToolsService:
                         "parameters": parameters
                     }
                 else:
-                    logger.warning(f"{method} container failed, falling back to mock: {logs}")
+                    logger.warning(f"{method} exited with code {exit_code}, falling back to mock")
                     return await self._run_alignment_mock(sequences, method, parameters)
                     
         except Exception as e:
@@ -224,11 +529,12 @@ class AnalysisToolsService:
             original_seq = seq.get('sequence', '')
             # Simulate alignment by padding with gaps
             gaps_to_add = max_length - len(original_seq)
-            gap_positions = [random.randint(0, len(original_seq)) for _ in range(gaps_to_add // 4)]
+            gap_positions = sorted(random.randint(0, len(original_seq)) for _ in range(gaps_to_add // 4))
             
-            aligned_seq = original_seq
-            for pos in sorted(gap_positions, reverse=True):
-                aligned_seq = aligned_seq[:pos] + '-' + aligned_seq[pos:]
+            # One gap before the residue at each position, built in a single join
+            starts = [0] + gap_positions
+            ends = gap_positions + [len(original_seq)]
+            aligned_seq = '-'.join(original_seq[start:end] for start, end in zip(starts, ends))
             
             aligned_seq = aligned_seq.ljust(max_length, '-')
             
@@ -248,25 +554,29 @@ class AnalysisToolsService:
     
     def _calculate_alignment_stats(self, aligned_sequences: List[Dict]) -> Dict:
         """Calculate alignment statistics"""
-        if not aligned_sequences:
+        return self._alignment_stats([seq["sequence"].encode('ascii', 'replace') for seq in aligned_sequences])
+    
+    def _alignment_stats(self, rows: List[bytes]) -> Dict:
+        """Alignment statistics of aligned ASCII rows, cut or gap-padded to the first"""
+        if not rows:
             return {}
         
-        alignment_length = len(aligned_sequences[0]["sequence"])
-        num_sequences = len(aligned_sequences)
-        
-        # Calculate conservation and gaps
-        total_gaps = 0
-        conserved_positions = 0
+        alignment_length = len(rows[0])
+        num_sequences = len(rows)
         
-        for pos in range(alignment_length):
-            column = [seq["sequence"][pos] for seq in aligned_sequences]
-            gaps = column.count('-')
-            total_gaps += gaps
+        if np is None:
+            total_gaps, conserved_positions = _alignment_stats_swar(rows, alignment_length)
+        else:
+            # Calculate conservation and gaps over the whole alignment at once
+            matrix = _alignment_matrix(rows, alignment_length)
+            gaps = matrix == _GAP
+            total_gaps = int(np.count_nonzero(gaps))
             
-            # Position is conserved if all non-gap characters are the same
-            non_gaps = [c for c in column if c != '-']
-            if non_gaps and len(set(non_gaps)) == 1:
-                conserved_positions += 1
+            # Position is conserved if all non-gap characters are the same; any
+            # non-gap character of a column (here the largest) is its reference
+            reference = np.where(gaps, 0, matrix).max(axis=0)
+            conserved = ((matrix == reference) | gaps).all(axis=0) & ~gaps.all(axis=0)
+            conserved_positions = int(np.count_nonzero(conserved))
         
         gap_percentage = (total_gaps / (alignment_length * num_sequences)) * 100
         conservation_percentage = (conserved_positions / alignment_length) * 100
@@ -282,6 +592,13 @@ class AnalysisToolsService:
     
     def _parse_blast_results(self, results_file: Path) -> List[Dict]:
         """Parse BLAST tabular results"""
+        if pd is not None:
+            try:
+                return self._read_blast_table(results_file)
+            except ValueError as e:
+                # Malformed rows the C reader rejects; the line parser skips them
+                logger.warning(f"Falling back to line parsing of BLAST results: {str(e)}")
+        
         results = []
         
         try:
@@ -292,9 +609,10 @@ class AnalysisToolsService:
                     
                     fields = line.strip().split('\t')
                     if len(fields) >= 12:
+                        # Ids repeat across hits; interned, all hits share one string each
                         results.append({
-                            "query_id": fields[0],
-                            "subject_id": fields[1],
+                            "query_id": sys.intern(fields[0]),
+                            "subject_id": sys.intern(fields[1]),
                             "identity": float(fields[2]) / 100.0,
                             "alignment_length": int(fields[3]),
                             "mismatches": int(fields[4]),
@@ -311,46 +629,78 @@ class AnalysisToolsService:
         
         return results
     
+    def _read_blast_table(self, results_file: Path) -> List[Dict]:
+        """Parse BLAST tabular results column-wise with the pandas C reader"""
+        try:
+            table = pd.read_csv(
+                results_file, sep='\t', comment='#', header=None, engine='c',
+                names=list(BLAST_TABULAR_COLUMNS), float_precision='round_trip',
+                # Ids are kept verbatim; only empty numeric fields are missing
+                dtype={name: str for name, column_type in BLAST_TABULAR_COLUMNS.items() if column_type is str},
+                keep_default_na=False,
+                na_values={name: [''] for name, column_type in BLAST_TABULAR_COLUMNS.items() if column_type is not str}
+            )
+        except pd.errors.EmptyDataError:
+            return []
+        except OSError as e:
+            logger.error(f"Failed to parse BLAST results: {str(e)}")
+            return []
+        
+        # Rows cut short have missing trailing columns; every column then gets
+        # its type at once and becomes a list of plain Python values, zipped
+        # into hits far faster than DataFrame.to_dict builds them
+        table = table.dropna().astype(BLAST_TABULAR_COLUMNS)
+        table["identity"] /= 100.0
+        columns = [table[name].tolist() for name in BLAST_TABULAR_COLUMNS]
+        return [dict(zip(BLAST_TABULAR_COLUMNS, row)) for row in zip(*columns)]
+    
     def _parse_fasta_file(self, fasta_file: Path) -> List[Dict]:
         """Parse FASTA file"""
         sequences = []
-        current_seq = None
-        current_sequence = []
         
         try:
-            with open(fasta_file, 'r') as f:
-                for line in f:
-                    line = line.strip()
-                    if line.startswith('>'):
-                        if current_seq:
-                            sequences.append({
-                                "id": current_seq,
-                                "sequence": ''.join(current_sequence),
-                                "length": len(''.join(current_sequence))
-                            })
-                        current_seq = line[1:]
-                        current_sequence = []
-                    else:
-                        current_sequence.append(line)
-            
-            # Add last sequence
-            if current_seq:
+            for seq_id, body in _fasta_records(fasta_file.read_bytes()):
+                sequence = body.decode()
                 sequences.append({
-                    "id": current_seq,
-                    "sequence": ''.join(current_sequence),
-                    "length": len(''.join(current_sequence))
+                    "id": seq_id,
+                    "sequence": sequence,
+                    "length": len(sequence)
                 })
         except Exception as e:
             logger.error(f"Failed to parse FASTA file: {str(e)}")
         
         return sequences
     
+    def _parse_alignment_file(self, alignment_file: Path) -> Tuple[List[Dict], Dict]:
+        """Parse an aligned FASTA file into its sequences and alignment statistics
+        
+        Statistics are computed from the record bytes as split from the file,
+        without re-encoding the decoded sequences.
+        """
+        try:
+            records = _fasta_records(alignment_file.read_bytes())
+        except Exception as e:
+            logger.error(f"Failed to parse FASTA file: {str(e)}")
+            records = []
+        
+        aligned_sequences = []
+        rows = []
+        for seq_id, body in records:
+            sequence = body.decode(errors='replace')
+            aligned_sequences.append({
+                "id": seq_id,
+                "sequence": sequence,
+                "length": len(sequence)
+            })
+            rows.append(body if body.isascii() else sequence.encode('ascii', 'replace'))
+        
+        return aligned_sequences, self._alignment_stats(rows)
+    
     def _is_nucleotide(self, sequence: str) -> bool:
         """Check if sequence is nucleotide (DNA/RNA)"""
         if not sequence:
             return True
-        
-        nucleotide_chars = set('ATCGUN')
-        seq_chars = set(sequence.upper())
-        nucleotide_ratio = len(seq_chars.intersection(nucleotide_chars)) / len(seq_chars)
-        return nucleotide_ratio > 0.8
\ No newline at end of file
+        return _sample_is_nucleotide(sequence[:NUCLEOTIDE_SAMPLE_LENGTH])
+
+# Global service instance, closed at application shutdown
+analysis_tools_service = AnalysisToolsService()
\ No newline at end of file
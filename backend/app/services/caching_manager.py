@@ -290,16 +290,14 @@ class CachedAnalysisService:
     async def run_blast_search(self, sequence: str, database: str, parameters: Dict) -> Dict:
         """Cached BLAST search - this would call the actual external tool manager"""
         # This would call your ExternalToolManager.execute_blast_search method
-        from .external_tool_manager import ExternalToolManager
-        tool_manager = ExternalToolManager()
-        return await tool_manager.execute_blast_search(sequence, database, parameters)
+        from .external_tool_manager import external_tool_manager
+        return await external_tool_manager.execute_blast_search(sequence, database, parameters)
     
     @cache_alignment()
     async def run_multiple_alignment(self, sequences: List[str], tool: str, parameters: Dict) -> Dict:
         """Cached multiple alignment"""
-        from .external_tool_manager import ExternalToolManager  
-        tool_manager = ExternalToolManager()
-        return await tool_manager.execute_multiple_alignment(sequences, tool, parameters)
+        from .external_tool_manager import external_tool_manager
+        return await external_tool_manager.execute_multiple_alignment(sequences, tool, parameters)
     
     @cache_sequence_analysis()
     async def calculate_sequence_statistics(self, sequence: str) -> Dict:
@@ -5,8 +5,8 @@ import re
 from typing import List, Dict, Any, Optional
 from fastapi import HTTPException
 from Bio import SeqIO
-from Bio.Seq import Seq
-from Bio.SeqRecord import SeqRecord
+from Bio.SeqIO.FastaIO import SimpleFastaParser
+from Bio.SeqIO.QualityIO import FastqGeneralIterator
 
 class DataConverterService:
     """Service for converting between different data formats"""
@@ -17,12 +17,15 @@ class DataConverterService:
         try:
             # FASTA conversions
             if input_format.lower() == "fasta" and output_format.lower() == "genbank":
-                records = SeqIO.parse(io.StringIO(data), "fasta")
+                # Plain (title, sequence) tuples, no SeqRecord objects needed
+                records = SimpleFastaParser(io.StringIO(data))
                 output = io.StringIO()
-                for record in records:
+                for title, sequence in records:
+                    record_id = title.split(None, 1)[0] if title else ""
+                    
                     # Convert to GenBank format (simplified)
-                    output.write(f"LOCUS       {record.id}               {len(record.seq)} bp    DNA     linear   UNK\n")
-                    output.write(f"DEFINITION  {record.description}\n")
+                    output.write(f"LOCUS       {record_id}               {len(sequence)} bp    DNA     linear   UNK\n")
+                    output.write(f"DEFINITION  {title}\n")
                     output.write("ACCESSION   .\n")
                     output.write("VERSION     .\n")
                     output.write("KEYWORDS    .\n")
@@ -30,7 +33,7 @@ class DataConverterService:
                     output.write("ORIGIN\n")
                     
                     # Write sequence in blocks of 60 with position numbers
-                    sequence = str(record.seq).lower()
+                    sequence = sequence.lower()
                     for i in range(0, len(sequence), 60):
                         line_num = str(i + 1).rjust(9)
                         sequence_line = sequence[i:i+60]
@@ -49,11 +52,11 @@ class DataConverterService:
                 return output.getvalue()
                 
             elif input_format.lower() == "fastq" and output_format.lower() == "fasta":
-                records = SeqIO.parse(io.StringIO(data), "fastq")
-                output = io.StringIO()
-                for record in records:
-                    output.write(f">{record.id}\n{record.seq}\n")
-                return output.getvalue()
+                # Skip SeqRecord/quality decoding, only the id and sequence are emitted
+                return "".join(
+                    f">{title.split(None, 1)[0] if title else ''}\n{sequence}\n"
+                    for title, sequence, _ in FastqGeneralIterator(io.StringIO(data))
+                )
                 
             elif input_format.lower() == "gff3" and output_format.lower() == "bed":
                 return DataConverterService._gff3_to_bed(data)
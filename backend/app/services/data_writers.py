@@ -3,18 +3,262 @@ import asyncio
 import os
 import json
 import csv
+import gzip
+import queue
 import tempfile
-from typing import Dict, List, Any, Optional, Union, TextIO
-from dataclasses import dataclass
+from typing import Dict, List, Any, Optional, Union, TextIO, Iterable, Iterator
+from itertools import chain, islice
+from dataclasses import dataclass, asdict
 from pathlib import Path
+from contextlib import contextmanager
 import logging
 import uuid
 from datetime import datetime
+import numpy as np
 import pandas as pd
+from openpyxl import Workbook
 import xml.etree.ElementTree as ET
 
 logger = logging.getLogger(__name__)
 
+try:
+    # ISA-L backed, threaded gzip compression when available
+    from xopen import xopen
+except ImportError:
+    xopen = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from numba import njit
+except ImportError:
+    njit = None
+
+def _wrap_sequence(sequence: np.ndarray, line_length: int, out: np.ndarray, pos: int) -> int:
+    """Copy sequence bytes into out with a newline every line_length bytes, returning the new end"""
+    
+    i = 0
+    n = sequence.shape[0]
+    while i < n:
+        end = min(i + line_length, n)
+        out[pos:pos + end - i] = sequence[i:end]
+        pos += end - i
+        out[pos] = 10  # '\n'
+        pos += 1
+        i += line_length
+    return pos
+
+if njit is not None:
+    _wrap_sequence = njit(cache=True)(_wrap_sequence)
+
+def _format_fasta_records(
+    headers: np.ndarray,
+    header_offsets: np.ndarray,
+    sequences: np.ndarray,
+    sequence_offsets: np.ndarray,
+    line_length: int,
+    out: np.ndarray
+) -> int:
+    """Format all FASTA records from flat header/sequence buffers into out, returning the end"""
+    
+    pos = 0
+    for record in range(header_offsets.shape[0] - 1):
+        header_start = header_offsets[record]
+        header_end = header_offsets[record + 1]
+        out[pos:pos + header_end - header_start] = headers[header_start:header_end]
+        pos += header_end - header_start
+        pos = _wrap_sequence(
+            sequences[sequence_offsets[record]:sequence_offsets[record + 1]], line_length, out, pos
+        )
+    return pos
+
+if njit is not None:
+    _format_fasta_records = njit(cache=True)(_format_fasta_records)
+
+def warm_up_kernels():
+    """Compile the FASTA kernels for the argument types _write_fasta passes them.
+    
+    Called in a worker thread at startup, so the first FASTA write does not
+    block the event loop while Numba compiles.
+    """
+    if njit is None:
+        return
+    offsets = np.concatenate(([0], np.cumsum(np.ones(1, dtype=np.int64))))
+    record = np.frombuffer(b'>', dtype=np.uint8)
+    _format_fasta_records(record, offsets, record, offsets, 80, np.empty(4, dtype=np.uint8))
+
+# Recycled output buffers for the FASTA kernel; buffers above the cap are
+# dropped on release so the pool never pins very large allocations
+_output_buffers: "queue.LifoQueue[np.ndarray]" = queue.LifoQueue(maxsize=4)
+_MAX_POOLED_BUFFER_BYTES = 1 << 24
+
+@contextmanager
+def _pooled_buffer(size: int) -> Iterator[np.ndarray]:
+    """Lend a uint8 buffer of at least size bytes, returning it to the pool afterwards"""
+    
+    try:
+        buffer = _output_buffers.get_nowait()
+    except queue.Empty:
+        buffer = None
+    if buffer is None or buffer.size < size:
+        buffer = np.empty(size, dtype=np.uint8)
+    
+    try:
+        yield buffer
+    finally:
+        if buffer.size <= _MAX_POOLED_BUFFER_BYTES:
+            try:
+                _output_buffers.put_nowait(buffer)
+            except queue.Full:
+                pass
+
+def _encode_chunks(lines: Iterable[str], chunk_records: int = 4096) -> Iterator[bytes]:
+    """Group formatted lines into UTF-8 encoded chunks of chunk_records lines"""
+    
+    iterator = iter(lines)
+    while True:
+        batch = list(islice(iterator, chunk_records))
+        if not batch:
+            return
+        yield ''.join(batch).encode()
+
+# Attribute column templates keyed by (format, attribute key tuple); annotation files
+# mostly repeat a handful of key sets, so each is compiled once
+_attribute_templates: Dict[tuple, tuple] = {}
+_ATTRIBUTE_TEMPLATE_CACHE_SIZE = 1024
+
+_GFF3_RESERVED_ATTRIBUTES = frozenset(('ID', 'Name', 'Parent'))
+_GTF_RESERVED_ATTRIBUTES = frozenset(('gene_id', 'transcript_id'))
+
+def _attribute_template(format_type: str, key_set: tuple) -> tuple:
+    """Return (template, keys) formatting the non-reserved attributes of a key set"""
+    
+    cache_key = (format_type, key_set)
+    cached = _attribute_templates.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    if format_type == 'gff3':
+        keys = tuple(key for key in key_set if key not in _GFF3_RESERVED_ATTRIBUTES)
+        pairs = [f"{str(key).replace('{', '{{').replace('}', '}}')}={{}}" for key in keys]
+        template = ';'.join(pairs)
+    else:
+        keys = tuple(key for key in key_set if key not in _GTF_RESERVED_ATTRIBUTES)
+        pairs = [f"{str(key).replace('{', '{{').replace('}', '}}')} \"{{}}\"" for key in keys]
+        template = '; '.join(pairs)
+    
+    if len(_attribute_templates) >= _ATTRIBUTE_TEMPLATE_CACHE_SIZE:
+        _attribute_templates.clear()
+    _attribute_templates[cache_key] = (template, keys)
+    return template, keys
+
+def _format_gff3_record(feature: Dict) -> str:
+    """Format a feature dict as one GFF3 line"""
+    
+    get = feature.get
+    
+    # Build attributes
+    attributes = []
+    if 'id' in feature:
+        attributes.append(f"ID={feature['id']}")
+    if 'name' in feature:
+        attributes.append(f"Name={feature['name']}")
+    if 'parent' in feature:
+        attributes.append(f"Parent={feature['parent']}")
+    
+    # Add custom attributes
+    custom_attributes = get('attributes')
+    if custom_attributes:
+        template, keys = _attribute_template('gff3', tuple(custom_attributes))
+        if keys:
+            attributes.append(template.format(*[custom_attributes[key] for key in keys]))
+    
+    return (
+        f"{get('seqid', get('chromosome', 'unknown'))}\t{get('source', 'ugene')}\t"
+        f"{get('type', get('feature_type', 'feature'))}\t{get('start', 1)}\t{get('end', 1)}\t"
+        f"{get('score', '.')}\t{get('strand', '.')}\t{get('phase', '.')}\t"
+        f"{';'.join(attributes) if attributes else '.'}\n"
+    )
+
+def _format_gtf_record(feature: Dict) -> str:
+    """Format a feature dict as one GTF line"""
+    
+    get = feature.get
+    
+    # Build attributes (GTF format)
+    attributes = []
+    if 'gene_id' in feature:
+        attributes.append(f'gene_id "{feature["gene_id"]}"')
+    if 'transcript_id' in feature:
+        attributes.append(f'transcript_id "{feature["transcript_id"]}"')
+    
+    # Add other attributes
+    custom_attributes = get('attributes')
+    if custom_attributes:
+        template, keys = _attribute_template('gtf', tuple(custom_attributes))
+        if keys:
+            attributes.append(template.format(*[custom_attributes[key] for key in keys]))
+    
+    return (
+        f"{get('seqname', get('chromosome', 'unknown'))}\t{get('source', 'ugene')}\t"
+        f"{get('feature', get('type', 'exon'))}\t{get('start', 1)}\t{get('end', 1)}\t"
+        f"{get('score', '.')}\t{get('strand', '.')}\t{get('frame', '.')}\t"
+        f"{'; '.join(attributes)}\n"
+    )
+
+def _format_bed_record(feature: Dict, index: int) -> str:
+    """Format a feature dict as one BED line (3-6 columns)"""
+    
+    get = feature.get
+    
+    chrom = get('chrom', get('chromosome', 'chr1'))
+    start = get('chromStart', get('start', 1)) - 1  # BED is 0-based
+    end = get('chromEnd', get('end', 1))
+    name = feature['name'] if 'name' in feature else f"feature_{index}"
+    score = get('score', 0)
+    strand = get('strand', '.')
+    
+    # Common case: all six columns, formatted in one go
+    if name and score is not None and strand:
+        return f"{chrom}\t{start}\t{end}\t{name}\t{score}\t{strand}\n"
+    
+    # Optional columns stop at the first missing one
+    if not name:
+        return f"{chrom}\t{start}\t{end}\n"
+    if score is None:
+        return f"{chrom}\t{start}\t{end}\t{name}\n"
+    return f"{chrom}\t{start}\t{end}\t{name}\t{score}\n"
+
+def _format_vcf_record(variant: Dict) -> str:
+    """Format a variant dict as one VCF line with a GT:GQ sample column"""
+    
+    get = variant.get
+    
+    # Build INFO field; branch on the two known keys directly rather than
+    # collecting parts into a list and joining it for every row
+    if 'depth' in variant:
+        if 'allele_frequency' in variant:
+            info = f"DP={variant['depth']};AF={variant['allele_frequency']:.4f}"
+        else:
+            info = f"DP={variant['depth']}"
+    elif 'allele_frequency' in variant:
+        info = f"AF={variant['allele_frequency']:.4f}"
+    else:
+        info = '.'
+    
+    # FORMAT and sample data
+    sample_data = get('genotype', {})
+    
+    return (
+        f"{get('chromosome', 'chr1')}\t{get('position', 1)}\t{get('id', '.')}\t"
+        f"{get('ref_allele', 'A')}\t{get('alt_allele', 'T')}\t{get('quality', 30)}\t"
+        f"{get('filter', 'PASS')}\t{info}\t"
+        f"GT:GQ\t{sample_data.get('GT', '0/1')}:{sample_data.get('GQ', 30)}\n"
+    )
+
 @dataclass
 class WriteOperation:
     """Data write operation result"""
@@ -37,12 +281,12 @@ class DataWritersService:
         self.supported_formats = {
             'fasta': {
                 'description': 'FASTA sequence format',
-                'extensions': ['.fasta', '.fa', '.fas'],
+                'extensions': ['.fasta', '.fa', '.fas', '.fasta.gz', '.fa.gz'],
                 'writer_method': self._write_fasta
             },
             'fastq': {
                 'description': 'FASTQ sequence format with quality scores',
-                'extensions': ['.fastq', '.fq'],
+                'extensions': ['.fastq', '.fq', '.fastq.gz', '.fq.gz'],
                 'writer_method': self._write_fastq
             },
             'gff3': {
@@ -179,121 +423,133 @@ class DataWritersService:
             logger.error(f"Error writing sequences to {format_type}: {str(e)}")
             return {"error": f"Write operation failed: {str(e)}"}
     
+    def _open_output(self, output_path: Path, mode: str = 'w') -> TextIO:
+        """Open output file for writing, gzip-compressing paths ending in .gz"""
+        
+        if output_path.suffix == '.gz':
+            gzip_mode = 'wb' if 'b' in mode else 'wt'
+            if xopen is not None:
+                return xopen(output_path, gzip_mode, compresslevel=1, threads=1)
+            return gzip.open(output_path, gzip_mode, compresslevel=1)
+        
+        return open(output_path, mode)
+    
+    def _write_chunks(self, output_path: Path, chunks: Iterable[bytes]):
+        """Write encoded chunks straight to the output file descriptor as they are produced"""
+        
+        if output_path.suffix == '.gz':
+            with self._open_output(output_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(chunk)
+            return
+        
+        fd = os.open(output_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            for chunk in chunks:
+                view = memoryview(chunk)
+                while view:
+                    written = os.write(fd, view)
+                    view = view[written:]
+        finally:
+            os.close(fd)
+    
     async def _write_fasta(self, sequences: List[Dict], output_path: Path, parameters: Dict):
         """Write sequences in FASTA format"""
         
         line_length = parameters.get('line_length', 80)
         include_description = parameters.get('include_description', True)
+        # The wrapping kernel writes unchecked into a buffer sized from
+        # line_length, so a non-positive length must never reach it
+        if line_length < 1:
+            raise ValueError(f"line_length must be at least 1, got {line_length}")
         
-        with open(output_path, 'w') as f:
-            for seq in sequences:
-                # Header line
-                seq_id = seq.get('id', seq.get('name', 'unknown'))
-                if include_description and seq.get('description'):
-                    header = f">{seq_id} {seq['description']}"
-                else:
-                    header = f">{seq_id}"
-                
-                f.write(header + '\n')
-                
-                # Sequence lines (wrapped)
-                sequence = seq.get('sequence', '')
-                for i in range(0, len(sequence), line_length):
-                    f.write(sequence[i:i + line_length] + '\n')
+        if parameters.get('strict_schema', False):
+            # Caller guarantees 'id' and 'sequence' keys, skip the fallback chain
+            records = ((seq['id'], seq['sequence'], seq.get('description')) for seq in sequences)
+        else:
+            records = (
+                (seq.get('id', seq.get('name', 'unknown')), seq.get('sequence', ''), seq.get('description'))
+                for seq in sequences
+            )
+        
+        headers = []
+        bodies = []
+        for seq_id, sequence, description in records:
+            # Header line
+            if include_description and description:
+                headers.append(f">{seq_id} {description}\n".encode())
+            else:
+                headers.append(f">{seq_id}\n".encode())
+            bodies.append(sequence.encode())
+        
+        # Flat buffers plus offsets let the whole record loop run in the
+        # formatting kernel (compiled when Numba is available)
+        header_lengths = np.fromiter(map(len, headers), dtype=np.int64, count=len(headers))
+        sequence_lengths = np.fromiter(map(len, bodies), dtype=np.int64, count=len(bodies))
+        header_offsets = np.concatenate(([0], np.cumsum(header_lengths)))
+        sequence_offsets = np.concatenate(([0], np.cumsum(sequence_lengths)))
+        
+        total_size = int(
+            header_offsets[-1] + sequence_offsets[-1] + (-(-sequence_lengths // line_length)).sum()
+        )
+        with _pooled_buffer(total_size) as out:
+            pos = _format_fasta_records(
+                np.frombuffer(b''.join(headers), dtype=np.uint8),
+                header_offsets,
+                np.frombuffer(b''.join(bodies), dtype=np.uint8),
+                sequence_offsets,
+                line_length,
+                out
+            )
+            
+            self._write_chunks(output_path, [out[:pos]])
     
     async def _write_fastq(self, sequences: List[Dict], output_path: Path, parameters: Dict):
         """Write sequences in FASTQ format"""
         
         default_quality = parameters.get('default_quality', 'I' * 40)  # Default quality
         
-        with open(output_path, 'w') as f:
-            for seq in sequences:
-                seq_id = seq.get('id', seq.get('name', 'unknown'))
-                sequence = seq.get('sequence', '')
-                quality = seq.get('quality', default_quality)
-                
-                # Ensure quality string matches sequence length
-                if len(quality) != len(sequence):
-                    quality = default_quality[:len(sequence)] or 'I' * len(sequence)
-                
-                # Write FASTQ record
-                f.write(f"@{seq_id}\n")
-                f.write(f"{sequence}\n")
-                f.write("+\n")
-                f.write(f"{quality}\n")
+        if parameters.get('strict_schema', False):
+            # Caller guarantees 'id' and 'sequence' keys, skip the fallback chain
+            records = [(seq['id'], seq['sequence'], seq.get('quality', default_quality)) for seq in sequences]
+        else:
+            records = [
+                (seq.get('id', seq.get('name', 'unknown')), seq.get('sequence', ''), seq.get('quality', default_quality))
+                for seq in sequences
+            ]
+        
+        # Pad the default quality once to the longest read so mismatched
+        # records only need a slice instead of a fresh string per read
+        max_length = max((len(sequence) for _, sequence, _ in records), default=0)
+        padded_quality = default_quality + 'I' * max(max_length - len(default_quality), 0)
+        
+        self._write_chunks(output_path, _encode_chunks(
+            # Ensure quality string matches sequence length
+            f"@{seq_id}\n{sequence}\n+\n"
+            f"{quality if len(quality) == len(sequence) else padded_quality[:len(sequence)]}\n"
+            for seq_id, sequence, quality in records
+        ))
     
     async def _write_gff3(self, features: List[Dict], output_path: Path, parameters: Dict):
         """Write features in GFF3 format"""
         
-        with open(output_path, 'w') as f:
-            # GFF3 header
-            f.write("##gff-version 3\n")
-            
-            # Add reference sequences if provided
-            if 'reference_sequences' in parameters:
-                for ref in parameters['reference_sequences']:
-                    f.write(f"##sequence-region {ref['id']} 1 {ref['length']}\n")
-            
-            # Write features
-            for feature in features:
-                seqid = feature.get('seqid', feature.get('chromosome', 'unknown'))
-                source = feature.get('source', 'ugene')
-                feature_type = feature.get('type', feature.get('feature_type', 'feature'))
-                start = feature.get('start', 1)
-                end = feature.get('end', 1)
-                score = feature.get('score', '.')
-                strand = feature.get('strand', '.')
-                phase = feature.get('phase', '.')
-                
-                # Build attributes
-                attributes = []
-                if 'id' in feature:
-                    attributes.append(f"ID={feature['id']}")
-                if 'name' in feature:
-                    attributes.append(f"Name={feature['name']}")
-                if 'parent' in feature:
-                    attributes.append(f"Parent={feature['parent']}")
-                
-                # Add custom attributes
-                for key, value in feature.get('attributes', {}).items():
-                    if key not in ['ID', 'Name', 'Parent']:
-                        attributes.append(f"{key}={value}")
-                
-                attributes_str = ';'.join(attributes) if attributes else '.'
-                
-                # Write GFF3 line
-                f.write(f"{seqid}\t{source}\t{feature_type}\t{start}\t{end}\t{score}\t{strand}\t{phase}\t{attributes_str}\n")
+        # GFF3 header
+        header = ["##gff-version 3\n"]
+        
+        # Add reference sequences if provided
+        if 'reference_sequences' in parameters:
+            for ref in parameters['reference_sequences']:
+                header.append(f"##sequence-region {ref['id']} 1 {ref['length']}\n")
+        
+        # Stream features to disk in encoded chunks
+        records = (_format_gff3_record(feature) for feature in features)
+        self._write_chunks(output_path, _encode_chunks(chain(header, records)))
     
     async def _write_gtf(self, features: List[Dict], output_path: Path, parameters: Dict):
         """Write features in GTF format"""
         
-        with open(output_path, 'w') as f:
-            for feature in features:
-                seqname = feature.get('seqname', feature.get('chromosome', 'unknown'))
-                source = feature.get('source', 'ugene')
-                feature_type = feature.get('feature', feature.get('type', 'exon'))
-                start = feature.get('start', 1)
-                end = feature.get('end', 1)
-                score = feature.get('score', '.')
-                strand = feature.get('strand', '.')
-                frame = feature.get('frame', '.')
-                
-                # Build attributes (GTF format)
-                attributes = []
-                if 'gene_id' in feature:
-                    attributes.append(f'gene_id "{feature["gene_id"]}"')
-                if 'transcript_id' in feature:
-                    attributes.append(f'transcript_id "{feature["transcript_id"]}"')
-                
-                # Add other attributes
-                for key, value in feature.get('attributes', {}).items():
-                    if key not in ['gene_id', 'transcript_id']:
-                        attributes.append(f'{key} "{value}"')
-                
-                attributes_str = '; '.join(attributes) if attributes else ''
-                
-                # Write GTF line
-                f.write(f"{seqname}\t{source}\t{feature_type}\t{start}\t{end}\t{score}\t{strand}\t{frame}\t{attributes_str}\n")
+        records = (_format_gtf_record(feature) for feature in features)
+        self._write_chunks(output_path, _encode_chunks(records))
     
     async def _write_bed(self, features: List[Dict], output_path: Path, parameters: Dict):
         """Write features in BED format"""
@@ -301,136 +557,113 @@ class DataWritersService:
         track_name = parameters.get('track_name', 'UGENE_Features')
         track_description = parameters.get('track_description', 'Features from UGENE')
         
-        with open(output_path, 'w') as f:
-            # Track header
-            f.write(f'track name="{track_name}" description="{track_description}"\n')
-            
-            for feature in features:
-                chrom = feature.get('chrom', feature.get('chromosome', 'chr1'))
-                start = feature.get('chromStart', feature.get('start', 1)) - 1  # BED is 0-based
-                end = feature.get('chromEnd', feature.get('end', 1))
-                name = feature.get('name', f"feature_{uuid.uuid4()}")
-                score = feature.get('score', 0)
-                strand = feature.get('strand', '.')
-                
-                # Basic BED format (3-6 columns)
-                bed_line = f"{chrom}\t{start}\t{end}"
-                
-                if name:
-                    bed_line += f"\t{name}"
-                    
-                    if score is not None:
-                        bed_line += f"\t{score}"
-                        
-                        if strand:
-                            bed_line += f"\t{strand}"
-                
-                f.write(bed_line + '\n')
+        # Track header
+        header = f'track name="{track_name}" description="{track_description}"\n'
+        records = (_format_bed_record(feature, index) for index, feature in enumerate(features, 1))
+        self._write_chunks(output_path, _encode_chunks(chain([header], records)))
     
     async def _write_vcf(self, variants: List[Dict], output_path: Path, parameters: Dict):
         """Write variants in VCF format"""
         
-        with open(output_path, 'w') as f:
-            # VCF header
-            f.write("##fileformat=VCFv4.3\n")
-            f.write("##source=UGENE Web Platform\n")
-            f.write(f"##fileDate={datetime.utcnow().strftime('%Y%m%d')}\n")
-            
-            # INFO field definitions
-            f.write("##INFO=<ID=DP,Number=1,Type=Integer,Description=\"Total Depth\">\n")
-            f.write("##INFO=<ID=AF,Number=A,Type=Float,Description=\"Allele Frequency\">\n")
-            
-            # FORMAT field definitions
-            f.write("##FORMAT=<ID=GT,Number=1,Type=String,Description=\"Genotype\">\n")
-            f.write("##FORMAT=<ID=GQ,Number=1,Type=Integer,Description=\"Genotype Quality\">\n")
-            
-            # Column header
-            f.write("#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tSAMPLE\n")
-            
-            # Variant records
-            for variant in variants:
-                chrom = variant.get('chromosome', 'chr1')
-                pos = variant.get('position', 1)
-                var_id = variant.get('id', '.')
-                ref = variant.get('ref_allele', 'A')
-                alt = variant.get('alt_allele', 'T')
-                qual = variant.get('quality', 30)
-                filter_status = variant.get('filter', 'PASS')
-                
-                # Build INFO field
-                info_parts = []
-                if 'depth' in variant:
-                    info_parts.append(f"DP={variant['depth']}")
-                if 'allele_frequency' in variant:
-                    info_parts.append(f"AF={variant['allele_frequency']:.4f}")
-                info_str = ';'.join(info_parts) if info_parts else '.'
-                
-                # FORMAT and sample data
-                format_str = "GT:GQ"
-                sample_data = variant.get('genotype', {})
-                sample_str = f"{sample_data.get('GT', '0/1')}:{sample_data.get('GQ', 30)}"
-                
-                f.write(f"{chrom}\t{pos}\t{var_id}\t{ref}\t{alt}\t{qual}\t{filter_status}\t{info_str}\t{format_str}\t{sample_str}\n")
+        # VCF header, INFO/FORMAT field definitions and column header
+        header = (
+            "##fileformat=VCFv4.3\n"
+            "##source=UGENE Web Platform\n"
+            f"##fileDate={datetime.utcnow().strftime('%Y%m%d')}\n"
+            "##INFO=<ID=DP,Number=1,Type=Integer,Description=\"Total Depth\">\n"
+            "##INFO=<ID=AF,Number=A,Type=Float,Description=\"Allele Frequency\">\n"
+            "##FORMAT=<ID=GT,Number=1,Type=String,Description=\"Genotype\">\n"
+            "##FORMAT=<ID=GQ,Number=1,Type=Integer,Description=\"Genotype Quality\">\n"
+            "#CHROM\tPOS\tID\tREF\tALT\tQUAL\tFILTER\tINFO\tFORMAT\tSAMPLE\n"
+        )
+        
+        # Variant records, streamed to disk in encoded chunks
+        records = (_format_vcf_record(variant) for variant in variants)
+        self._write_chunks(output_path, _encode_chunks(chain([header], records)))
     
     async def _write_sam(self, alignments: List[Dict], output_path: Path, parameters: Dict):
         """Write alignments in SAM format"""
         
-        with open(output_path, 'w') as f:
-            # SAM header
-            f.write("@HD\tVN:1.6\tSO:unsorted\n")
-            f.write("@PG\tID:ugene\tPN:UGENE Web Platform\tVN:1.0\n")
-            
-            # Reference sequences
-            if 'reference_sequences' in parameters:
-                for ref in parameters['reference_sequences']:
-                    f.write(f"@SQ\tSN:{ref['name']}\tLN:{ref['length']}\n")
-            
-            # Alignment records
-            for alignment in alignments:
-                qname = alignment.get('query_name', 'unknown')
-                flag = alignment.get('flag', 0)
-                rname = alignment.get('reference_name', '*')
-                pos = alignment.get('position', 0)
-                mapq = alignment.get('mapping_quality', 60)
-                cigar = alignment.get('cigar', '*')
-                rnext = alignment.get('mate_reference', '*')
-                pnext = alignment.get('mate_position', 0)
-                tlen = alignment.get('template_length', 0)
-                seq = alignment.get('sequence', '*')
-                qual = alignment.get('quality', '*')
-                
-                f.write(f"{qname}\t{flag}\t{rname}\t{pos}\t{mapq}\t{cigar}\t{rnext}\t{pnext}\t{tlen}\t{seq}\t{qual}\n")
+        # SAM header with reference sequences
+        lines = [
+            "@HD\tVN:1.6\tSO:unsorted\n"
+            "@PG\tID:ugene\tPN:UGENE Web Platform\tVN:1.0\n"
+            + ''.join(
+                f"@SQ\tSN:{ref['name']}\tLN:{ref['length']}\n"
+                for ref in parameters.get('reference_sequences', [])
+            )
+        ]
+        
+        # Alignment records
+        for alignment in alignments:
+            qname = alignment.get('query_name', 'unknown')
+            flag = alignment.get('flag', 0)
+            rname = alignment.get('reference_name', '*')
+            pos = alignment.get('position', 0)
+            mapq = alignment.get('mapping_quality', 60)
+            cigar = alignment.get('cigar', '*')
+            rnext = alignment.get('mate_reference', '*')
+            pnext = alignment.get('mate_position', 0)
+            tlen = alignment.get('template_length', 0)
+            seq = alignment.get('sequence', '*')
+            qual = alignment.get('quality', '*')
+            
+            lines.append(f"{qname}\t{flag}\t{rname}\t{pos}\t{mapq}\t{cigar}\t{rnext}\t{pnext}\t{tlen}\t{seq}\t{qual}\n")
+        
+        self._write_chunks(output_path, _encode_chunks(lines))
     
     async def _write_clustal(self, aligned_sequences: List[Dict], output_path: Path, parameters: Dict):
         """Write multiple sequence alignment in Clustal format"""
         
-        with open(output_path, 'w') as f:
-            f.write("CLUSTAL W (1.83) multiple sequence alignment\n\n")
+        with open(output_path, 'wb') as f:
+            f.write(b"CLUSTAL W (1.83) multiple sequence alignment\n\n")
             
             if not aligned_sequences:
                 return
             
+            sequence_count = len(aligned_sequences)
+            
+            # Pull names and sequences out of the record dicts once
+            names = [seq.get('name', 'unknown') for seq in aligned_sequences]
+            sequences = [seq.get('sequence', '') for seq in aligned_sequences]
+            
             # Calculate maximum name length for formatting
-            max_name_length = max(len(seq.get('name', '')) for seq in aligned_sequences)
-            max_name_length = max(max_name_length, 10)
+            max_name_length = max(max(map(len, names)), 10)
             
-            # Get alignment length
-            alignment_length = len(aligned_sequences[0].get('sequence', '')) if aligned_sequences else 0
+            # Padded "name " prefixes as one (sequences x width) byte matrix
+            name_prefixes = b''.join(
+                name.ljust(max_name_length + 1).encode('ascii', 'replace')
+                for name in names
+            )
+            name_matrix = np.frombuffer(name_prefixes, dtype=np.uint8).reshape(sequence_count, max_name_length + 1)
+            newline_column = np.full((sequence_count, 1), ord('\n'), dtype=np.uint8)
             
-            # Write alignment in blocks
+            # Stack the alignment into a (sequences x columns) byte matrix so each
+            # block is a column view; rows shorter than the longest are filled
+            # with NUL bytes, which are dropped again when the block is written
+            encoded = [sequence.encode('ascii', 'replace') for sequence in sequences]
+            alignment_length = max(map(len, encoded))
+            ragged = min(map(len, encoded)) != alignment_length
+            rows = b''.join(row.ljust(alignment_length, b'\0') for row in encoded)
+            matrix = np.frombuffer(rows, dtype=np.uint8).reshape(sequence_count, alignment_length)
+            
+            # Write alignment in blocks, each block's rows assembled in one array
             block_size = parameters.get('block_size', 60)
+            conservation_indent = ' ' * (max_name_length + 1)
+            chunks = []
             
             for start in range(0, alignment_length, block_size):
-                for seq in aligned_sequences:
-                    name = seq.get('name', 'unknown')[:max_name_length].ljust(max_name_length)
-                    sequence_block = seq.get('sequence', '')[start:start + block_size]
-                    f.write(f"{name} {sequence_block}\n")
+                block = matrix[:, start:start + block_size]
+                lines = np.hstack([name_matrix, block, newline_column])
+                if ragged:
+                    lines = lines[lines != 0]
+                chunks.append(lines.tobytes())
                 
                 # Add conservation line
-                conservation = self._calculate_conservation_line(
-                    [seq.get('sequence', '')[start:start + block_size] for seq in aligned_sequences]
-                )
-                f.write(' ' * (max_name_length + 1) + conservation + '\n\n')
+                conservation = self._calculate_block_conservation(block)
+                chunks.append(f"{conservation_indent}{conservation}\n\n".encode())
+            
+            f.write(b''.join(chunks))
     
     async def _write_phylip(self, aligned_sequences: List[Dict], output_path: Path, parameters: Dict):
         """Write multiple sequence alignment in PHYLIP format"""
@@ -444,80 +677,107 @@ class DataWritersService:
             seq_length = len(aligned_sequences[0].get('sequence', ''))
             
             # Header
-            f.write(f"{seq_count} {seq_length}\n")
+            lines = [f"{seq_count} {seq_length}\n"]
             
             # Sequences
-            for seq in aligned_sequences:
-                name = seq.get('name', 'unknown')[:10].ljust(10)  # PHYLIP name limit
-                sequence = seq.get('sequence', '')
-                f.write(f"{name} {sequence}\n")
+            lines.extend(
+                f"{seq.get('name', 'unknown')[:10].ljust(10)} {seq.get('sequence', '')}\n"  # PHYLIP name limit
+                for seq in aligned_sequences
+            )
+            
+            f.write(''.join(lines))
     
     async def _write_stockholm(self, aligned_sequences: List[Dict], output_path: Path, parameters: Dict):
         """Write multiple sequence alignment in Stockholm format"""
         
         with open(output_path, 'w') as f:
-            f.write("# STOCKHOLM 1.0\n")
+            lines = ["# STOCKHOLM 1.0\n"]
             
             if aligned_sequences:
-                max_name_length = max(len(seq.get('name', '')) for seq in aligned_sequences)
+                names = [seq.get('name', 'unknown') for seq in aligned_sequences]
+                max_name_length = max(map(len, names))
                 
-                for seq in aligned_sequences:
-                    name = seq.get('name', 'unknown').ljust(max_name_length)
-                    sequence = seq.get('sequence', '')
-                    f.write(f"{name} {sequence}\n")
+                lines.extend(
+                    f"{name.ljust(max_name_length)} {seq.get('sequence', '')}\n"
+                    for name, seq in zip(names, aligned_sequences)
+                )
             
-            f.write("//\n")
+            lines.append("//\n")
+            f.write(''.join(lines))
     
     async def _write_csv(self, data: List[Dict], output_path: Path, parameters: Dict):
         """Write data in CSV format"""
         
-        if not data:
-            # Write empty CSV
-            with open(output_path, 'w') as f:
-                f.write("")
-            return
-        
-        # Get all possible field names
-        fieldnames = set()
-        for record in data:
-            fieldnames.update(record.keys())
-        
-        fieldnames = sorted(fieldnames)
-        
-        with open(output_path, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames)
-            writer.writeheader()
-            writer.writerows(data)
+        self._write_delimited(data, output_path, ',')
     
     async def _write_tsv(self, data: List[Dict], output_path: Path, parameters: Dict):
         """Write data in TSV format"""
         
+        self._write_delimited(data, output_path, '\t')
+    
+    def _write_delimited(self, data: List[Dict], output_path: Path, delimiter: str):
+        """Write records as delimited text with sorted fieldnames as header"""
+        
         if not data:
+            # Write empty file
             with open(output_path, 'w') as f:
                 f.write("")
             return
         
-        fieldnames = set()
-        for record in data:
-            fieldnames.update(record.keys())
+        # Get all possible field names
+        fieldnames = sorted(set().union(*(record.keys() for record in data)))
+        
+        rows = [
+            ['' if record.get(field) is None else str(record[field]) for field in fieldnames]
+            for record in data
+        ]
         
-        fieldnames = sorted(fieldnames)
+        # Fast path: no field needs quoting, so rows are joined directly with the
+        # csv module's default \r\n terminator
+        lines = [delimiter.join(fieldnames)]
+        lines.extend(delimiter.join(row) for row in rows)
+        separators = len(fieldnames) - 1
+        needs_quoting = separators == 0 or any(
+            '"' in line or '\n' in line or '\r' in line or line.count(delimiter) != separators
+            for line in lines
+        )
+        
+        if not needs_quoting:
+            self._write_chunks(output_path, [('\r\n'.join(lines) + '\r\n').encode()])
+            return
         
         with open(output_path, 'w', newline='') as f:
-            writer = csv.DictWriter(f, fieldnames=fieldnames, delimiter='\t')
-            writer.writeheader()
-            writer.writerows(data)
+            writer = csv.writer(f, delimiter=delimiter)
+            writer.writerow(fieldnames)
+            writer.writerows(rows)
     
     async def _write_json(self, data: List[Dict], output_path: Path, parameters: Dict):
         """Write data in JSON format"""
         
         pretty_print = parameters.get('pretty_print', True)
         
-        with open(output_path, 'w') as f:
+        with open(output_path, 'wb') as f:
+            f.write(self._dump_json(data, pretty_print))
+    
+    def _dump_json(self, data: Any, pretty_print: bool) -> bytes:
+        """Encode data as UTF-8 JSON, using orjson when available.
+        
+        Datetimes are written with str(), as the stdlib encoder's default=str
+        does. Non-ASCII text is written as UTF-8 rather than \\u escapes, and
+        orjson writes NaN and infinities as null.
+        """
+        
+        if orjson is not None:
+            options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
             if pretty_print:
-                json.dump(data, f, indent=2, default=str)
-            else:
-                json.dump(data, f, default=str)
+                options |= orjson.OPT_INDENT_2
+            try:
+                return orjson.dumps(data, default=str, option=options)
+            except TypeError:
+                # e.g. integers beyond 64 bits, which the stdlib encoder handles
+                pass
+        
+        return json.dumps(data, indent=2 if pretty_print else None, default=str, ensure_ascii=False).encode()
     
     async def _write_xml(self, data: List[Dict], output_path: Path, parameters: Dict):
         """Write data in XML format"""
@@ -539,29 +799,32 @@ class DataWritersService:
         tree = ET.ElementTree(root)
         tree.write(output_path, encoding='utf-8', xml_declaration=True)
     
-    def _calculate_conservation_line(self, sequence_blocks: List[str]) -> str:
-        """Calculate conservation line for Clustal format"""
+    def _calculate_block_conservation(self, block: np.ndarray) -> str:
+        """Calculate Clustal conservation line for a (sequences x columns) byte block"""
         
-        if not sequence_blocks:
+        if block.size == 0:
             return ""
         
-        conservation = ""
-        block_length = len(sequence_blocks[0]) if sequence_blocks else 0
+        # Sorting each column groups identical residues, so distinct non-gap
+        # residues are the non-gap positions that differ from their predecessor;
+        # NUL fill past the end of a shorter row counts as no residue
+        columns = np.sort(block, axis=0)
+        non_gap = (columns != ord('-')) & (columns != 0)
+        non_gap_counts = non_gap.sum(axis=0)
+        changes = np.vstack([np.ones((1, columns.shape[1]), dtype=bool), columns[1:] != columns[:-1]])
+        distinct_counts = (changes & non_gap).sum(axis=0)
         
-        for pos in range(block_length):
-            chars = [block[pos] for block in sequence_blocks if pos < len(block)]
-            non_gap_chars = [c for c in chars if c != '-']
-            
-            if len(set(non_gap_chars)) == 1 and non_gap_chars:
-                conservation += "*"  # Fully conserved
-            elif len(set(non_gap_chars)) <= 2 and len(non_gap_chars) > 1:
-                conservation += ":"  # Strongly similar
-            elif len(non_gap_chars) > 1:
-                conservation += "."  # Weakly similar
-            else:
-                conservation += " "  # No conservation
+        conservation = np.select(
+            [
+                (distinct_counts == 1) & (non_gap_counts > 0),  # Fully conserved
+                (distinct_counts <= 2) & (non_gap_counts > 1),  # Strongly similar
+                non_gap_counts > 1  # Weakly similar
+            ],
+            [ord('*'), ord(':'), ord('.')],
+            default=ord(' ')  # No conservation
+        ).astype(np.uint8)
         
-        return conservation
+        return conservation.tobytes().decode()
     
     async def write_analysis_results(
         self, 
@@ -580,8 +843,8 @@ class DataWritersService:
             output_path = self.output_directory / filename
             
             if format_type == "json":
-                with open(output_path, 'w') as f:
-                    json.dump(analysis_results, f, indent=2, default=str)
+                with open(output_path, 'wb') as f:
+                    f.write(self._dump_json(analysis_results, True))
             
             elif format_type == "csv":
                 # Convert results to tabular format
@@ -595,21 +858,8 @@ class DataWritersService:
                     df.to_csv(output_path, index=False)
             
             elif format_type == "excel":
-                if 'results' in analysis_results:
-                    # Create Excel file with multiple sheets
-                    with pd.ExcelWriter(output_path, engine='openpyxl') as writer:
-                        # Summary sheet
-                        summary_data = {k: v for k, v in analysis_results.items() if k != 'results'}
-                        summary_df = pd.DataFrame([self._flatten_dict(summary_data)])
-                        summary_df.to_excel(writer, sheet_name='Summary', index=False)
-                        
-                        # Results sheet
-                        if isinstance(analysis_results['results'], list):
-                            results_df = pd.DataFrame(analysis_results['results'])
-                            results_df.to_excel(writer, sheet_name='Results', index=False)
-                else:
-                    df = pd.DataFrame([self._flatten_dict(analysis_results)])
-                    df.to_excel(output_path, index=False)
+                # Workbook serialization is CPU-bound, keep it off the event loop
+                await asyncio.to_thread(self._write_excel, analysis_results, output_path)
             
             else:
                 return {"error": f"Unsupported format for analysis results: {format_type}"}
@@ -629,6 +879,38 @@ class DataWritersService:
             logger.error(f"Error writing analysis results: {str(e)}")
             return {"error": f"Failed to write analysis results: {str(e)}"}
     
+    def _write_excel(self, analysis_results: Dict, output_path: Path):
+        """Write analysis results to an xlsx workbook with streamed (write-only) sheets"""
+        
+        workbook = Workbook(write_only=True)
+        
+        if 'results' in analysis_results:
+            # Summary sheet
+            summary_data = {k: v for k, v in analysis_results.items() if k != 'results'}
+            self._append_excel_sheet(workbook, 'Summary', [self._flatten_dict(summary_data)])
+            
+            # Results sheet
+            if isinstance(analysis_results['results'], list):
+                self._append_excel_sheet(workbook, 'Results', analysis_results['results'])
+        else:
+            self._append_excel_sheet(workbook, 'Sheet1', [self._flatten_dict(analysis_results)])
+        
+        workbook.save(output_path)
+    
+    def _append_excel_sheet(self, workbook: Workbook, title: str, records: List[Any]):
+        """Append a sheet with a header row of all record keys followed by one row per record"""
+        
+        records = [record if isinstance(record, dict) else {0: record} for record in records]
+        fieldnames = list(dict.fromkeys(key for record in records for key in record))
+        
+        sheet = workbook.create_sheet(title)
+        sheet.append(fieldnames)
+        for record in records:
+            sheet.append([
+                value if value is None or isinstance(value, (str, int, float, datetime)) else str(value)
+                for value in (record.get(field) for field in fieldnames)
+            ])
+    
     def _flatten_dict(self, d: Dict, parent_key: str = '', sep: str = '_') -> Dict:
         """Flatten nested dictionary for tabular formats"""
         
@@ -688,42 +970,49 @@ class DataWritersService:
     async def batch_write_sequences(
         self, 
         sequence_batches: List[Dict], 
-        format_configs: List[Dict]
+        format_configs: List[Dict],
+        max_concurrency: int = 16
     ) -> Dict:
         """Write multiple sequence sets to different formats"""
         
         if len(sequence_batches) != len(format_configs):
             return {"error": "Number of sequence batches must match number of format configurations"}
         
-        results = []
-        successful_writes = 0
-        failed_writes = 0
+        # Caps the number of batches writing (and holding open files) at once
+        semaphore = asyncio.Semaphore(max_concurrency)
+        
+        async def write_batch(sequences: List[Dict], format_config: Dict) -> Dict:
+            async with semaphore:
+                return await self.write_sequences(
+                    sequences,
+                    format_config.get('format', 'fasta'),
+                    format_config.get('filename'),
+                    format_config.get('parameters', {})
+                )
         
         try:
-            for i, (sequences, format_config) in enumerate(zip(sequence_batches, format_configs)):
-                try:
-                    result = await self.write_sequences(
-                        sequences,
-                        format_config.get('format', 'fasta'),
-                        format_config.get('filename'),
-                        format_config.get('parameters', {})
-                    )
-                    
-                    results.append({
-                        "batch_index": i,
-                        "result": result
-                    })
-                    
-                    if result.get("status") == "success":
-                        successful_writes += 1
-                    else:
-                        failed_writes += 1
-                        
-                except Exception as e:
-                    results.append({
-                        "batch_index": i,
-                        "result": {"error": str(e)}
-                    })
+            batch_results = await asyncio.gather(
+                *(write_batch(sequences, format_config)
+                  for sequences, format_config in zip(sequence_batches, format_configs)),
+                return_exceptions=True
+            )
+            
+            results = []
+            successful_writes = 0
+            failed_writes = 0
+            
+            for i, result in enumerate(batch_results):
+                if isinstance(result, Exception):
+                    result = {"error": str(result)}
+                
+                results.append({
+                    "batch_index": i,
+                    "result": result
+                })
+                
+                if result.get("status") == "success":
+                    successful_writes += 1
+                else:
                     failed_writes += 1
             
             return {
@@ -744,16 +1033,26 @@ class DataWritersService:
         try:
             cutoff_time = datetime.utcnow().timestamp() - (max_age_hours * 3600)
             
+            # Directory scan and stats run in a worker thread, off the event loop
+            expired_files = await asyncio.to_thread(self._find_expired_files, cutoff_time)
+            
             cleaned_files = 0
             freed_space_bytes = 0
             
-            for file_path in self.output_directory.iterdir():
-                if file_path.is_file():
-                    file_stat = file_path.stat()
-                    
-                    if file_stat.st_mtime < cutoff_time:
-                        freed_space_bytes += file_stat.st_size
-                        file_path.unlink()
+            # Unlink in concurrent chunks on the default thread pool
+            chunk_size = 256
+            for i in range(0, len(expired_files), chunk_size):
+                chunk = expired_files[i:i + chunk_size]
+                results = await asyncio.gather(
+                    *(asyncio.to_thread(os.unlink, path) for path, _ in chunk),
+                    return_exceptions=True
+                )
+                
+                for (path, size), result in zip(chunk, results):
+                    if isinstance(result, Exception):
+                        logger.warning(f"Could not remove {path}: {str(result)}")
+                    else:
+                        freed_space_bytes += size
                         cleaned_files += 1
             
             return {
@@ -766,6 +1065,19 @@ class DataWritersService:
         except Exception as e:
             logger.error(f"Error cleaning up files: {str(e)}")
             return {"error": f"Cleanup failed: {str(e)}"}
+    
+    def _find_expired_files(self, cutoff_time: float) -> List[tuple]:
+        """List (path, size) of files in the output directory modified before cutoff_time"""
+        
+        expired_files = []
+        with os.scandir(self.output_directory) as entries:
+            for entry in entries:
+                if entry.is_file():
+                    file_stat = entry.stat()
+                    if file_stat.st_mtime < cutoff_time:
+                        expired_files.append((entry.path, file_stat.st_size))
+        
+        return expired_files
 
 # Global service instance
 data_writers_service = DataWritersService()
\ No newline at end of file
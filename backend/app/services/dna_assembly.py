@@ -1,13 +1,181 @@
 # backend/app/services/dna_assembly.py
 import asyncio
+import atexit
+import os
+import shutil
 import tempfile
 import subprocess
 from typing import List, Dict, Any, Optional
+from dataclasses import dataclass
 from collections import defaultdict, Counter
 import docker
+from Bio.SeqIO.FastaIO import SimpleFastaParser
 from fastapi import HTTPException
 import random
 import statistics
+import numpy as np
+
+try:
+    # Aho-Corasick automaton in C, used to find read seeds in one pass over a contig end
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
+# 2-bit codes for A, C, G, T; every other byte maps to an invalid code
+_BASE_CODES = np.full(256, 255, dtype=np.uint8)
+_BASE_CODES[np.frombuffer(b'ACGT', dtype=np.uint8)] = np.arange(4, dtype=np.uint8)
+_CODE_BASES = np.frombuffer(b'ACGT', dtype=np.uint8)
+
+# Longest k-mer that fits a uint64 at 2 bits per base
+_MAX_PACKED_K = 32
+
+def _pack_codes(codes: np.ndarray, k: int) -> np.ndarray:
+    """2-bit pack every k-long window of base codes (0-3) into uint64, first base in the high bits"""
+    count = len(codes) - k + 1
+    if count <= 0:
+        return np.empty(0, dtype=np.uint64)
+    
+    # Pack power-of-two blocks by doubling, then join the blocks making up k:
+    # about log2(k) array passes instead of one per base
+    blocks = {1: codes.astype(np.uint64)}
+    width = 1
+    while width * 2 <= k:
+        blocks[width * 2] = (blocks[width][:-width] << np.uint64(2 * width)) | blocks[width][width:]
+        width *= 2
+    
+    packed = None
+    offset = 0
+    for bit in reversed(range(k.bit_length())):
+        if k >> bit & 1:
+            size = 1 << bit
+            block = blocks[size][offset:offset + count]
+            packed = block if packed is None else (packed << np.uint64(2 * size)) | block
+            offset += size
+    return packed
+
+def _pack_kmers(sequence: str, k: int) -> Optional[np.ndarray]:
+    """2-bit pack every k-mer of sequence into uint64 codes.
+    
+    Returns None when the sequence has anything other than A/C/G/T.
+    """
+    codes = _BASE_CODES[np.frombuffer(sequence.encode('ascii', 'replace'), dtype=np.uint8)]
+    if (codes > 3).any():
+        return None
+    return _pack_codes(codes, k)
+
+def _unpack_kmers(packed: np.ndarray, k: int) -> List[bytes]:
+    """Decode uint64 k-mer codes back to ASCII bytes"""
+    shifts = np.arange(2 * (k - 1), -1, -2, dtype=np.uint64)
+    digits = (packed[:, None] >> shifts) & np.uint64(3)
+    text = _CODE_BASES[digits].tobytes()
+    return [text[i:i + k] for i in range(0, len(text), k)]
+
+def _normalize_case(sequence: str) -> str:
+    """Uppercase a sequence, skipping the copy when it already is"""
+    return sequence if sequence.isupper() else sequence.upper()
+
+def _encode_ascii(sequence: str) -> Optional[np.ndarray]:
+    """View an ASCII sequence as a uint8 array, or None if it has non-ASCII characters"""
+    if not sequence.isascii():
+        return None
+    return np.frombuffer(sequence.encode('ascii'), dtype=np.uint8)
+
+def _count_array_mismatches(arr1: np.ndarray, arr2: np.ndarray) -> int:
+    """Count differing positions over the shorter of two encoded sequences"""
+    min_len = min(len(arr1), len(arr2))
+    return int(np.count_nonzero(arr1[:min_len] ^ arr2[:min_len]))
+
+# MinHash sample size, and how many references per contig get the full
+# k-mer comparison once the samples have ranked them
+_MINHASH_SIZE = 128
+_MINHASH_CANDIDATES = 5
+
+def _minhash_sample(codes: np.ndarray, size: int = _MINHASH_SIZE) -> np.ndarray:
+    """The packed k-mer codes with the size smallest hashes (a bottom-k MinHash sketch)"""
+    if len(codes) <= size:
+        return codes
+    # Multiply-xorshift mix; both steps are bijective on uint64
+    hashes = codes * np.uint64(0x9E3779B97F4A7C15)
+    hashes ^= hashes >> np.uint64(31)
+    return codes[np.argpartition(hashes, size - 1)[:size]]
+
+def _estimated_similarity(sample: np.ndarray, profile_size: int, reference_codes: np.ndarray) -> float:
+    """Jaccard similarity of a profile to sorted reference codes, estimated from its MinHash sample.
+    
+    The sample's containment in the reference estimates the shared k-mers,
+    which stays accurate when the reference is far larger than the contig.
+    """
+    positions = np.searchsorted(reference_codes, sample)
+    positions[positions == len(reference_codes)] = 0
+    shared = np.count_nonzero(reference_codes[positions] == sample) / len(sample) * profile_size
+    return shared / (profile_size + len(reference_codes) - shared)
+
+def _pack_joined_windows(sequences: List[str], k: int):
+    """Pack every k-long window of the sequences joined end to end with separators.
+    
+    Returns the joined ASCII bytes (other characters become '?'), the packed code of each window (windows over
+    non-ACGT characters pack them as A), which windows touch a non-ACGT
+    character, and which windows cross from one sequence into the next.
+    """
+    joined = '\n'.join(sequences).encode('ascii', 'replace')
+    codes = _BASE_CODES[np.frombuffer(joined, dtype=np.uint8)]
+    
+    # Separator positions between sequences
+    lengths = np.fromiter(map(len, sequences), dtype=np.int64, count=len(sequences))
+    separator = np.zeros(len(codes), dtype=bool)
+    separator[(np.cumsum(lengths + 1) - 1)[:-1]] = True
+    
+    invalid = codes > 3
+    invalid_so_far = np.concatenate(([0], np.cumsum(invalid)))
+    separators_so_far = np.concatenate(([0], np.cumsum(separator)))
+    
+    packed = _pack_codes(np.where(invalid, 0, codes), k)
+    spans_invalid = (invalid_so_far[k:] - invalid_so_far[:-k]) > 0
+    spans_separator = (separators_so_far[k:] - separators_so_far[:-k]) > 0
+    return joined, packed, spans_invalid, spans_separator
+
+@dataclass
+class KmerCounts:
+    """K-mers seen at least min_coverage times, keyed by ASCII bytes"""
+    counts: Dict[bytes, int]
+    total_kmers: int
+    # Sorted packed codes of the kept ACGT k-mers and their counts
+    codes: np.ndarray
+    code_counts: np.ndarray
+
+def _count_kmers(sequences: List[str], k: int, min_coverage: int) -> KmerCounts:
+    """Count k-mers across sequences and keep those seen at least min_coverage times.
+    
+    ACGT windows are counted as packed NumPy codes and only the kept ones are
+    decoded; windows over other characters are counted as byte strings.
+    """
+    string_counts = Counter()
+    packed = np.empty(0, dtype=np.uint64)
+    
+    if not 0 < k <= _MAX_PACKED_K:
+        for sequence in sequences:
+            encoded = sequence.encode('ascii', 'replace')
+            string_counts.update(encoded[i:i+k] for i in range(len(encoded) - k + 1))
+    elif sequences:
+        # One vectorised pass over all reads; per-read NumPy calls cost more
+        # than the packing itself on short reads
+        joined, windows, spans_invalid, spans_separator = _pack_joined_windows(sequences, k)
+        packed = windows[~spans_invalid]
+        
+        # Windows touching an ambiguous base inside one read are counted as byte strings
+        ambiguous = np.flatnonzero(spans_invalid & ~spans_separator)
+        string_counts.update(joined[i:i+k] for i in ambiguous.tolist())
+    
+    unique_codes, counts = np.unique(packed, return_counts=True)
+    keep = counts >= min_coverage
+    codes = unique_codes[keep]
+    code_counts = counts[keep]
+    
+    valid_counts = dict(zip(_unpack_kmers(codes, k), code_counts.tolist())) if len(codes) else {}
+    valid_counts.update(
+        (k_mer, count) for k_mer, count in string_counts.items() if count >= min_coverage
+    )
+    return KmerCounts(valid_counts, len(unique_codes) + len(string_counts), codes, code_counts)
 
 class DNAAssemblyService:
     """Service for DNA assembly operations"""
@@ -17,6 +185,93 @@ class DNAAssemblyService:
             self.docker_client = docker.from_env()
         except:
             self.docker_client = None
+        
+        # Long-lived tool containers by image, all bind-mounting one host work
+        # directory at /data; each run gets its own subdirectory and is an
+        # exec_run, so container startup is paid once per image
+        self._containers: Dict[str, Any] = {}
+        self._container_lock = asyncio.Lock()
+        self._work_root: Optional[str] = None
+    
+    async def _get_container(self, image: str):
+        """Return the warm container for an image, starting it on first use.
+        
+        Call after _run_directory, which creates the work root it mounts.
+        """
+        async with self._container_lock:
+            container = self._containers.get(image)
+            if container is None:
+                container = await asyncio.to_thread(
+                    self.docker_client.containers.run,
+                    image,
+                    command=["sleep", "infinity"],
+                    volumes={self._work_root: {"bind": "/data", "mode": "rw"}},
+                    detach=True,
+                    remove=True
+                )
+                self._containers[image] = container
+            return container
+    
+    async def _run_tool(self, image: str, command: str) -> str:
+        """Run a command in the image's warm container and return its output.
+        
+        Raises docker.errors.ContainerError on a non-zero exit, as
+        containers.run does.
+        """
+        container = await self._get_container(image)
+        try:
+            result = await asyncio.to_thread(container.exec_run, command)
+        except docker.errors.DockerException:
+            # Other runs share the container, so it is only replaced once it
+            # has really stopped: then it is dropped from the pool, removed,
+            # and a fresh one starts next time
+            if await self._container_gone(container):
+                if self._containers.get(image) is container:
+                    del self._containers[image]
+                try:
+                    await asyncio.to_thread(container.remove, force=True)
+                except docker.errors.DockerException:
+                    pass
+            raise
+        output = result.output.decode('utf-8', 'replace')
+        if result.exit_code != 0:
+            raise docker.errors.ContainerError(container, result.exit_code, command, image, output)
+        return output
+    
+    async def _container_gone(self, container) -> bool:
+        """Whether a warm container has been removed or is no longer running.
+        
+        False when its state cannot be checked, so a failing daemon call does
+        not cost the runs that share the container.
+        """
+        try:
+            await asyncio.to_thread(container.reload)
+        except docker.errors.NotFound:
+            return True
+        except docker.errors.DockerException:
+            return False
+        return container.status != 'running'
+    
+    def _run_directory(self) -> tempfile.TemporaryDirectory:
+        """Temporary run directory under the shared work root"""
+        if self._work_root is None:
+            self._work_root = tempfile.mkdtemp(prefix="dna_assembly_")
+            # Removed at exit too, in case close() is never called
+            atexit.register(shutil.rmtree, self._work_root, True)
+        return tempfile.TemporaryDirectory(dir=self._work_root)
+    
+    async def close(self):
+        """Stop the warm tool containers and remove the shared work directory"""
+        containers = list(self._containers.values())
+        self._containers.clear()
+        for container in containers:
+            try:
+                await asyncio.to_thread(container.stop)
+            except docker.errors.DockerException:
+                pass
+        if self._work_root is not None:
+            await asyncio.to_thread(shutil.rmtree, self._work_root, True)
+            self._work_root = None
     
     async def assembler_1(self, reads: List[Dict], parameters: Dict = None) -> Dict:
         """Overlap-layout-consensus assembly algorithm"""
@@ -35,24 +290,34 @@ class DNAAssemblyService:
                         sequences.append(read['r2']['sequence'])
                 else:
                     sequences.append(str(read))
+            # Normalize case once here so the hot paths never re-uppercase
+            sequences = [_normalize_case(sequence) for sequence in sequences]
             
             contigs = []
-            used_reads = set()
+            # One flag per read, set as soon as the read joins a contig
+            used_reads = bytearray(len(sequences))
+            min_overlap = parameters['min_overlap']
+            prefix_index, suffix_index = self._build_overlap_index(sequences, min_overlap)
+            max_read_length = max(map(len, sequences), default=0)
             
             for i, seq1 in enumerate(sequences):
-                if i in used_reads:
+                if used_reads[i]:
                     continue
                     
                 contig_sequence = seq1
                 current_reads = [i]
+                used_reads[i] = 1
                 
                 # Find overlapping reads
                 extended = True
                 while extended:
                     extended = False
-                    for j, seq2 in enumerate(sequences):
-                        if j in used_reads or j in current_reads:
+                    for j in self._overlap_candidates(
+                        contig_sequence, prefix_index, suffix_index, min_overlap, max_read_length
+                    ):
+                        if used_reads[j]:
                             continue
+                        seq2 = sequences[j]
                         
                         # Check for overlap at the end
                         overlap = self._find_overlap(
@@ -63,6 +328,7 @@ class DNAAssemblyService:
                             # Extend contig
                             contig_sequence = contig_sequence + seq2[overlap:]
                             current_reads.append(j)
+                            used_reads[j] = 1
                             extended = True
                             break
                         
@@ -75,13 +341,10 @@ class DNAAssemblyService:
                             # Prepend to contig
                             contig_sequence = seq2 + contig_sequence[overlap:]
                             current_reads.append(j)
+                            used_reads[j] = 1
                             extended = True
                             break
                 
-                # Mark reads as used
-                for read_idx in current_reads:
-                    used_reads.add(read_idx)
-                
                 # Only keep contigs above minimum length
                 if len(contig_sequence) >= parameters.get('min_contig_length', 100):
                     contigs.append({
@@ -93,14 +356,16 @@ class DNAAssemblyService:
                         "gc_content": self._calculate_gc_content(contig_sequence)
                     })
             
+            reads_used = used_reads.count(1)
+            
             return {
                 "contigs": contigs,
                 "stats": self._calculate_assembly_stats(contigs),
                 "parameters": parameters,
                 "algorithm": "overlap-layout-consensus",
                 "input_reads": len(sequences),
-                "reads_used": len(used_reads),
-                "reads_unused": len(sequences) - len(used_reads)
+                "reads_used": reads_used,
+                "reads_unused": len(sequences) - reads_used
             }
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Assembly error: {str(e)}")
@@ -122,51 +387,57 @@ class DNAAssemblyService:
                         sequences.append(read['r2']['sequence'])
                 else:
                     sequences.append(str(read))
+            # Normalize case once here so the hot paths never re-uppercase
+            sequences = [_normalize_case(sequence) for sequence in sequences]
             
             # Build k-mer graph
             k = parameters['k_mer_size']
-            k_mer_counts = Counter()
             
-            # Count k-mers
-            for sequence in sequences:
-                for i in range(len(sequence) - k + 1):
-                    k_mer = sequence[i:i+k]
-                    k_mer_counts[k_mer] += 1
+            # Count k-mers, keeping those at minimum coverage
+            kmer_counts = _count_kmers(sequences, k, parameters['min_coverage'])
+            valid_k_mers = kmer_counts.counts
             
-            # Filter by minimum coverage
-            valid_k_mers = {kmer for kmer, count in k_mer_counts.items() if count >= parameters['min_coverage']}
+            # Bucket k-mers by their (k-1)-prefix so each k-mer's successors
+            # are a single lookup on its (k-1)-suffix
+            prefix_buckets = defaultdict(list)
+            for kmer in valid_k_mers:
+                prefix_buckets[kmer[:-1]].append(kmer)
             
             # Build overlap graph
             overlap_graph = defaultdict(list)
             for kmer in valid_k_mers:
-                prefix = kmer[:-1]
-                suffix = kmer[1:]
-                
-                # Find overlapping k-mers
-                for other_kmer in valid_k_mers:
-                    if kmer != other_kmer and suffix == other_kmer[:-1]:
-                        overlap_graph[kmer].append(other_kmer)
+                successors = [other_kmer for other_kmer in prefix_buckets.get(kmer[1:], ()) if other_kmer != kmer]
+                if successors:
+                    overlap_graph[kmer] = successors
             
             # Greedy assembly
-            contigs = []
+            contig_sequences = []
             used_k_mers = set()
             
             for k_mer in valid_k_mers:
                 if k_mer in used_k_mers:
                     continue
                 
-                # Extend contig
-                contig = self._extend_contig(k_mer, overlap_graph, used_k_mers)
+                # Extend contig; k-mers stay bytes until here
+                contig = self._extend_contig(k_mer, overlap_graph, used_k_mers, valid_k_mers).decode('ascii')
                 
                 if len(contig) >= parameters.get('min_contig_length', 100):
-                    contigs.append({
-                        "id": f"contig_{len(contigs)+1}",
-                        "sequence": contig,
-                        "length": len(contig),
-                        "algorithm": "greedy-k-mer",
-                        "k_mer_coverage": self._calculate_kmer_coverage(contig, k_mer_counts, k),
-                        "gc_content": self._calculate_gc_content(contig)
-                    })
+                    contig_sequences.append(contig)
+            
+            # K-mer coverage for all contigs in one batch
+            coverages = self._calculate_kmer_coverages(contig_sequences, kmer_counts, k)
+            
+            contigs = [
+                {
+                    "id": f"contig_{number}",
+                    "sequence": contig,
+                    "length": len(contig),
+                    "algorithm": "greedy-k-mer",
+                    "k_mer_coverage": coverage,
+                    "gc_content": self._calculate_gc_content(contig)
+                }
+                for number, (contig, coverage) in enumerate(zip(contig_sequences, coverages), 1)
+            ]
             
             return {
                 "contigs": contigs,
@@ -174,7 +445,7 @@ class DNAAssemblyService:
                 "parameters": parameters,
                 "algorithm": "greedy-k-mer",
                 "k_mer_stats": {
-                    "total_kmers": len(k_mer_counts),
+                    "total_kmers": kmer_counts.total_kmers,
                     "valid_kmers": len(valid_k_mers),
                     "used_kmers": len(used_k_mers)
                 }
@@ -191,62 +462,27 @@ class DNAAssemblyService:
             if not self.docker_client:
                 raise HTTPException(status_code=500, detail="Docker not available for CAP3 assembly")
             
-            with tempfile.TemporaryDirectory() as temp_dir:
+            with self._run_directory() as temp_dir:
                 # Write sequences to FASTA file
                 input_file = f"{temp_dir}/input.fasta"
-                with open(input_file, 'w') as f:
-                    for i, seq in enumerate(sequences):
-                        seq_data = seq.get('sequence', '') if isinstance(seq, dict) else str(seq)
-                        seq_id = seq.get('id', f'seq_{i}') if isinstance(seq, dict) else f'seq_{i}'
-                        f.write(f">{seq_id}\n{seq_data}\n")
+                await asyncio.to_thread(self._write_cap3_input, input_file, sequences)
+                data_dir = f"/data/{os.path.basename(temp_dir)}"
                 
-                # Run CAP3 in Docker container
+                # Run CAP3 in its warm Docker container; the Docker calls block,
+                # so they run in worker threads to keep the event loop free
                 try:
-                    container = self.docker_client.containers.run(
+                    logs = await self._run_tool(
                         "biocontainers/cap3:latest",
-                        command=f"cap3 /data/input.fasta -o {parameters['overlap_length']} -p {parameters['overlap_percent_identity']}",
-                        volumes={temp_dir: {"bind": "/data", "mode": "rw"}},
-                        detach=True,
-                        remove=True
+                        f"cap3 {data_dir}/input.fasta -o {parameters['overlap_length']} -p {parameters['overlap_percent_identity']}"
                     )
                     
-                    # Wait for completion
-                    result = container.wait()
-                    logs = container.logs().decode('utf-8')
-                    
                     # Parse results
                     contigs_file = f"{temp_dir}/input.fasta.cap.contigs"
                     singlets_file = f"{temp_dir}/input.fasta.cap.singlets"
                     
-                    contigs = []
-                    
-                    # Read contigs if file exists
-                    try:
-                        with open(contigs_file, 'r') as f:
-                            for record in SeqIO.parse(f, "fasta"):
-                                contigs.append({
-                                    "id": record.id,
-                                    "sequence": str(record.seq),
-                                    "length": len(record.seq),
-                                    "type": "contig",
-                                    "gc_content": self._calculate_gc_content(str(record.seq))
-                                })
-                    except FileNotFoundError:
-                        pass
-                    
-                    # Read singlets if file exists
-                    try:
-                        with open(singlets_file, 'r') as f:
-                            for record in SeqIO.parse(f, "fasta"):
-                                contigs.append({
-                                    "id": record.id,
-                                    "sequence": str(record.seq),
-                                    "length": len(record.seq),
-                                    "type": "singlet",
-                                    "gc_content": self._calculate_gc_content(str(record.seq))
-                                })
-                    except FileNotFoundError:
-                        pass
+                    # Read contigs and singlets if the files exist
+                    contigs = await asyncio.to_thread(self._read_contigs, contigs_file, type="contig")
+                    contigs += await asyncio.to_thread(self._read_contigs, singlets_file, type="singlet")
                     
                     return {
                         "contigs": contigs,
@@ -264,21 +500,144 @@ class DNAAssemblyService:
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"CAP3 assembly error: {str(e)}")
 
+    def _write_cap3_input(self, input_file: str, sequences: List):
+        """Write CAP3 input sequences as FASTA"""
+        records = []
+        for i, seq in enumerate(sequences):
+            seq_data = _normalize_case(seq.get('sequence', '') if isinstance(seq, dict) else str(seq))
+            seq_id = seq.get('id', f'seq_{i}') if isinstance(seq, dict) else f'seq_{i}'
+            records.append(f">{seq_id}\n{seq_data}\n")
+        
+        with open(input_file, 'wb') as f:
+            f.write(''.join(records).encode())
+    
+    def _write_spades_inputs(self, temp_dir: str, pe_reads: List[Dict], se_reads: List[Dict]):
+        """Write SPAdes paired-end and single-end FASTQ inputs"""
+        # Mock quality lines, one per distinct read length
+        quality_lines = {}
+        
+        def fastq_record(read_id: str, sequence: str) -> str:
+            quality = quality_lines.get(len(sequence))
+            if quality is None:
+                quality = quality_lines[len(sequence)] = "I" * len(sequence)
+            return f"@{read_id}\n{sequence}\n+\n{quality}\n"
+        
+        # Write paired-end reads
+        if pe_reads:
+            r1_records = [fastq_record(read['r1']['id'], read['r1']['sequence']) for read in pe_reads]
+            r2_records = [fastq_record(read['r2']['id'], read['r2']['sequence']) for read in pe_reads]
+            
+            with open(f"{temp_dir}/reads_R1.fastq", 'wb') as f1:
+                f1.write(''.join(r1_records).encode())
+            with open(f"{temp_dir}/reads_R2.fastq", 'wb') as f2:
+                f2.write(''.join(r2_records).encode())
+        
+        # Write single-end reads
+        if se_reads:
+            default_id = f'read_{len(se_reads)}'
+            se_records = [
+                fastq_record(read.get('id', default_id), read.get('sequence', '')) for read in se_reads
+            ]
+            with open(f"{temp_dir}/reads_SE.fastq", 'wb') as f:
+                f.write(''.join(se_records).encode())
+    
+    def _read_contigs(self, fasta_file: str, **fields) -> List[Dict]:
+        """Parse assembler FASTA output into contig dicts; empty if the file does not exist"""
+        try:
+            with open(fasta_file, 'r') as f:
+                return [
+                    {
+                        "id": title.split(None, 1)[0] if title else "",
+                        "sequence": sequence,
+                        "length": len(sequence),
+                        "gc_content": self._calculate_gc_content(sequence),
+                        **fields
+                    }
+                    for title, sequence in SimpleFastaParser(f)
+                ]
+        except FileNotFoundError:
+            return []
+    
+    def _build_overlap_index(self, sequences: List[str], min_overlap: int):
+        """Index reads by their first and last min_overlap bases"""
+        prefix_index = defaultdict(list)
+        suffix_index = defaultdict(list)
+        
+        for j, sequence in enumerate(sequences):
+            if len(sequence) >= min_overlap:
+                prefix_index[sequence[:min_overlap]].append(j)
+                suffix_index[sequence[len(sequence) - min_overlap:]].append(j)
+        
+        if ahocorasick is not None and min_overlap > 0 and prefix_index:
+            return self._build_automaton(prefix_index), self._build_automaton(suffix_index)
+        return prefix_index, suffix_index
+    
+    def _build_automaton(self, index: Dict[str, List[int]]):
+        """Compile a seed -> read numbers index into an Aho-Corasick automaton"""
+        automaton = ahocorasick.Automaton()
+        for seed, read_numbers in index.items():
+            automaton.add_word(seed, read_numbers)
+        automaton.make_automaton()
+        return automaton
+    
+    def _overlap_candidates(self, contig: str, prefix_index, suffix_index,
+                            min_overlap: int, max_read_length: int) -> List[int]:
+        """Reads that could overlap either end of the contig by at least min_overlap, in read order"""
+        candidates = set()
+        window = min(len(contig), max_read_length)
+        
+        if not isinstance(prefix_index, dict):
+            # All seeds are min_overlap long, so every seed found in the last (or
+            # first) window bases of the contig is exactly one of the probes below
+            for _, read_numbers in prefix_index.iter(contig, len(contig) - window):
+                candidates.update(read_numbers)
+            for _, read_numbers in suffix_index.iter(contig, 0, window):
+                candidates.update(read_numbers)
+            return sorted(candidates)
+        
+        # A read overlapping the contig end by L bases starts with contig[-L:][:min_overlap]
+        for start in range(len(contig) - window, len(contig) - min_overlap + 1):
+            candidates.update(prefix_index.get(contig[start:start + min_overlap], ()))
+        
+        # A read overlapping the contig start by L bases ends with contig[:L][-min_overlap:]
+        for end in range(min_overlap, window + 1):
+            candidates.update(suffix_index.get(contig[end - min_overlap:end], ()))
+        
+        return sorted(candidates)
+    
     def _find_overlap(self, seq1: str, seq2: str, min_overlap: int) -> int:
         """Find overlap between two sequences"""
-        max_overlap = 0
+        max_length = min(len(seq1), len(seq2))
+        if min_overlap <= 0:
+            # Degenerate bound: keep the exhaustive scan
+            max_overlap = 0
+            for i in range(min_overlap, max_length + 1):
+                if seq1[-i:] == seq2[:i]:
+                    max_overlap = i
+            return max_overlap
+        if max_length < min_overlap:
+            return 0
         
-        # Check suffix of seq1 with prefix of seq2
-        for i in range(min_overlap, min(len(seq1), len(seq2)) + 1):
-            if seq1[-i:] == seq2[:i]:
-                max_overlap = i
+        # Any overlap of length L puts seq2's first min_overlap bases at seq1[-L:];
+        # str.find jumps between those spots, leftmost (longest overlap) first.
+        # Low-complexity input can make every spot a candidate, but each check is
+        # a C-level compare, which still beats a per-character KMP pass in Python
+        # at read and contig-end lengths
+        seed = seq2[:min_overlap]
+        position = seq1.find(seed, len(seq1) - max_length)
+        while position != -1:
+            if seq2.startswith(seq1[position:]):
+                return len(seq1) - position
+            position = seq1.find(seed, position + 1)
         
-        return max_overlap
+        return 0
     
-    def _extend_contig(self, start_kmer: str, overlap_graph: Dict, used_k_mers: set) -> str:
+    def _extend_contig(self, start_kmer: bytes, overlap_graph: Dict, used_k_mers: set,
+                       kmer_counts: Dict[bytes, int]) -> bytes:
         """Extend contig from starting k-mer using overlap graph"""
-        contig = start_kmer
+        bases = [start_kmer]
         used_k_mers.add(start_kmer)
+        coverage = kmer_counts.get
         
         # Extend forward
         current_kmer = start_kmer
@@ -287,13 +646,13 @@ class DNAAssemblyService:
             if not next_kmers:
                 break
             
-            # Choose the k-mer with highest coverage (simplified: just take first)
-            next_kmer = next_kmers[0]
-            contig += next_kmer[-1]  # Add the last character
+            # Choose the k-mer with highest coverage (first one on ties)
+            next_kmer = next_kmers[0] if len(next_kmers) == 1 else max(next_kmers, key=lambda k: coverage(k, 0))
+            bases.append(next_kmer[-1:])  # Add the last character
             used_k_mers.add(next_kmer)
             current_kmer = next_kmer
         
-        return contig
+        return b''.join(bases)
     
     def _calculate_assembly_stats(self, contigs: List[Dict]) -> Dict:
         """Calculate comprehensive assembly statistics"""
@@ -303,11 +662,8 @@ class DNAAssemblyService:
         lengths = [contig['length'] for contig in contigs]
         total_length = sum(lengths)
         
-        # Calculate N50
-        n50 = self._calculate_n50(sorted(lengths, reverse=True), total_length)
-        
-        # Calculate L50 (number of contigs contributing to N50)
-        l50 = self._calculate_l50(sorted(lengths, reverse=True), total_length)
+        # N50, L50 (number of contigs contributing to N50) and N90
+        nx_stats = self._calculate_nx_stats(lengths)
         
         # GC content statistics
         gc_contents = [contig.get('gc_content', 0) for contig in contigs if contig.get('gc_content') is not None]
@@ -318,60 +674,87 @@ class DNAAssemblyService:
             "largest_contig": max(lengths),
             "smallest_contig": min(lengths),
             "mean_length": total_length / len(contigs),
-            "median_length": statistics.median(lengths),
-            "n50": n50,
-            "l50": l50,
-            "n90": self._calculate_n90(sorted(lengths, reverse=True), total_length)
+            "median_length": float(np.median(lengths)),
+            "n50": nx_stats["n50"],
+            "l50": nx_stats["l50"],
+            "n90": nx_stats["n90"]
         }
         
         if gc_contents:
             stats["gc_content"] = {
                 "mean": statistics.mean(gc_contents),
-                "median": statistics.median(gc_contents),
+                "median": float(np.median(gc_contents)),
                 "min": min(gc_contents),
                 "max": max(gc_contents)
             }
         
         return stats
     
-    def _calculate_n50(self, lengths: List[int], total_length: int) -> int:
-        """Calculate N50 statistic"""
-        target = total_length / 2
-        cumulative = 0
-        for length in lengths:
-            cumulative += length
-            if cumulative >= target:
-                return length
-        return 0
-    
-    def _calculate_l50(self, lengths: List[int], total_length: int) -> int:
-        """Calculate L50 statistic (number of contigs in N50)"""
-        target = total_length / 2
-        cumulative = 0
-        for i, length in enumerate(lengths):
-            cumulative += length
-            if cumulative >= target:
-                return i + 1
-        return len(lengths)
-    
-    def _calculate_n90(self, lengths: List[int], total_length: int) -> int:
-        """Calculate N90 statistic"""
-        target = total_length * 0.9
-        cumulative = 0
-        for length in lengths:
-            cumulative += length
-            if cumulative >= target:
-                return length
-        return 0
+    def _calculate_nx_stats(self, lengths: List[int]) -> Dict:
+        """Calculate N50, L50 and N90 from a single descending sort"""
+        if not lengths:
+            return {"n50": 0, "l50": 0, "n90": 0}
+        
+        sorted_lengths = np.sort(np.asarray(lengths))[::-1]
+        cumulative = np.cumsum(sorted_lengths)
+        total_length = cumulative[-1]
+        
+        # First contig at which the cumulative length reaches each target
+        n50_index = int(np.searchsorted(cumulative, total_length / 2))
+        n90_index = int(np.searchsorted(cumulative, total_length * 0.9))
+        
+        return {
+            "n50": sorted_lengths[n50_index].item(),
+            "l50": n50_index + 1,
+            "n90": sorted_lengths[n90_index].item()
+        }
     
     def _calculate_gc_content(self, sequence: str) -> float:
         """Calculate GC content"""
         if not sequence:
             return 0.0
-        gc_count = sequence.upper().count('G') + sequence.upper().count('C')
+        if sequence.isascii():
+            # One C-level pass that drops G/C in either case; what is removed is the GC count
+            encoded = sequence.encode('ascii')
+            gc_count = len(encoded) - len(encoded.translate(None, b'GCgc'))
+        else:
+            gc_count = sum(map(sequence.count, 'GCgc'))
         return (gc_count / len(sequence)) * 100
     
-    def _calculate_kmer_coverage(self, contig: str, kmer_counts: Counter, k: int) -> float:
+    def _calculate_kmer_coverages(self, contigs: List[str], kmer_counts: KmerCounts, k: int) -> List[float]:
+        """Calculate average k-mer coverage for each contig in one vectorised pass"""
+        if not contigs or not 0 < k <= _MAX_PACKED_K:
+            return [
+                self._calculate_kmer_coverage(contig.encode('ascii', 'replace'), kmer_counts.counts, k)
+                for contig in contigs
+            ]
+        
+        joined, windows, spans_invalid, spans_separator = _pack_joined_windows(contigs, k)
+        
+        # Look packed windows up in the sorted kept codes; misses count 0
+        coverage = np.zeros(len(windows), dtype=np.float64)
+        if len(kmer_counts.codes):
+            positions = np.searchsorted(kmer_counts.codes, windows)
+            positions[positions == len(kmer_counts.codes)] = 0
+            found = ~spans_invalid & (kmer_counts.codes[positions] == windows)
+            coverage[found] = kmer_counts.code_counts[positions[found]]
+        
+        # Windows over ambiguous bases are looked up as byte strings
+        for i in np.flatnonzero(spans_invalid & ~spans_separator).tolist():
+            coverage[i] = kmer_counts.counts.get(joined[i:i+k], 0)
+        
+        # Windows not crossing a separator belong to the contigs in order
+        lengths = np.fromiter(map(len, contigs), dtype=np.int64, count=len(contigs))
+        window_counts = lengths - k + 1
+        contig_numbers = np.repeat(np.arange(len(contigs)), np.maximum(window_counts, 0))
+        totals = np.bincount(contig_numbers, weights=coverage[~spans_separator], minlength=len(contigs))
+        
+        return [
+            total / window_count if window_count > 0 else 0.0
+            for total, window_count in zip(totals.tolist(), window_counts.tolist())
+        ]
+    
+    def _calculate_kmer_coverage(self, contig: bytes, kmer_counts: Dict[bytes, int], k: int) -> float:
         """Calculate average k-mer coverage for a contig"""
         if len(contig) < k:
             return 0.0
@@ -396,7 +779,7 @@ class DNAAssemblyService:
                 # Fallback to simple assembly
                 return await self.assembler_2(reads, parameters)
             
-            with tempfile.TemporaryDirectory() as temp_dir:
+            with self._run_directory() as temp_dir:
                 # Prepare input files
                 pe_reads = []
                 se_reads = []
@@ -408,39 +791,16 @@ class DNAAssemblyService:
                         elif 'sequence' in read:
                             se_reads.append(read)
                 
-                # Write paired-end reads
-                if pe_reads:
-                    r1_file = f"{temp_dir}/reads_R1.fastq"
-                    r2_file = f"{temp_dir}/reads_R2.fastq"
-                    
-                    with open(r1_file, 'w') as f1, open(r2_file, 'w') as f2:
-                        for read in pe_reads:
-                            r1_data = read['r1']
-                            r2_data = read['r2']
-                            
-                            f1.write(f"@{r1_data['id']}\n{r1_data['sequence']}\n+\n")
-                            f1.write("I" * len(r1_data['sequence']) + "\n")  # Mock quality
-                            
-                            f2.write(f"@{r2_data['id']}\n{r2_data['sequence']}\n+\n")
-                            f2.write("I" * len(r2_data['sequence']) + "\n")  # Mock quality
-                
-                # Write single-end reads
-                if se_reads:
-                    se_file = f"{temp_dir}/reads_SE.fastq"
-                    with open(se_file, 'w') as f:
-                        for read in se_reads:
-                            seq_data = read.get('sequence', '')
-                            seq_id = read.get('id', f'read_{len(se_reads)}')
-                            f.write(f"@{seq_id}\n{seq_data}\n+\n")
-                            f.write("I" * len(seq_data) + "\n")  # Mock quality
+                await asyncio.to_thread(self._write_spades_inputs, temp_dir, pe_reads, se_reads)
                 
                 # Build SPAdes command
-                spades_cmd = ["spades.py", "-o", "/data/output"]
+                data_dir = f"/data/{os.path.basename(temp_dir)}"
+                spades_cmd = ["spades.py", "-o", f"{data_dir}/output"]
                 
                 if pe_reads:
-                    spades_cmd.extend(["-1", "/data/reads_R1.fastq", "-2", "/data/reads_R2.fastq"])
+                    spades_cmd.extend(["-1", f"{data_dir}/reads_R1.fastq", "-2", f"{data_dir}/reads_R2.fastq"])
                 if se_reads:
-                    spades_cmd.extend(["-s", "/data/reads_SE.fastq"])
+                    spades_cmd.extend(["-s", f"{data_dir}/reads_SE.fastq"])
                 
                 spades_cmd.extend(["-k", parameters["k_list"]])
                 
@@ -449,34 +809,14 @@ class DNAAssemblyService:
                 
                 try:
                     # Run SPAdes
-                    container = self.docker_client.containers.run(
+                    logs = await self._run_tool(
                         "quay.io/biocontainers/spades:3.15.3--h95f258a_0",
-                        command=" ".join(spades_cmd),
-                        volumes={temp_dir: {"bind": "/data", "mode": "rw"}},
-                        detach=True,
-                        remove=True
+                        " ".join(spades_cmd)
                     )
                     
-                    result = container.wait()
-                    logs = container.logs().decode('utf-8')
-                    
-                    # Parse assembly results
+                    # Parse assembly results (empty if no contigs were generated)
                     contigs_file = f"{temp_dir}/output/contigs.fasta"
-                    contigs = []
-                    
-                    try:
-                        from Bio import SeqIO
-                        for record in SeqIO.parse(contigs_file, "fasta"):
-                            contigs.append({
-                                "id": record.id,
-                                "sequence": str(record.seq),
-                                "length": len(record.seq),
-                                "gc_content": self._calculate_gc_content(str(record.seq)),
-                                "algorithm": "SPAdes"
-                            })
-                    except FileNotFoundError:
-                        # No contigs generated, fallback
-                        pass
+                    contigs = await asyncio.to_thread(self._read_contigs, contigs_file, algorithm="SPAdes")
                     
                     return {
                         "contigs": contigs,
@@ -517,13 +857,13 @@ class DNAAssemblyService:
     def _calculate_contiguity_metrics(self, contigs: List[Dict]) -> Dict:
         """Calculate contiguity metrics"""
         lengths = [contig['length'] for contig in contigs]
-        total_length = sum(lengths)
+        nx_stats = self._calculate_nx_stats(lengths)
         
         return {
             "total_contigs": len(contigs),
             "largest_contig": max(lengths) if lengths else 0,
-            "contig_n50": self._calculate_n50(sorted(lengths, reverse=True), total_length),
-            "contig_l50": self._calculate_l50(sorted(lengths, reverse=True), total_length),
+            "contig_n50": nx_stats["n50"],
+            "contig_l50": nx_stats["l50"],
             "gaps": len(contigs) - 1 if len(contigs) > 1 else 0
         }
 
@@ -551,21 +891,38 @@ class DNAAssemblyService:
             total_aligned = 0
             total_mismatches = 0
             
+            # Each reference's k-mers are extracted once, not once per contig, and
+            # references are encoded for mismatch counting the first time they match
+            reference_profiles = [self._kmer_profile(ref.get('sequence', '')) for ref in reference_sequences]
+            reference_arrays = {}
+            
             for contig in contigs:
                 # Find best matching reference
                 best_match = None
+                best_index = None
                 best_score = 0
+                contig_profile = self._kmer_profile(contig['sequence'])
+                candidates = self._candidate_references(contig_profile, reference_profiles)
                 
-                for ref in reference_sequences:
-                    score = self._simple_alignment_score(contig['sequence'], ref.get('sequence', ''))
+                for index in candidates:
+                    score = self._profile_similarity(contig_profile, reference_profiles[index])
                     if score > best_score:
                         best_score = score
-                        best_match = ref
+                        best_index = index
+                        best_match = reference_sequences[index]
                 
                 if best_match:
                     total_aligned += 1
                     # Calculate mismatches (simplified)
-                    mismatches = self._count_mismatches(contig['sequence'], best_match['sequence'])
+                    if best_index not in reference_arrays:
+                        reference_arrays[best_index] = _encode_ascii(best_match['sequence'])
+                    contig_array = _encode_ascii(contig['sequence'])
+                    reference_array = reference_arrays[best_index]
+                    
+                    if contig_array is not None and reference_array is not None:
+                        mismatches = _count_array_mismatches(contig_array, reference_array)
+                    else:
+                        mismatches = self._count_mismatches(contig['sequence'], best_match['sequence'])
                     total_mismatches += mismatches
             
             return {
@@ -577,15 +934,62 @@ class DNAAssemblyService:
         except Exception as e:
             return {"error": f"Error calculating correctness: {str(e)}"}
 
+    def _candidate_references(self, contig_profile, reference_profiles: List) -> List[int]:
+        """Indices of the references worth a full k-mer comparison with a contig.
+        
+        With more references than _MINHASH_CANDIDATES, ACGT references are
+        ranked by MinHash-estimated similarity and only the top ones are kept;
+        references with ambiguous bases are always compared in full.
+        """
+        if len(reference_profiles) <= _MINHASH_CANDIDATES or not isinstance(contig_profile, np.ndarray):
+            return list(range(len(reference_profiles)))
+        
+        sample = _minhash_sample(contig_profile)
+        estimated = []
+        unestimated = []
+        for index, profile in enumerate(reference_profiles):
+            if isinstance(profile, np.ndarray):
+                estimated.append((_estimated_similarity(sample, len(contig_profile), profile), index))
+            elif profile is not None:
+                unestimated.append(index)
+        
+        # Best estimates first, earlier references on ties
+        estimated.sort(key=lambda item: (-item[0], item[1]))
+        top = [index for _, index in estimated[:_MINHASH_CANDIDATES]]
+        
+        # Keep reference order so ties on the full score still go to the first
+        return sorted(top + unestimated)
+    
     def _simple_alignment_score(self, seq1: str, seq2: str) -> float:
         """Simple alignment scoring (placeholder)"""
         # Simplified: count matching k-mers
-        k = 10
-        if len(seq1) < k or len(seq2) < k:
+        return self._profile_similarity(self._kmer_profile(seq1), self._kmer_profile(seq2))
+    
+    def _kmer_profile(self, sequence: str, k: int = 10):
+        """Distinct k-mers of a sequence, or None if it is shorter than k.
+        
+        ACGT-only sequences give sorted 2-bit codes, anything else a set of strings.
+        """
+        if len(sequence) < k:
+            return None
+        
+        codes = _pack_kmers(sequence, k)
+        if codes is not None:
+            return np.unique(codes)
+        return set(sequence[i:i+k] for i in range(len(sequence) - k + 1))
+    
+    def _profile_similarity(self, profile1, profile2, k: int = 10) -> float:
+        """Jaccard similarity of two k-mer profiles"""
+        if profile1 is None or profile2 is None:
             return 0.0
         
-        kmers1 = set(seq1[i:i+k] for i in range(len(seq1) - k + 1))
-        kmers2 = set(seq2[i:i+k] for i in range(len(seq2) - k + 1))
+        if isinstance(profile1, np.ndarray) and isinstance(profile2, np.ndarray):
+            intersection = len(np.intersect1d(profile1, profile2, assume_unique=True))
+            return intersection / (len(profile1) + len(profile2) - intersection)
+        
+        # At least one side has ambiguous bases: compare as strings
+        kmers1 = {kmer.decode('ascii') for kmer in _unpack_kmers(profile1, k)} if isinstance(profile1, np.ndarray) else profile1
+        kmers2 = {kmer.decode('ascii') for kmer in _unpack_kmers(profile2, k)} if isinstance(profile2, np.ndarray) else profile2
         
         intersection = len(kmers1.intersection(kmers2))
         union = len(kmers1.union(kmers2))
@@ -594,5 +998,10 @@ class DNAAssemblyService:
 
     def _count_mismatches(self, seq1: str, seq2: str) -> int:
         """Count mismatches between two sequences"""
+        arr1 = _encode_ascii(seq1)
+        arr2 = _encode_ascii(seq2)
+        if arr1 is not None and arr2 is not None:
+            return _count_array_mismatches(arr1, arr2)
+        
         min_len = min(len(seq1), len(seq2))
         return sum(1 for i in range(min_len) if seq1[i] != seq2[i])
\ No newline at end of file
@@ -1,21 +1,90 @@
 # backend/app/services/external_tool_manager.py
 import asyncio
+import base64
+import contextvars
+import copy
 import docker
+import functools
 import subprocess
 import tempfile
 import os
 import json
 import uuid
-from typing import Dict, List, Any, Optional, Tuple
+import time
+import hashlib
+import numpy as np
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Any, Optional, Tuple
 from dataclasses import dataclass
 from pathlib import Path
 import logging
 import shutil
 import tarfile
+import xml.etree.ElementTree as ET
 import io
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
 logger = logging.getLogger(__name__)
 
+# Docker daemons slow down sharply with many container starts in flight
+MAX_PARALLEL_RUNS = int(os.getenv("MAX_PARALLEL_DOCKER_RUNS", "10"))
+
+# Blocking docker-py calls (tool runs, waits, pulls) run on one pool per
+# process, however many managers exist, instead of the event loop's default
+# executor, so a full set of parallel runs cannot starve other to_thread users
+_DOCKER_EXECUTOR = ThreadPoolExecutor(max_workers=MAX_PARALLEL_RUNS + 4, thread_name_prefix="etm")
+
+async def _run_blocking(func, *args, **kwargs):
+    """Run a blocking Docker call on the shared executor, like asyncio.to_thread"""
+    call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+    return await asyncio.get_running_loop().run_in_executor(_DOCKER_EXECUTOR, call)
+
+# Run BLAST and aligners with binaries installed on the host, when present,
+# instead of exec'ing into their containers
+USE_NATIVE_TOOLS = os.getenv("USE_NATIVE_TOOLS", "true").lower() == "true"
+
+# Limits applied to every tool container; a BioContainer may override memory and CPU
+CONTAINER_MEM_LIMIT = os.getenv("TOOL_CONTAINER_MEM_LIMIT", "2g")
+CONTAINER_CPU_QUOTA = int(os.getenv("TOOL_CONTAINER_CPU_QUOTA", "100000"))
+CONTAINER_PIDS_LIMIT = 256
+
+# Bytes of output kept from the end of each tool run's logs
+LOG_TAIL_BYTES = 64 * 1024
+
+# Most recent successful BLAST/alignment results kept for identical re-runs
+RESULT_CACHE_SIZE = 256
+
+# Seconds a local image presence check stays valid
+IMAGE_CACHE_TTL = 60
+
+# Most executions kept in history, and how often old ones are cleaned up (seconds)
+EXECUTION_HISTORY_SIZE = 10000
+EXECUTION_CLEANUP_INTERVAL = 3600
+
+# Custom container outputs at least this large are moved to ARTIFACTS_DIR and
+# returned as {"path", "size"} instead of being read into memory
+INLINE_OUTPUT_LIMIT = 1024 * 1024
+ARTIFACTS_DIR = Path(os.getenv("TOOL_ARTIFACTS_DIR", os.path.join(tempfile.gettempdir(), "tool_artifacts")))
+
+# Output files decoded as text; anything else stays bytes unless it is valid UTF-8
+TEXT_OUTPUT_SUFFIXES = ('.xml', '.fasta', '.fa', '.aln', '.sam', '.vcf', '.gff', '.gtf', '.bed',
+                        '.txt', '.tsv', '.csv', '.json', '.html', '.log', '.summary')
+
+# Byte lookup table of IUPAC nucleotide codes, either case
+_NUCLEOTIDE_LUT = np.zeros(256, dtype=bool)
+_NUCLEOTIDE_LUT[list(b'ATCGRYKMSWBDHVNatcgrykmswbdhvn')] = True
+
+# Bytes valid in any query: amino acid codes (a superset of the nucleotide
+# codes), stop and gap
+_SEQUENCE_LUT = np.zeros(256, dtype=bool)
+_SEQUENCE_LUT[list(b'ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz*-')] = True
+
 @dataclass
 class ToolExecution:
     """Result of external tool execution"""
@@ -39,14 +108,178 @@ class BioContainer:
     parameters: Dict[str, Any]
     input_formats: List[str]
     output_formats: List[str]
+    mem_limit: Optional[str] = None
+    cpu_quota: Optional[int] = None
+
+def _strip_whitespace(sequence: str) -> str:
+    """Sequence without the spaces and line breaks of pasted or wrapped input"""
+    return "".join(sequence.split())
+
+def _scan_sequence(sequence: str) -> Tuple[bool, np.ndarray]:
+    """Whether a sequence is nucleotide, and the positions of invalid characters, in one pass"""
+    # Non-ASCII characters become '?' so positions still line up
+    codes = np.frombuffer(sequence.encode('ascii', 'replace'), dtype=np.uint8)
+    bad_positions = np.flatnonzero(~_SEQUENCE_LUT[codes])
+    is_nucleotide = len(codes) > 0 and np.count_nonzero(_NUCLEOTIDE_LUT[codes]) / len(codes) > 0.9
+    return is_nucleotide, bad_positions
+
+def _invalid_characters_message(label: str, bad_positions: np.ndarray) -> str:
+    """Error text naming the first few invalid character positions (1-based)"""
+    shown = ", ".join(str(position + 1) for position in bad_positions[:5].tolist())
+    more = ", ..." if len(bad_positions) > 5 else ""
+    return f"{label} has {len(bad_positions)} invalid characters at positions {shown}{more}"
+
+def _canonical_json(data: Any) -> bytes:
+    """Key-sorted JSON encoding of data, using orjson when available"""
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # e.g. integers beyond 64 bits, which the stdlib encoder handles
+            pass
+    return json.dumps(data, sort_keys=True, default=str).encode()
+
+def _tar_files(files: Dict[str, str], directory: str = 'data') -> bytes:
+    """In-memory tar of text files under one directory, for container.put_archive"""
+    buffer = io.BytesIO()
+    with tarfile.open(fileobj=buffer, mode='w') as tar:
+        info = tarfile.TarInfo(directory)
+        info.type = tarfile.DIRTYPE
+        info.mode = 0o777
+        tar.addfile(info)
+        for name, content in files.items():
+            data = content.encode('utf-8')
+            info = tarfile.TarInfo(f"{directory}/{name}")
+            info.size = len(data)
+            info.mode = 0o666
+            tar.addfile(info, io.BytesIO(data))
+    return buffer.getvalue()
+
+def _log_tail(chunks: Iterable[bytes], limit: Optional[int] = None) -> str:
+    """Last limit (default LOG_TAIL_BYTES) bytes of a stream of log chunks, decoded.
+    
+    Earlier chunks are dropped as they arrive, so memory stays bounded.
+    """
+    if limit is None:
+        limit = LOG_TAIL_BYTES
+    tail: deque = deque()
+    size = 0
+    for chunk in chunks:
+        tail.append(chunk)
+        size += len(chunk)
+        while size - len(tail[0]) >= limit:
+            size -= len(tail.popleft())
+    return b"".join(tail)[-limit:].decode('utf-8', errors='replace')
+
+def _file_log_tail(path: str) -> str:
+    """Last LOG_TAIL_BYTES of a log file, decoded"""
+    with open(path, 'rb') as f:
+        f.seek(max(os.fstat(f.fileno()).st_size - LOG_TAIL_BYTES, 0))
+        return _log_tail([f.read()])
+
+def _container_log_tail(container) -> str:
+    """Last LOG_TAIL_BYTES of a container's stdout and stderr, streamed from the daemon"""
+    return _log_tail(container.logs(stream=True, stdout=True, stderr=True))
+
+def _write_files(directory: str, files: Dict[str, str]):
+    """Write text files into a directory"""
+    for name, content in files.items():
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write(content)
+
+def _read_text_file(path: str) -> Optional[str]:
+    """Text of a file, or None if it does not exist"""
+    try:
+        with open(path, 'r', errors='replace') as f:
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+def _read_container_file(container, path: str) -> Optional[str]:
+    """Text of a file inside a container via get_archive, or None if it does not exist"""
+    try:
+        stream, _ = container.get_archive(path)
+    except docker.errors.NotFound:
+        return None
+    with tarfile.open(fileobj=io.BytesIO(b''.join(stream))) as tar:
+        member = tar.next()
+        extracted = tar.extractfile(member) if member is not None else None
+        return extracted.read().decode('utf-8', errors='replace') if extracted is not None else None
+
+# Report header fields that describe the first query only, and the
+# Iteration fields each query's own report takes them from
+_BLAST_QUERY_FIELDS = {
+    'BlastOutput_query-ID': 'Iteration_query-ID',
+    'BlastOutput_query-def': 'Iteration_query-def',
+    'BlastOutput_query-len': 'Iteration_query-len'
+}
+
+# Defline of every BLAST query, so batch and single runs write identical
+# query files for a sequence and can share result cache entries
+BLAST_QUERY_NAME = "query_sequence"
+
+def _split_blast_xml(xml_text: str) -> List[str]:
+    """Split a multi-query BLAST XML report into one report per query, in query order"""
+    try:
+        root = ET.fromstring(xml_text)
+    except ET.ParseError:
+        return []
+    iterations = root.find('BlastOutput_iterations')
+    if iterations is None:
+        return []
+    header = [child for child in root if child is not iterations]
+    reports = []
+    for iteration in list(iterations):
+        report = ET.Element(root.tag, root.attrib)
+        for child in header:
+            source = _BLAST_QUERY_FIELDS.get(child.tag)
+            value = iteration.findtext(source) if source else None
+            if value is None:
+                report.append(child)
+            else:
+                field = ET.SubElement(report, child.tag)
+                field.text, field.tail = value, child.tail
+        ET.SubElement(report, iterations.tag).append(iteration)
+        reports.append(ET.tostring(report, encoding='unicode'))
+    return reports
 
 class ExternalToolManager:
     """Complete manager for external bioinformatics tools integration"""
     
-    def __init__(self):
+    def __init__(self, max_parallel_runs: int = MAX_PARALLEL_RUNS):
         self.docker_client = None
         self.biocontainers = self._initialize_biocontainers()
-        self.execution_history = {}
+        self.execution_history: OrderedDict = OrderedDict()
+        self._cleanup_task: Optional[asyncio.Task] = None
+        
+        # Bounds concurrent container runs and tool execs across all tools
+        self.max_parallel_runs = max_parallel_runs
+        self._run_semaphore = asyncio.Semaphore(max_parallel_runs)
+        
+        # image -> long-lived container that BLAST and aligner runs exec into
+        self._warm_containers: Dict[str, Any] = {}
+        self._warm_lock = asyncio.Lock()
+        
+        # program -> path of its host binary (None if not installed), looked up once
+        self._native_binaries: Dict[str, Optional[str]] = {}
+        
+        # LRU of tool results keyed by a hash of tool, inputs and parameters
+        self._result_cache: OrderedDict = OrderedDict()
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # image -> (checked at, available) from images.get lookups
+        self._image_cache: Dict[str, Tuple[float, bool]] = {}
+        
+        # Set once every BioContainer image has been pulled by the warm-up task
+        self.images_ready = False
+        self._warmup_task: Optional[asyncio.Task] = None
+        
+        # One thread follows the daemon's container 'die' events and resolves
+        # the futures of the runs waiting on that container
+        self._exit_futures: Dict[str, List[asyncio.Future]] = {}
+        self._events_thread: Optional[threading.Thread] = None
+        self._events_loop: Optional[asyncio.AbstractEventLoop] = None
         
         # Initialize Docker client
         try:
@@ -71,7 +304,10 @@ class ExternalToolManager:
                     'max_target_seqs': {'type': 'int', 'default': 10}
                 },
                 input_formats=['fasta'],
-                output_formats=['xml', 'tsv', 'json']
+                output_formats=['xml', 'tsv', 'json'],
+                # Concurrent searches share the warm container
+                mem_limit='4g',
+                cpu_quota=200000
             ),
             
             'muscle': BioContainer(
@@ -158,9 +394,312 @@ class ExternalToolManager:
         
         return containers
     
+    @property
+    def docker_client(self):
+        return self._docker_client
+    
+    @docker_client.setter
+    def docker_client(self, client):
+        # Availability is kept as a flag so the per-call check stays cheap
+        self._docker_client = client
+        self._docker_available = client is not None
+    
     def _is_docker_available(self) -> bool:
         """Check if Docker is available"""
-        return self.docker_client is not None
+        return self._docker_available
+    
+    async def _refresh_docker_available(self) -> bool:
+        """Ping the daemon and update the availability flag"""
+        if self._docker_client is None:
+            return False
+        try:
+            await _run_blocking(self._docker_client.ping)
+            self._docker_available = True
+        except Exception as e:
+            logger.warning(f"Docker daemon not reachable: {e}")
+            self._docker_available = False
+        return self._docker_available
+    
+    async def _start_exit_watcher(self):
+        """Start the shared Docker event listener for this event loop if it is not running"""
+        loop = asyncio.get_running_loop()
+        if self._events_thread is not None and self._events_thread.is_alive() and self._events_loop is loop:
+            return
+        
+        subscribed = threading.Event()
+        self._events_loop = loop
+        self._events_thread = threading.Thread(
+            target=self._watch_exit_events, args=(loop, subscribed),
+            name="docker-exit-events", daemon=True
+        )
+        self._events_thread.start()
+        # Containers that die before the subscription exists would be missed
+        await _run_blocking(subscribed.wait, 5)
+    
+    def _watch_exit_events(self, loop: asyncio.AbstractEventLoop, subscribed: threading.Event):
+        """Forward container exit codes from the Docker event stream to the event loop"""
+        try:
+            events = self.docker_client.events(filters={'type': 'container', 'event': 'die'}, decode=True)
+            subscribed.set()
+            for event in events:
+                attributes = event.get('Actor', {}).get('Attributes', {})
+                loop.call_soon_threadsafe(self._resolve_exit, event.get('id'), int(attributes.get('exitCode', -1)))
+        except Exception as e:
+            logger.warning(f"Docker event stream stopped: {e}")
+        finally:
+            subscribed.set()
+            try:
+                loop.call_soon_threadsafe(self._fail_exit_waiters)
+            except RuntimeError:
+                pass  # Event loop already closed
+    
+    def _resolve_exit(self, container_id: str, exit_code: int):
+        for future in self._exit_futures.pop(container_id, []):
+            if not future.done():
+                future.set_result(exit_code)
+    
+    def _fail_exit_waiters(self):
+        """Hand every pending wait back to container.wait once the event stream ends"""
+        waiting = list(self._exit_futures.values())
+        self._exit_futures.clear()
+        for future in (future for futures in waiting for future in futures):
+            if not future.done():
+                future.set_exception(ConnectionError("Docker event stream closed"))
+    
+    async def _wait_for_exit(self, container, timeout: Optional[float] = None) -> Dict:
+        """Await a container's exit without holding a worker thread while it runs.
+        
+        Returns the same {'StatusCode': ...} shape as container.wait().
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._exit_futures.setdefault(container.id, []).append(future)
+        try:
+            await self._start_exit_watcher()
+            
+            # The container may have exited before the listener was running
+            await _run_blocking(container.reload)
+            if container.status in ('exited', 'dead'):
+                return {'StatusCode': container.attrs['State']['ExitCode']}
+            
+            return {'StatusCode': await asyncio.wait_for(future, timeout)}
+        except ConnectionError:
+            return await _run_blocking(container.wait, timeout=timeout)
+        finally:
+            futures = self._exit_futures.get(container.id, [])
+            if future in futures:
+                futures.remove(future)
+                if not futures:
+                    del self._exit_futures[container.id]
+    
+    def _record_execution(self, execution_id: str, execution_result: Dict):
+        """Add an execution to history, evicting the oldest beyond EXECUTION_HISTORY_SIZE"""
+        self.execution_history[execution_id] = execution_result
+        while len(self.execution_history) > EXECUTION_HISTORY_SIZE:
+            evicted_id, _ = self.execution_history.popitem(last=False)
+            shutil.rmtree(ARTIFACTS_DIR / evicted_id, ignore_errors=True)
+        
+        if self._cleanup_task is None or self._cleanup_task.done():
+            self._cleanup_task = asyncio.create_task(self._periodic_cleanup())
+    
+    async def _periodic_cleanup(self):
+        """Drop executions older than a day, once every EXECUTION_CLEANUP_INTERVAL"""
+        while True:
+            await asyncio.sleep(EXECUTION_CLEANUP_INTERVAL)
+            await self.cleanup_old_executions()
+    
+    def _result_cache_key(self, tool: str, inputs: List[str], parameters: Dict) -> str:
+        """Hash of a tool run's inputs and canonical parameters"""
+        digest = hashlib.sha256(tool.encode())
+        digest.update(_canonical_json(parameters))
+        for item in inputs:
+            digest.update(b'\0')
+            digest.update(item.encode())
+        return digest.hexdigest()
+    
+    def _get_cached_result(self, key: str) -> Optional[Dict]:
+        """Look up a cached tool result, marking it most recently used.
+        
+        Each hit is a deep copy under a fresh execution_id, so callers never
+        share or mutate the cached entry.
+        """
+        result = self._result_cache.get(key)
+        if result is None:
+            self.cache_misses += 1
+            return None
+        self.cache_hits += 1
+        self._result_cache.move_to_end(key)
+        result = copy.deepcopy(result)
+        if 'execution_id' in result:
+            result['execution_id'] = str(uuid.uuid4())
+        return result
+    
+    def _container_limits(self, image: str) -> Dict:
+        """containers.run keyword arguments limiting a tool container's resources"""
+        config = next((c for c in self.biocontainers.values() if c.image == image), None)
+        return {
+            'network_mode': 'none',  # Security: no network access
+            'mem_limit': (config and config.mem_limit) or CONTAINER_MEM_LIMIT,
+            'cpu_quota': (config and config.cpu_quota) or CONTAINER_CPU_QUOTA,
+            'pids_limit': CONTAINER_PIDS_LIMIT
+        }
+    
+    async def _get_warm_container(self, image: str):
+        """Return the warm container for an image, starting it on first use"""
+        async with self._warm_lock:
+            container = self._warm_containers.get(image)
+            if container is None:
+                container = await _run_blocking(
+                    self.docker_client.containers.run,
+                    image,
+                    ["sleep", "infinity"],
+                    detach=True,
+                    remove=True,
+                    **self._container_limits(image)
+                )
+                self._warm_containers[image] = container
+            return container
+    
+    async def _run_tool_container(
+        self,
+        image: str,
+        command: List[str],
+        input_files: Dict[str, str],
+        output_name: Optional[str] = None
+    ) -> Tuple[int, str, Optional[str]]:
+        """Run a tool in its image's warm container with exec_run.
+        
+        Inputs are copied as an in-memory tar into a fresh run directory,
+        which is the tool's working directory, so commands use relative
+        paths and concurrent runs never share files. Returns the exit code,
+        the output and the text of output_name (None if the tool did not
+        write it).
+        """
+        run_dir = f"/data/{uuid.uuid4().hex}"
+        archive = _tar_files(input_files, run_dir.lstrip('/'))
+        container = await self._get_warm_container(image)
+        
+        try:
+            async with self._run_semaphore:
+                await _run_blocking(container.put_archive, '/', archive)
+                result = await _run_blocking(container.exec_run, command, workdir=run_dir)
+            logs = _log_tail([result.output])
+            output = None
+            if output_name:
+                output = await _run_blocking(
+                    _read_container_file, container, f"{run_dir}/{output_name}"
+                )
+        except docker.errors.DockerException:
+            # Other runs share the container, so it is only replaced once it
+            # has really stopped: then it is dropped from the pool, removed,
+            # and a fresh one starts next time
+            if await self._container_gone(container):
+                if self._warm_containers.get(image) is container:
+                    del self._warm_containers[image]
+                try:
+                    await _run_blocking(container.remove, force=True)
+                except docker.errors.DockerException:
+                    pass
+            raise
+        finally:
+            try:
+                await _run_blocking(container.exec_run, ["rm", "-rf", run_dir])
+            except docker.errors.DockerException:
+                pass
+        return result.exit_code, logs, output
+    
+    async def _container_gone(self, container) -> bool:
+        """Whether a warm container has been removed or is no longer running.
+        
+        False when its state cannot be checked, so a failing daemon call does
+        not cost the runs that share the container.
+        """
+        try:
+            await _run_blocking(container.reload)
+        except docker.errors.NotFound:
+            return True
+        except docker.errors.DockerException:
+            return False
+        return container.status != 'running'
+    
+    def _native_binary(self, program: str) -> Optional[str]:
+        """Path of a program's host binary, if native runs are enabled and it is installed"""
+        if not USE_NATIVE_TOOLS:
+            return None
+        if program not in self._native_binaries:
+            self._native_binaries[program] = shutil.which(program)
+        return self._native_binaries[program]
+    
+    def _can_run(self, program: str) -> bool:
+        """Whether a program can run natively or in its container"""
+        return self._native_binary(program) is not None or self._is_docker_available()
+    
+    async def _run_tool_native(
+        self,
+        command: List[str],
+        input_files: Dict[str, str],
+        output_name: Optional[str] = None
+    ) -> Tuple[int, str, Optional[str]]:
+        """Run a tool from its host binary, like _run_tool_container.
+        
+        Inputs are written to a fresh temporary directory that is the tool's
+        working directory, so the container commands run unchanged. Output
+        goes to a log file beside it, of which only the tail is read back.
+        """
+        with tempfile.TemporaryDirectory(prefix="tool_run_") as temp_dir:
+            run_dir = os.path.join(temp_dir, "run")
+            log_path = os.path.join(temp_dir, "tool.log")
+            os.mkdir(run_dir)
+            await _run_blocking(_write_files, run_dir, input_files)
+            async with self._run_semaphore:
+                with open(log_path, 'wb') as log_file:
+                    process = await asyncio.create_subprocess_exec(
+                        *command,
+                        cwd=run_dir,
+                        stdout=log_file,
+                        stderr=asyncio.subprocess.STDOUT
+                    )
+                    await process.wait()
+            logs = await _run_blocking(_file_log_tail, log_path)
+            output = None
+            if output_name:
+                output = await _run_blocking(_read_text_file, os.path.join(run_dir, output_name))
+        return process.returncode, logs, output
+    
+    async def _run_tool(
+        self,
+        program: str,
+        image: str,
+        command: List[str],
+        input_files: Dict[str, str],
+        output_name: Optional[str] = None
+    ) -> Tuple[int, str, Optional[str]]:
+        """Run a tool natively when its binary is installed, else in its warm container.
+        
+        Short jobs are dominated by the exec round trips to the daemon, which
+        a host binary skips entirely.
+        """
+        if self._native_binary(program):
+            return await self._run_tool_native(command, input_files, output_name)
+        return await self._run_tool_container(image, command, input_files, output_name)
+    
+    async def close(self):
+        """Stop the warm tool containers"""
+        containers = list(self._warm_containers.values())
+        self._warm_containers.clear()
+        for container in containers:
+            try:
+                await _run_blocking(container.stop)
+            except docker.errors.DockerException:
+                pass
+    
+    def _cache_result(self, key: str, result: Dict):
+        """Store a successful tool result, evicting the least recently used"""
+        if result.get('exit_code') != 0:
+            return
+        self._result_cache[key] = copy.deepcopy(result)
+        self._result_cache.move_to_end(key)
+        while len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._result_cache.popitem(last=False)
     
     async def execute_blast_search(
         self, 
@@ -168,81 +707,157 @@ class ExternalToolManager:
         database: str, 
         parameters: dict = None
     ) -> Dict:
-        """Execute BLAST search using BioContainers"""
+        """Execute BLAST search with a host binary or BioContainers"""
         
-        if not self._is_docker_available():
+        sequence = _strip_whitespace(sequence)
+        is_nucleotide, bad_positions = _scan_sequence(sequence)
+        program = "blastn" if is_nucleotide else "blastp"
+        if not self._can_run(program):
             return await self._mock_blast_execution(sequence, database, parameters)
         
         if parameters is None:
             parameters = {}
         
+        # Reject malformed queries before they reach a container
+        if len(bad_positions):
+            return {"error": _invalid_characters_message("Query sequence", bad_positions)}
+        
+        cache_key = self._result_cache_key('blast', [sequence, database], parameters)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            return cached
+        
         execution_id = str(uuid.uuid4())
         
         try:
-            # Prepare input files
-            with tempfile.TemporaryDirectory() as temp_dir:
-                input_file = os.path.join(temp_dir, "query.fasta")
-                output_file = os.path.join(temp_dir, "blast_results.xml")
-                
-                # Write sequence to FASTA file
-                with open(input_file, 'w') as f:
-                    f.write(f">query_sequence\n{sequence}\n")
-                
-                # Prepare BLAST command
-                blast_cmd = [
-                    "blastn" if self._is_nucleotide_sequence(sequence) else "blastp",
-                    "-query", "/data/query.fasta",
-                    "-db", database,
-                    "-out", "/data/blast_results.xml",
-                    "-outfmt", "5",  # XML format
-                    "-evalue", str(parameters.get('evalue', 1e-5)),
-                    "-max_target_seqs", str(parameters.get('max_target_seqs', 10))
-                ]
-                
-                # Add optional parameters
-                if 'word_size' in parameters:
-                    blast_cmd.extend(["-word_size", str(parameters['word_size'])])
-                
-                # Run BLAST container
+            # Prepare BLAST command
+            blast_cmd = self._blast_command(program, database, parameters)
+            
+            # Run BLAST natively or in its warm container; docker-py calls
+            # block, so they run in worker threads and concurrent runs overlap
+            start_time = asyncio.get_event_loop().time()
+            
+            exit_code, logs, output_content = await self._run_tool(
+                program,
+                self.biocontainers['blast'].image,
+                blast_cmd,
+                {"query.fasta": f">{BLAST_QUERY_NAME}\n{sequence}\n"},
+                "blast_results.xml"
+            )
+            
+            end_time = asyncio.get_event_loop().time()
+            
+            blast_result = {
+                "status": "success",
+                "execution_id": execution_id,
+                "tool": "blast",
+                "execution_time": end_time - start_time,
+                "exit_code": exit_code,
+                "output": output_content or "",
+                "logs": logs,
+                "parameters_used": parameters
+            }
+            self._cache_result(cache_key, blast_result)
+            return blast_result
+            
+        except Exception as e:
+            logger.error(f"Error executing BLAST: {str(e)}")
+            return {"error": f"BLAST execution failed: {str(e)}"}
+    
+    def _blast_command(self, program: str, database: str, parameters: dict) -> List[str]:
+        """BLAST command reading query.fasta and writing XML to blast_results.xml"""
+        blast_cmd = [
+            program,
+            "-query", "query.fasta",
+            "-db", database,
+            "-out", "blast_results.xml",
+            "-outfmt", "5",  # XML format
+            "-evalue", str(parameters.get('evalue', 1e-5)),
+            "-max_target_seqs", str(parameters.get('max_target_seqs', 10))
+        ]
+        
+        # Add optional parameters
+        if 'word_size' in parameters:
+            blast_cmd.extend(["-word_size", str(parameters['word_size'])])
+        if 'num_threads' in parameters:
+            blast_cmd.extend(["-num_threads", str(parameters['num_threads'])])
+        
+        return blast_cmd
+    
+    async def execute_blast_search_batch(
+        self,
+        sequences: List[str],
+        database: str,
+        parameters: dict = None
+    ) -> List[Dict]:
+        """Execute BLAST for many queries with one run per program.
+        
+        All uncached queries of a program go into one multi-FASTA file, and
+        the XML report is split back into one result per query with the
+        same shape as execute_blast_search. Results keep query order.
+        """
+        
+        sequences = [_strip_whitespace(seq) for seq in sequences]
+        if not (self._can_run("blastn") or self._can_run("blastp")):
+            return [await self._mock_blast_execution(seq, database, parameters) for seq in sequences]
+        
+        if parameters is None:
+            parameters = {}
+        
+        results: List[Optional[Dict]] = [None] * len(sequences)
+        cache_keys = [self._result_cache_key('blast', [seq, database], parameters) for seq in sequences]
+        
+        # Queries still to run, grouped by program
+        pending: Dict[str, List[int]] = {}
+        for i, seq in enumerate(sequences):
+            results[i] = self._get_cached_result(cache_keys[i])
+            if results[i] is None:
+                is_nucleotide, bad_positions = _scan_sequence(seq)
+                if len(bad_positions):
+                    results[i] = {"error": _invalid_characters_message(f"Query sequence {i + 1}", bad_positions)}
+                else:
+                    pending.setdefault("blastn" if is_nucleotide else "blastp", []).append(i)
+        
+        for program, indices in pending.items():
+            if not self._can_run(program):
+                for i in indices:
+                    results[i] = await self._mock_blast_execution(sequences[i], database, parameters)
+                continue
+            
+            execution_id = str(uuid.uuid4())
+            fasta = "".join(f">{BLAST_QUERY_NAME}\n{sequences[i]}\n" for i in indices)
+            
+            try:
                 start_time = asyncio.get_event_loop().time()
-                
-                container = self.docker_client.containers.run(
+                exit_code, logs, output_content = await self._run_tool(
+                    program,
                     self.biocontainers['blast'].image,
-                    blast_cmd,
-                    volumes={temp_dir: {'bind': '/data', 'mode': 'rw'}},
-                    remove=False,
-                    detach=True
+                    self._blast_command(program, database, parameters),
+                    {"query.fasta": fasta},
+                    "blast_results.xml"
                 )
-                
-                # Wait for completion
-                result = container.wait()
-                logs = container.logs().decode('utf-8')
-                
                 end_time = asyncio.get_event_loop().time()
-                
-                # Read output
-                output_content = ""
-                if os.path.exists(output_file):
-                    with open(output_file, 'r') as f:
-                        output_content = f.read()
-                
-                # Clean up container
-                container.remove()
-                
-                return {
+            except Exception as e:
+                logger.error(f"Error executing BLAST batch: {str(e)}")
+                for i in indices:
+                    results[i] = {"error": f"BLAST execution failed: {str(e)}"}
+                continue
+            
+            outputs = _split_blast_xml(output_content or "")
+            for position, i in enumerate(indices):
+                results[i] = {
                     "status": "success",
                     "execution_id": execution_id,
                     "tool": "blast",
                     "execution_time": end_time - start_time,
-                    "exit_code": result['StatusCode'],
-                    "output": output_content,
+                    "exit_code": exit_code,
+                    "output": outputs[position] if position < len(outputs) else "",
                     "logs": logs,
                     "parameters_used": parameters
                 }
-                
-        except Exception as e:
-            logger.error(f"Error executing BLAST: {str(e)}")
-            return {"error": f"BLAST execution failed: {str(e)}"}
+                self._cache_result(cache_keys[i], results[i])
+        
+        return results
     
     async def execute_multiple_alignment(
         self, 
@@ -255,113 +870,139 @@ class ExternalToolManager:
         if tool not in ['muscle', 'clustalw', 'mafft']:
             return {"error": f"Unsupported alignment tool: {tool}"}
         
-        if not self._is_docker_available():
+        if not self._can_run(tool):
             return await self._mock_alignment_execution(sequences, tool, parameters)
         
         if parameters is None:
             parameters = {}
         
+        cache_key = self._result_cache_key(tool, sequences, parameters)
+        cached = self._get_cached_result(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            with tempfile.TemporaryDirectory() as temp_dir:
-                input_file = os.path.join(temp_dir, "input.fasta")
-                output_file = os.path.join(temp_dir, "alignment.fasta")
-                
-                # Write sequences to FASTA file
-                with open(input_file, 'w') as f:
-                    for i, seq in enumerate(sequences):
-                        f.write(f">sequence_{i+1}\n{seq}\n")
-                
-                # Prepare command based on tool
-                if tool == 'muscle':
-                    cmd = [
-                        "muscle",
-                        "-in", "/data/input.fasta",
-                        "-out", "/data/alignment.fasta"
-                    ]
-                    if 'maxiters' in parameters:
-                        cmd.extend(["-maxiters", str(parameters['maxiters'])])
-                
-                elif tool == 'clustalw':
-                    cmd = [
-                        "clustalw",
-                        "-INFILE=/data/input.fasta",
-                        "-OUTFILE=/data/alignment.fasta",
-                        "-OUTPUT=FASTA"
-                    ]
-                    if parameters.get('type'):
-                        cmd.append(f"-TYPE={parameters['type']}")
-                
-                elif tool == 'mafft':
-                    cmd = ["mafft"]
-                    if parameters.get('auto', True):
-                        cmd.append("--auto")
-                    cmd.extend(["/data/input.fasta"])
-                
-                # Execute container
-                container = self.docker_client.containers.run(
-                    self.biocontainers[tool].image,
-                    cmd,
-                    volumes={temp_dir: {'bind': '/data', 'mode': 'rw'}},
-                    remove=False,
-                    detach=True
-                )
-                
-                result = container.wait()
-                logs = container.logs().decode('utf-8')
-                
-                # Read alignment result
+            # Sequences as one FASTA input file
+            fasta = "".join(f">sequence_{i+1}\n{seq}\n" for i, seq in enumerate(sequences))
+            
+            # Prepare command based on tool
+            if tool == 'muscle':
+                cmd = [
+                    "muscle",
+                    "-in", "input.fasta",
+                    "-out", "alignment.fasta"
+                ]
+                if 'maxiters' in parameters:
+                    cmd.extend(["-maxiters", str(parameters['maxiters'])])
+            
+            elif tool == 'clustalw':
+                cmd = [
+                    "clustalw",
+                    "-INFILE=input.fasta",
+                    "-OUTFILE=alignment.fasta",
+                    "-OUTPUT=FASTA"
+                ]
+                if parameters.get('type'):
+                    cmd.append(f"-TYPE={parameters['type']}")
+            
+            elif tool == 'mafft':
+                mafft_cmd = ["mafft"]
+                if parameters.get('auto', True):
+                    mafft_cmd.append("--auto")
+                mafft_cmd.extend(["input.fasta"])
+                # MAFFT writes the alignment to stdout and progress to stderr,
+                # so redirect stdout to the file instead of reading mixed logs;
+                # the shell script is fixed and the command is its arguments
+                cmd = ["sh", "-c", 'exec "$@" > alignment.fasta', "mafft", *mafft_cmd]
+            
+            # Execute natively or in the tool's container
+            exit_code, logs, alignment_content = await self._run_tool(
+                tool,
+                self.biocontainers[tool].image,
+                cmd,
+                {"input.fasta": fasta},
+                "alignment.fasta"
+            )
+            
+            # Read alignment result
+            if alignment_content is None:
                 alignment_content = ""
-                if os.path.exists(output_file):
-                    with open(output_file, 'r') as f:
-                        alignment_content = f.read()
-                elif tool == 'mafft':
-                    # MAFFT outputs to stdout
-                    alignment_content = logs
-                
-                container.remove()
-                
-                return {
-                    "status": "success",
-                    "tool": tool,
-                    "alignment": alignment_content,
-                    "logs": logs,
-                    "exit_code": result['StatusCode']
-                }
-                
+            
+            alignment_result = {
+                "status": "success",
+                "tool": tool,
+                "alignment": alignment_content,
+                "logs": logs,
+                "exit_code": exit_code
+            }
+            self._cache_result(cache_key, alignment_result)
+            return alignment_result
+            
         except Exception as e:
             logger.error(f"Error executing {tool}: {str(e)}")
             return {"error": f"{tool} execution failed: {str(e)}"}
     
+    async def execute_multiple_alignments_batch(self, jobs: List[Dict]) -> List[Dict]:
+        """Run several alignment jobs concurrently.
+        
+        Each job is a dict with 'sequences', 'tool' and optional 'parameters'.
+        Containers start as the run semaphore allows; results keep job order.
+        """
+        results = await asyncio.gather(
+            *(self.execute_multiple_alignment(job['sequences'], job['tool'], job.get('parameters'))
+              for job in jobs),
+            return_exceptions=True
+        )
+        return [
+            {"error": f"{job.get('tool')} execution failed: {str(result)}"} if isinstance(result, Exception) else result
+            for job, result in zip(jobs, results)
+        ]
+    
     async def _mock_blast_execution(self, sequence: str, database: str, parameters: dict) -> Dict:
         """Mock BLAST execution for testing when Docker unavailable"""
         
         logger.info("Running mock BLAST execution (Docker unavailable)")
         
-        # Generate mock BLAST results
-        mock_hits = []
-        
-        np.random.seed(hash(sequence) % 2**32)
-        num_hits = min(parameters.get('max_target_seqs', 10), np.random.randint(3, 8))
-        
-        for i in range(num_hits):
-            hit = {
-                "hit_id": f"gi|{np.random.randint(100000, 999999)}|ref|{['NM_', 'XM_', 'NR_'][np.random.randint(0, 3)]}{np.random.randint(100000, 999999)}.1|",
-                "hit_def": f"Homo sapiens {['gene', 'protein', 'sequence'][np.random.randint(0, 3)]} {i+1}",
-                "hit_len": np.random.randint(200, 2000),
-                "hsp_score": float(np.random.exponential(100) + 50),
-                "hsp_evalue": float(np.random.exponential(1e-10)),
-                "hsp_identity": np.random.randint(80, 100),
-                "hsp_positive": np.random.randint(85, 100),
-                "hsp_align_len": np.random.randint(100, len(sequence)),
+        if parameters is None:
+            parameters = {}
+        
+        # Generate mock BLAST results, each field for all hits in one draw
+        rng = np.random.default_rng(hash(sequence) & 0xFFFFFFFF)
+        num_hits = min(parameters.get('max_target_seqs', 10), int(rng.integers(3, 8)))
+        max_align = max(len(sequence), 101)
+        
+        gi_numbers = rng.integers(100000, 999999, size=num_hits).tolist()
+        prefixes = rng.integers(0, 3, size=num_hits).tolist()
+        accessions = rng.integers(100000, 999999, size=num_hits).tolist()
+        kinds = rng.integers(0, 3, size=num_hits).tolist()
+        hit_lengths = rng.integers(200, 2000, size=num_hits).tolist()
+        scores = (rng.exponential(100, size=num_hits) + 50).tolist()
+        evalues = rng.exponential(1e-10, size=num_hits)
+        identities = rng.integers(80, 100, size=num_hits).tolist()
+        positives = rng.integers(85, 100, size=num_hits).tolist()
+        align_lengths = rng.integers(100, max_align, size=num_hits).tolist()
+        query_ends = np.minimum(len(sequence), rng.integers(100, max_align, size=num_hits)).tolist()
+        hit_starts = rng.integers(1, 50, size=num_hits).tolist()
+        hit_ends = rng.integers(150, 500, size=num_hits).tolist()
+        
+        # Sorted by E-value
+        mock_hits = [
+            {
+                "hit_id": f"gi|{gi_numbers[i]}|ref|{['NM_', 'XM_', 'NR_'][prefixes[i]]}{accessions[i]}.1|",
+                "hit_def": f"Homo sapiens {['gene', 'protein', 'sequence'][kinds[i]]} {i+1}",
+                "hit_len": hit_lengths[i],
+                "hsp_score": scores[i],
+                "hsp_evalue": float(evalues[i]),
+                "hsp_identity": identities[i],
+                "hsp_positive": positives[i],
+                "hsp_align_len": align_lengths[i],
                 "hsp_query_from": 1,
-                "hsp_query_to": min(len(sequence), np.random.randint(100, len(sequence))),
-                "hsp_hit_from": np.random.randint(1, 50),
-                "hsp_hit_to": np.random.randint(150, 500)
+                "hsp_query_to": query_ends[i],
+                "hsp_hit_from": hit_starts[i],
+                "hsp_hit_to": hit_ends[i]
             }
-            mock_hits.append(hit)
-        
-        # Sort by E-value
-        mock_hits.sort(key=lambda x: x['hsp_evalue'])
+            for i in np.argsort(evalues, kind='stable').tolist()
+        ]
         
         return {
             "status": "success",
@@ -385,14 +1026,9 @@ class ExternalToolManager:
         
         # Simple mock alignment - just pad sequences to same length
         max_length = max(len(seq) for seq in sequences)
-        aligned_sequences = []
-        
-        for i, seq in enumerate(sequences):
-            # Simple padding alignment
-            aligned_seq = seq.ljust(max_length, '-')
-            aligned_sequences.append(f">sequence_{i+1}\n{aligned_seq}")
-        
-        alignment_content = '\n'.join(aligned_sequences)
+        alignment_content = '\n'.join(
+            f">sequence_{i+1}\n{seq.ljust(max_length, '-')}" for i, seq in enumerate(sequences)
+        )
         
         return {
             "status": "success",
@@ -402,19 +1038,11 @@ class ExternalToolManager:
             "exit_code": 0
         }
     
-    def _is_nucleotide_sequence(self, sequence: str) -> bool:
-        """Determine if sequence is nucleotide or protein"""
-        nucleotide_chars = set('ATCGRYKMSWBDHVN')
-        sequence_chars = set(sequence.upper())
-        
-        # If >90% of characters are valid nucleotides, consider it nucleotide
-        valid_nuc_ratio = len(sequence_chars & nucleotide_chars) / len(sequence_chars)
-        return valid_nuc_ratio > 0.9
-    
     async def pull_container_image(self, container_name: str) -> Dict:
         """Pull container image from repository"""
         
-        if not self._is_docker_available():
+        # A pull re-checks a daemon that earlier went unreachable
+        if not self._is_docker_available() and not await self._refresh_docker_available():
             return {"error": "Docker not available"}
         
         if container_name not in self.biocontainers:
@@ -426,7 +1054,8 @@ class ExternalToolManager:
             logger.info(f"Pulling container image: {container_config.image}")
             
             # Pull image
-            image = self.docker_client.images.pull(container_config.image)
+            image = await _run_blocking(self.docker_client.images.pull, container_config.image)
+            self._image_cache[container_config.image] = (time.monotonic(), True)
             
             return {
                 "status": "success",
@@ -439,8 +1068,31 @@ class ExternalToolManager:
             
         except Exception as e:
             logger.error(f"Error pulling container {container_name}: {str(e)}")
+            await self._refresh_docker_available()
             return {"error": f"Failed to pull container: {str(e)}"}
     
+    def start_image_warmup(self) -> Optional[asyncio.Task]:
+        """Start pulling every BioContainer image in the background.
+        
+        Call from a running event loop (application startup) so that first
+        tool runs do not pay for the pull inside the request.
+        """
+        if self._is_docker_available() and self._warmup_task is None:
+            self._warmup_task = asyncio.create_task(self._warmup_images())
+        return self._warmup_task
+    
+    async def _warmup_images(self):
+        """Pull all BioContainer images in parallel"""
+        results = await asyncio.gather(*[
+            self.pull_container_image(name) for name in self.biocontainers
+        ])
+        failed = [name for name, result in zip(self.biocontainers, results) if "error" in result]
+        if failed:
+            logger.warning(f"Image warm-up failed for: {', '.join(failed)}")
+        else:
+            logger.info("All BioContainer images pulled")
+        self.images_ready = not failed
+    
     async def list_available_containers(self) -> Dict:
         """List all available BioContainers"""
         
@@ -448,13 +1100,7 @@ class ExternalToolManager:
         
         for name, container in self.biocontainers.items():
             # Check if image is locally available
-            image_available = False
-            if self._is_docker_available():
-                try:
-                    self.docker_client.images.get(container.image)
-                    image_available = True
-                except:
-                    image_available = False
+            image_available = await self._is_image_available(container.image)
             
             containers_info[name] = {
                 "name": container.name,
@@ -505,6 +1151,11 @@ class ExternalToolManager:
         # Tool-specific validation
         if tool_name == 'blast':
             if isinstance(input_data, str):
+                # Checked as it will be run, with whitespace removed
+                input_data = _strip_whitespace(input_data)
+                _, bad_positions = _scan_sequence(input_data)
+                if len(bad_positions):
+                    errors.append(_invalid_characters_message("Query sequence", bad_positions))
                 if len(input_data) < 10:
                     warnings.append("Query sequence is very short - may not produce meaningful results")
                 if len(input_data) > 10000:
@@ -516,6 +1167,11 @@ class ExternalToolManager:
                     errors.append("At least 2 sequences required for alignment")
                 if len(input_data) > 1000:
                     warnings.append("Large number of sequences - alignment may be very slow")
+                for i, sequence in enumerate(input_data):
+                    if isinstance(sequence, str):
+                        _, bad_positions = _scan_sequence(sequence)
+                        if len(bad_positions):
+                            errors.append(_invalid_characters_message(f"Sequence {i + 1}", bad_positions))
         
         return {
             "valid": len(errors) == 0,
@@ -547,19 +1203,18 @@ class ExternalToolManager:
             max_age_seconds = max_age_hours * 3600
             
             cleaned_count = 0
-            to_remove = []
             
-            for execution_id, execution_data in self.execution_history.items():
-                execution_time = execution_data.get('timestamp', current_time)
-                age = current_time - execution_time
+            # History is kept in completion order, so the expired executions
+            # are all at the front; stop at the first one still in date
+            while self.execution_history:
+                execution_id, execution_data = next(iter(self.execution_history.items()))
+                age = current_time - execution_data.get('timestamp', current_time)
+                if age <= max_age_seconds:
+                    break
                 
-                if age > max_age_seconds:
-                    to_remove.append(execution_id)
-                    cleaned_count += 1
-            
-            # Remove old executions
-            for execution_id in to_remove:
-                del self.execution_history[execution_id]
+                self.execution_history.popitem(last=False)
+                shutil.rmtree(ARTIFACTS_DIR / execution_id, ignore_errors=True)
+                cleaned_count += 1
             
             return {
                 "status": "success",
@@ -579,7 +1234,8 @@ class ExternalToolManager:
         
         try:
             # Find running containers for the tool
-            containers = self.docker_client.containers.list(
+            containers = await _run_blocking(
+                self.docker_client.containers.list,
                 filters={"ancestor": self.biocontainers.get(container_name, {}).get('image', '')}
             )
             
@@ -588,7 +1244,7 @@ class ExternalToolManager:
             
             # Get logs from first container
             container = containers[0]
-            logs = container.logs(tail=lines).decode('utf-8')
+            logs = (await _run_blocking(container.logs, tail=lines)).decode('utf-8', errors='replace')
             
             return {
                 "status": "success",
@@ -627,35 +1283,32 @@ class ExternalToolManager:
                 # Execute container
                 start_time = asyncio.get_event_loop().time()
                 
-                container = self.docker_client.containers.run(
-                    image,
-                    command,
-                    volumes={temp_dir: {'bind': '/data', 'mode': 'rw'}},
-                    working_dir='/data',
-                    remove=False,
-                    detach=True,
-                    network_mode='none',  # Security: no network access
-                    mem_limit='2g',       # Security: limit memory
-                    cpu_quota=100000      # Security: limit CPU
-                )
+                async with self._run_semaphore:
+                    container = await _run_blocking(
+                        self.docker_client.containers.run,
+                        image,
+                        command,
+                        volumes={temp_dir: {'bind': '/data', 'mode': 'rw'}},
+                        working_dir='/data',
+                        remove=False,
+                        detach=True,
+                        **self._container_limits(image)
+                    )
                 
                 # Wait for completion with timeout
                 try:
-                    result = container.wait(timeout=3600)  # 1 hour timeout
-                    logs = container.logs().decode('utf-8')
+                    result = await self._wait_for_exit(container, timeout=3600)  # 1 hour timeout
+                    logs = await _run_blocking(_container_log_tail, container)
                     
                     end_time = asyncio.get_event_loop().time()
                     
                     # Read output files
-                    output_files = {}
-                    for file in os.listdir(temp_dir):
-                        file_path = os.path.join(temp_dir, file)
-                        if os.path.isfile(file_path) and file not in input_files:
-                            with open(file_path, 'r') as f:
-                                output_files[file] = f.read()
+                    output_files = await _run_blocking(
+                        self._collect_output_files, temp_dir, input_files, execution_id
+                    )
                     
                     # Clean up
-                    container.remove()
+                    await _run_blocking(container.remove)
                     
                     execution_result = {
                         "execution_id": execution_id,
@@ -670,7 +1323,7 @@ class ExternalToolManager:
                     }
                     
                     # Store in execution history
-                    self.execution_history[execution_id] = execution_result
+                    self._record_execution(execution_id, execution_result)
                     
                     return {
                         "status": "success",
@@ -680,8 +1333,8 @@ class ExternalToolManager:
                 except Exception as timeout_error:
                     # Handle timeout or other execution errors
                     try:
-                        container.kill()
-                        container.remove()
+                        await _run_blocking(container.kill)
+                        await _run_blocking(container.remove)
                     except:
                         pass
                     
@@ -691,6 +1344,43 @@ class ExternalToolManager:
             logger.error(f"Error executing custom container: {str(e)}")
             return {"error": f"Custom container execution failed: {str(e)}"}
     
+    def _decode_output(self, filename: str, data: bytes):
+        """Output file content as text for known text formats or when it decodes cleanly.
+        
+        Binary content is returned JSON-safe as {"base64": ..., "size": ...}.
+        """
+        if filename.lower().endswith(TEXT_OUTPUT_SUFFIXES):
+            return data.decode('utf-8', errors='replace')
+        try:
+            return data.decode('utf-8')
+        except UnicodeDecodeError:
+            return {"base64": base64.b64encode(data).decode('ascii'), "size": len(data)}
+    
+    def _collect_output_files(self, temp_dir: str, input_files: Dict[str, str], execution_id: str) -> Dict[str, Any]:
+        """Collect the files a custom container wrote.
+        
+        Small files are returned as content (see _decode_output); files of INLINE_OUTPUT_LIMIT bytes
+        or more are moved out of the temporary directory into
+        ARTIFACTS_DIR/<execution_id> and returned as {"path": ..., "size": ...}.
+        """
+        output_files = {}
+        # scandir entries know their type from the directory read itself
+        with os.scandir(temp_dir) as entries:
+            for entry in entries:
+                if entry.name in input_files or not entry.is_file():
+                    continue
+                size = entry.stat().st_size
+                if size < INLINE_OUTPUT_LIMIT:
+                    with open(entry.path, 'rb') as f:
+                        output_files[entry.name] = self._decode_output(entry.name, f.read())
+                else:
+                    artifact_dir = ARTIFACTS_DIR / execution_id
+                    artifact_dir.mkdir(parents=True, exist_ok=True)
+                    artifact_path = artifact_dir / entry.name
+                    shutil.move(entry.path, artifact_path)
+                    output_files[entry.name] = {"path": str(artifact_path), "size": size}
+        return output_files
+    
     async def get_system_requirements(self) -> Dict:
         """Get system requirements for external tools"""
         
@@ -708,23 +1398,46 @@ class ExternalToolManager:
             },
             "biocontainers": {
                 "total_available": len(self.biocontainers),
-                "images_pulled": len([
-                    name for name, container in self.biocontainers.items()
-                    if self._check_image_locally_available(container.image)
-                ]) if self._is_docker_available() else 0
+                "images_pulled": sum(await asyncio.gather(*[
+                    self._is_image_available(container.image)
+                    for container in self.biocontainers.values()
+                ])) if self._is_docker_available() else 0,
+                "images_ready": self.images_ready
+            },
+            "result_cache": {
+                "entries": len(self._result_cache),
+                "max_entries": RESULT_CACHE_SIZE,
+                "hits": self.cache_hits,
+                "misses": self.cache_misses
             }
         }
     
     def _check_image_locally_available(self, image: str) -> bool:
-        """Check if Docker image is available locally"""
+        """Check if Docker image is available locally, reusing checks younger than IMAGE_CACHE_TTL"""
         if not self._is_docker_available():
             return False
         
+        checked_at, available = self._image_cache.get(image, (0.0, False))
+        now = time.monotonic()
+        if checked_at and now - checked_at < IMAGE_CACHE_TTL:
+            return available
+        
         try:
             self.docker_client.images.get(image)
-            return True
+            available = True
         except:
+            available = False
+        self._image_cache[image] = (now, available)
+        return available
+    
+    async def _is_image_available(self, image: str) -> bool:
+        """Image presence check that only leaves the event loop on a cache miss"""
+        if not self._is_docker_available():
             return False
+        checked_at, available = self._image_cache.get(image, (0.0, False))
+        if checked_at and time.monotonic() - checked_at < IMAGE_CACHE_TTL:
+            return available
+        return await _run_blocking(self._check_image_locally_available, image)
     
     async def monitor_container_resources(self, container_id: str) -> Dict:
         """Monitor resource usage of running container"""
@@ -733,10 +1446,10 @@ class ExternalToolManager:
             return {"error": "Docker not available"}
         
         try:
-            container = self.docker_client.containers.get(container_id)
+            container = await _run_blocking(self.docker_client.containers.get, container_id)
             
             # Get container stats
-            stats = container.stats(stream=False)
+            stats = await _run_blocking(container.stats, stream=False)
             
             # Parse memory usage
             memory_usage = stats['memory_stats']['usage']
@@ -1,21 +1,83 @@
 # backend/app/services/file_manager.py
+import io
 import os
+import uuid
 import shutil
 import hashlib
 import mimetypes
+from contextlib import contextmanager
+from itertools import islice
 from pathlib import Path
-from typing import List, Dict, Any, Optional, BinaryIO
+from typing import List, Dict, Any, Optional, BinaryIO, Iterator, Tuple
 from fastapi import UploadFile, HTTPException
 import magic
+import numpy as np
 import zipfile
 import tarfile
 from datetime import datetime
 import aiofiles
+from Bio.SeqIO.FastaIO import SimpleFastaParser
+from Bio.SeqIO.QualityIO import FastqGeneralIterator
 from ..core.config import settings
 
+try:
+    import pyfastx
+except ImportError:
+    pyfastx = None
+
+try:
+    import xxhash
+except ImportError:
+    xxhash = None
+
+# Hash naming stored uploads. It only identifies content, so a fast
+# non-cryptographic hash is used; both give 128-bit (32 hex digit) names
+HASH_ALGO = "xxh3_128" if xxhash is not None else "blake2b"
+
+def _new_file_hasher():
+    """Incremental hasher for HASH_ALGO"""
+    if xxhash is not None:
+        return xxhash.xxh3_128()
+    return hashlib.blake2b(digest_size=16)
+
+class _OffsetLines:
+    """Decoded lines of a binary file, for parsers that iterate a text handle.
+    
+    Unlike a text-mode file, which reads ahead in large blocks, it knows
+    the byte offset at which the latest line starts.
+    """
+    
+    def __init__(self, handle: BinaryIO):
+        self._handle = handle
+        self._offset = 0
+        self.line_start = 0
+    
+    def read(self, size: int = -1) -> str:
+        """Text-mode check only: parsers call read(0) and expect a str"""
+        if size:
+            raise io.UnsupportedOperation("read")
+        return ""
+    
+    def __iter__(self) -> "_OffsetLines":
+        return self
+    
+    def __next__(self) -> str:
+        line = self._handle.readline()
+        if not line:
+            raise StopIteration
+        self.line_start = self._offset
+        self._offset += len(line)
+        return line.decode('utf-8', 'replace')
+
 class FileManager:
     """Enhanced file management system for bioinformatics data"""
     
+    # Bytes of an upload read, hashed and written per step
+    UPLOAD_CHUNK_SIZE = 1024 * 1024
+    # FASTQ analysis reads at most this many records and extrapolates the
+    # totals from the file size, so huge runs are not read end to end
+    MAX_SAMPLE_READS = 100_000
+    
     def __init__(self):
         self.upload_dir = Path(settings.UPLOAD_DIR)
         self.data_dir = Path(settings.DATA_DIR)
@@ -44,36 +106,35 @@ class FileManager:
     async def upload_file(self, file: UploadFile, user_id: str = None, category: str = "general") -> Dict[str, Any]:
         """Upload and validate bioinformatics file"""
         try:
-            # Validate file
+            # Validate file name
             validation_result = await self._validate_file(file)
             if not validation_result["valid"]:
                 raise HTTPException(status_code=400, detail=validation_result["error"])
             
-            # Generate unique filename
-            file_hash = await self._calculate_file_hash(file)
-            file_extension = Path(file.filename).suffix.lower()
-            unique_filename = f"{file_hash}{file_extension}"
-            
             # Determine storage path
             storage_path = self._get_storage_path(category, user_id)
-            file_path = storage_path / unique_filename
             
             # Create directory if it doesn't exist
             storage_path.mkdir(parents=True, exist_ok=True)
             
-            # Save file
-            async with aiofiles.open(file_path, 'wb') as f:
-                content = await file.read()
-                await f.write(content)
+            # Save file under a temporary name while checking its size and
+            # hashing it in the same pass, then name it by its hash
+            temp_path = storage_path / f".upload_{uuid.uuid4().hex}.part"
+            size, file_hash, detected_mime = await self._ingest(file, temp_path)
+            file_extension = Path(file.filename).suffix.lower()
+            unique_filename = f"{file_hash}{file_extension}"
+            file_path = storage_path / unique_filename
+            os.replace(temp_path, file_path)
             
             # Create file metadata
             file_metadata = {
                 "original_name": file.filename,
                 "stored_name": unique_filename,
                 "file_path": str(file_path),
-                "size": len(content),
+                "size": size,
                 "hash": file_hash,
-                "mime_type": file.content_type or mimetypes.guess_type(file.filename)[0],
+                "hash_algorithm": HASH_ALGO,
+                "mime_type": file.content_type or detected_mime or mimetypes.guess_type(file.filename)[0],
                 "category": category,
                 "user_id": user_id,
                 "upload_time": datetime.utcnow().isoformat(),
@@ -82,6 +143,8 @@ class FileManager:
             
             return file_metadata
             
+        except HTTPException:
+            raise
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"File upload failed: {str(e)}")
     
@@ -184,17 +247,7 @@ class FileManager:
     
     # Private helper methods
     async def _validate_file(self, file: UploadFile) -> Dict[str, Any]:
-        """Validate uploaded file"""
-        # Check file size
-        content = await file.read()
-        await file.seek(0)  # Reset file pointer
-        
-        if len(content) > self.max_file_size:
-            return {
-                "valid": False,
-                "error": f"File size ({len(content)} bytes) exceeds maximum allowed size ({self.max_file_size} bytes)"
-            }
-        
+        """Validate uploaded file name; size and content are checked as it is stored"""
         # Check file extension
         file_extension = Path(file.filename).suffix.lower()
         if file_extension not in self.allowed_extensions:
@@ -203,21 +256,56 @@ class FileManager:
                 "error": f"File extension '{file_extension}' is not allowed. Allowed extensions: {', '.join(self.allowed_extensions)}"
             }
         
-        # Check file content using python-magic
+        return {"valid": True}
+    
+    async def _ingest(self, file: UploadFile, dst_path: Path) -> Tuple[int, str, Optional[str]]:
+        """Store an upload at dst_path in one streaming pass.
+        
+        Each UPLOAD_CHUNK_SIZE chunk is counted against max_file_size,
+        hashed and written; the first KiB is also given to python-magic.
+        Returns the size, the HASH_ALGO hash and the detected MIME type
+        (None if detection failed). Nothing is left at dst_path on error.
+        """
+        # A size declared up front is rejected before anything is read
+        if file.size is not None and file.size > self.max_file_size:
+            await file.close()
+            raise self._file_too_large()
+        
+        hasher = _new_file_hasher()
+        size = 0
+        detected_mime = None
+        
         try:
-            file_type = magic.from_buffer(content[:1024], mime=True)
-            # Additional content validation can be added here
-        except Exception:
-            # If magic detection fails, continue with filename-based validation
-            pass
+            async with aiofiles.open(dst_path, 'wb') as f:
+                while chunk := await file.read(self.UPLOAD_CHUNK_SIZE):
+                    if size == 0:
+                        # Check file content using python-magic
+                        try:
+                            detected_mime = magic.from_buffer(chunk[:1024], mime=True)
+                        except Exception:
+                            # If magic detection fails, continue with filename-based validation
+                            pass
+                    
+                    # Stop reading as soon as the cap is passed, before writing
+                    size += len(chunk)
+                    if size > self.max_file_size:
+                        await file.close()
+                        raise self._file_too_large()
+                    
+                    hasher.update(chunk)
+                    await f.write(chunk)
+        except BaseException:
+            dst_path.unlink(missing_ok=True)
+            raise
         
-        return {"valid": True}
+        return size, hasher.hexdigest(), detected_mime
     
-    async def _calculate_file_hash(self, file: UploadFile) -> str:
-        """Calculate MD5 hash of file content"""
-        content = await file.read()
-        await file.seek(0)  # Reset file pointer
-        return hashlib.md5(content).hexdigest()
+    def _file_too_large(self) -> HTTPException:
+        """413 error for an upload over max_file_size"""
+        return HTTPException(
+            status_code=413,
+            detail=f"File size exceeds maximum allowed size ({self.max_file_size} bytes)"
+        )
     
     def _get_storage_path(self, category: str, user_id: str = None) -> Path:
         """Get storage path based on category and user"""
@@ -252,35 +340,65 @@ class FileManager:
         
         return format_info
     
+    @contextmanager
+    def _fasta_records(self, file_path: Path) -> Iterator[Iterator[Tuple[str, str]]]:
+        """Iterate (name, sequence) pairs, using pyfastx's C reader when installed"""
+        if pyfastx is not None:
+            yield iter(pyfastx.Fasta(str(file_path), build_index=False))
+            return
+        with open(file_path, 'r') as handle:
+            yield SimpleFastaParser(handle)
+    
+    @contextmanager
+    def _fastq_records(self, file_path: Path) -> Iterator[Tuple[Iterator[Tuple[str, str, str]], "_OffsetLines"]]:
+        """Iterate (name, sequence, quality) triples, along with the lines they are parsed from.
+        
+        The lines know the byte offset reached in the file, which sampling
+        needs and pyfastx's reader does not expose.
+        """
+        with open(file_path, 'rb') as handle:
+            lines = _OffsetLines(handle)
+            yield FastqGeneralIterator(lines), lines
+    
     async def _analyze_fasta(self, file_path: Path) -> Dict[str, Any]:
         """Analyze FASTA file format"""
         try:
-            sequences = list(SeqIO.parse(file_path, "fasta"))
-            
-            if not sequences:
-                return {"format": "fasta", "details": {"error": "No valid sequences found"}}
-            
-            # Calculate statistics
-            lengths = [len(seq.seq) for seq in sequences]
+            # Records are read as (title, sequence) strings one at a time, so
+            # no SeqRecord objects are built and memory stays flat
+            sequence_count = 0
+            total_length = 0
+            min_length = None
+            max_length = 0
             sequence_types = set()
             
-            for seq in sequences[:10]:  # Sample first 10 sequences for type detection
-                seq_str = str(seq.seq).upper()
-                if set(seq_str).issubset(set('ATCGN')):
-                    sequence_types.add('DNA')
-                elif set(seq_str).issubset(set('AUCGN')):
-                    sequence_types.add('RNA')
-                elif set(seq_str).issubset(set('ACDEFGHIKLMNPQRSTVWY')):
-                    sequence_types.add('PROTEIN')
+            with self._fasta_records(file_path) as records:
+                for _, sequence in records:
+                    length = len(sequence)
+                    sequence_count += 1
+                    total_length += length
+                    min_length = length if min_length is None else min(min_length, length)
+                    max_length = max(max_length, length)
+                    
+                    if sequence_count <= 10:  # Sample first 10 sequences for type detection
+                        seq_str = sequence.upper()
+                        if set(seq_str).issubset(set('ATCGN')):
+                            sequence_types.add('DNA')
+                        elif set(seq_str).issubset(set('AUCGN')):
+                            sequence_types.add('RNA')
+                        elif set(seq_str).issubset(set('ACDEFGHIKLMNPQRSTVWY')):
+                            sequence_types.add('PROTEIN')
+            
+            if not sequence_count:
+                return {"format": "fasta", "details": {"error": "No valid sequences found"}}
             
             return {
                 "format": "fasta",
                 "details": {
-                    "sequence_count": len(sequences),
-                    "total_length": sum(lengths),
-                    "average_length": sum(lengths) / len(lengths),
-                    "min_length": min(lengths),
-                    "max_length": max(lengths),
+                    "sequence_count": sequence_count,
+                    "total_length": total_length,
+                    "average_length": total_length / sequence_count,
+                    "min_length": min_length,
+                    "max_length": max_length,
                     "detected_types": list(sequence_types)
                 }
             }
@@ -291,36 +409,61 @@ class FileManager:
     async def _analyze_fastq(self, file_path: Path) -> Dict[str, Any]:
         """Analyze FASTQ file format"""
         try:
-            sequences = list(SeqIO.parse(file_path, "fastq"))
+            # Reads come as (title, sequence, quality) strings one at a time
+            read_count = 0
+            total_bases = 0
+            sampled_bytes = 0
+            min_length = None
+            max_length = 0
+            sampled_qualities = []
+            
+            with self._fastq_records(file_path) as (records, lines):
+                for _, sequence, quality in islice(records, self.MAX_SAMPLE_READS):
+                    length = len(sequence)
+                    read_count += 1
+                    total_bases += length
+                    # The parser has already read the next record's title line,
+                    # so the sample ends where that line starts
+                    sampled_bytes = lines.line_start
+                    min_length = length if min_length is None else min(min_length, length)
+                    max_length = max(max_length, length)
+                    
+                    if read_count <= 1000:  # Sample first 1000 for quality analysis
+                        sampled_qualities.append(quality)
+                
+                estimated = next(records, None) is not None
             
-            if not sequences:
+            if not read_count:
                 return {"format": "fastq", "details": {"error": "No valid sequences found"}}
             
-            # Calculate quality statistics
-            lengths = [len(seq.seq) for seq in sequences]
-            qualities = []
-            
-            for seq in sequences[:1000]:  # Sample first 1000 for quality analysis
-                if hasattr(seq, 'letter_annotations') and 'phred_quality' in seq.letter_annotations:
-                    qualities.extend(seq.letter_annotations['phred_quality'])
+            sampled_reads = read_count
+            average_length = total_bases / read_count
+            if estimated:
+                # Scale the sample by the file size over its average record size
+                read_count = round(read_count * file_path.stat().st_size / sampled_bytes)
+                total_bases = round(read_count * average_length)
             
+            # Phred scores of all sampled reads at once from their Sanger encoding
             quality_stats = {}
-            if qualities:
+            qualities = np.frombuffer("".join(sampled_qualities).encode('ascii'), dtype=np.uint8).astype(np.int16) - 33
+            if qualities.size:
                 quality_stats = {
-                    "min_quality": min(qualities),
-                    "max_quality": max(qualities),
-                    "average_quality": sum(qualities) / len(qualities)
+                    "min_quality": int(qualities.min()),
+                    "max_quality": int(qualities.max()),
+                    "average_quality": float(qualities.mean())
                 }
             
             return {
                 "format": "fastq",
                 "details": {
-                    "read_count": len(sequences),
-                    "total_bases": sum(lengths),
-                    "average_length": sum(lengths) / len(lengths),
-                    "min_length": min(lengths),
-                    "max_length": max(lengths),
-                    "quality_stats": quality_stats
+                    "read_count": read_count,
+                    "total_bases": total_bases,
+                    "average_length": average_length,
+                    "min_length": min_length,
+                    "max_length": max_length,
+                    "quality_stats": quality_stats,
+                    "estimated": estimated,
+                    "sampled_reads": sampled_reads
                 }
             }
             
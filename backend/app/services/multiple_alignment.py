@@ -3,13 +3,79 @@ import asyncio
 import subprocess
 import tempfile
 import os
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from dataclasses import dataclass
 import logging
+import numpy as np
 from pathlib import Path
 
 logger = logging.getLogger(__name__)
 
+try:
+    from numba import njit, prange
+except ImportError:
+    njit = None
+    prange = range
+
+_GAP = ord('-')
+
+# Alignments with at least this many sequences have their average pairwise
+# identity computed by the compiled kernel, with rows spread across cores
+PARALLEL_IDENTITY_MIN_SEQUENCES = 32
+
+def _sequence_matrix(sequences: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """Sequences as rows of a uint8 matrix as wide as the longest, plus their lengths.
+    
+    Rows are padded with zero bytes past their own length.
+    """
+    lengths = np.array([len(seq) for seq in sequences])
+    data = "".join(sequences).encode('ascii', 'replace')
+    if (lengths == lengths[0]).all():
+        return np.frombuffer(data, dtype=np.uint8).reshape(len(sequences), lengths[0]), lengths
+    
+    matrix = np.zeros((len(sequences), lengths.max()), dtype=np.uint8)
+    for row, seq in zip(matrix, sequences):
+        encoded = np.frombuffer(seq.encode('ascii', 'replace'), dtype=np.uint8)
+        row[:len(encoded)] = encoded
+    return matrix, lengths
+
+def _pairwise_identity_total(matrix: np.ndarray, lengths: np.ndarray) -> float:
+    """Sum of the identities (%) of all pairs of rows, each pair over the shorter row"""
+    n = matrix.shape[0]
+    row_totals = np.zeros(n)
+    for i in prange(n - 1):
+        total = 0.0
+        for j in range(i + 1, n):
+            matches = 0
+            compared = 0
+            for k in range(min(lengths[i], lengths[j])):
+                a = matrix[i, k]
+                b = matrix[j, k]
+                if a != _GAP:
+                    compared += 1
+                    matches += a == b
+                elif b != _GAP:
+                    compared += 1
+            if compared > 0:
+                total += matches * 100.0 / compared
+        row_totals[i] = total
+    return row_totals.sum()
+
+if njit is not None:
+    _pairwise_identity_total = njit(parallel=True, cache=True)(_pairwise_identity_total)
+
+def warm_up_kernels():
+    """Compile the identity kernel for the argument types alignments pass it.
+    
+    Compiling takes seconds, so the app calls this in a worker thread at
+    startup instead of paying for it on the first large alignment.
+    """
+    if njit is None:
+        return
+    # Equal-length rows give a read-only matrix, ragged rows a writable one
+    for sequences in (["AC-T", "ACGT"], ["AC-T", "ACG"]):
+        _pairwise_identity_total(*_sequence_matrix(sequences))
+
 @dataclass
 class AlignmentResult:
     """Result of multiple sequence alignment"""
@@ -358,14 +424,34 @@ class MultipleAlignmentService:
         if len(sequences) < 2:
             return 100.0
         
-        identities = []
-        
-        for i in range(len(sequences)):
-            for j in range(i + 1, len(sequences)):
-                identity = self._calculate_pairwise_identity(sequences[i], sequences[j])
-                identities.append(identity)
-        
-        return sum(identities) / len(identities) if identities else 0.0
+        matrix, lengths = _sequence_matrix(sequences)
+        pairs = len(sequences) * (len(sequences) - 1) // 2
+        if njit is not None and len(sequences) >= PARALLEL_IDENTITY_MIN_SEQUENCES:
+            return float(_pairwise_identity_total(matrix, lengths) / pairs)
+        
+        # Compare each sequence with all later ones at once; pairs of unequal
+        # length are compared over the shorter, as in _calculate_pairwise_identity
+        non_gap = matrix != _GAP
+        positions = np.arange(matrix.shape[1])
+        same_length = (lengths == lengths[0]).all()
+        total_identity = 0.0
+        
+        for i in range(len(sequences) - 1):
+            match = (matrix[i + 1:] == matrix[i]) & non_gap[i]
+            compared = non_gap[i + 1:] | non_gap[i]
+            if not same_length:
+                in_range = positions < np.minimum(lengths[i], lengths[i + 1:])[:, None]
+                match &= in_range
+                compared &= in_range
+            
+            matches = np.count_nonzero(match, axis=1)
+            non_gap_positions = np.count_nonzero(compared, axis=1)
+            total_identity += np.divide(
+                matches * 100, non_gap_positions,
+                out=np.zeros(len(matches)), where=non_gap_positions > 0
+            ).sum()
+        
+        return float(total_identity / pairs)
     
     def _calculate_pairwise_identity(self, seq1: str, seq2: str) -> float:
         """Calculate pairwise sequence identity"""
@@ -4,7 +4,7 @@ import uuid
 from datetime import datetime
 from typing import Dict, List, Any, Optional
 from ..services.data_readers import DataReaderService
-from ..services.analysis_tools import AnalysisToolsService
+from ..services.analysis_tools import analysis_tools_service
 
 class WorkflowEngine:
     """Central workflow execution engine"""
@@ -14,7 +14,8 @@ class WorkflowEngine:
         self.cache = cache_manager
         self.logger = logger
         self.data_reader = DataReaderService()
-        self.analysis_tools = AnalysisToolsService()
+        # Shared so the warm tool containers are reused and closed at shutdown
+        self.analysis_tools = analysis_tools_service
         self.active_workflows = {}
         
         # Register workflow elements
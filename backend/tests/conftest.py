@@ -148,6 +148,10 @@ def mock_docker_client():
     mock_client = MagicMock()
     mock_container = MagicMock()
     mock_container.wait.return_value = {'StatusCode': 0}
-    mock_container.logs.return_value = b"Mock tool output"
+    mock_container.logs.side_effect = (
+        lambda stream=False, **kwargs: iter([b"Mock tool", b" output"]) if stream else b"Mock tool output"
+    )
+    mock_container.exec_run.return_value = MagicMock(exit_code=0, output=b"Mock tool output")
     mock_client.containers.run.return_value = mock_container
+    mock_client.containers.create.return_value = mock_container
     return mock_client
\ No newline at end of file
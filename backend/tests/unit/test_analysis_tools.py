@@ -1,7 +1,13 @@
 # backend/tests/unit/test_analysis_tools.py - Unit Tests for Analysis Tools
 import pytest
+import asyncio
+import json
+import time
+import docker
+import httpx
+from pathlib import Path
 from unittest.mock import MagicMock, patch
-from app.services.analysis_tools import AnalysisToolsService
+from app.services.analysis_tools import AnalysisToolsService, NUCLEOTIDE_SAMPLE_LENGTH, _sample_is_nucleotide
 from app.models.enhanced_models import SequenceData, SequenceType
 
 class TestAnalysisToolsService:
@@ -31,6 +37,44 @@ class TestAnalysisToolsService:
         assert result["database"] == database
         assert result["parameters"] == parameters
     
+    @pytest.mark.asyncio
+    async def test_blast_runs_in_warm_container(self):
+        """Test BLAST runs exec into one warm container per database and read its output"""
+        api = self.service.docker_client.api
+        commands = []
+
+        def run_blast(exec_id, detach):
+            command = commands[-1]
+            run_dir = Path(self.service._work_root) / Path(command[command.index("-out") + 1]).parent.name
+            (run_dir / "blast_results.txt").write_text(
+                "query_0\tsp|P1|\t98.5\t100\t1\t0\t1\t100\t5\t104\t1e-30\t180.2\n"
+            )
+
+        api.exec_create.side_effect = lambda container_id, command: commands.append(command) or {"Id": "e1"}
+        api.exec_start.side_effect = run_blast
+        api.exec_inspect.side_effect = [
+            {"Running": True, "ExitCode": None}, {"Running": False, "ExitCode": 0},
+            {"Running": False, "ExitCode": 0}, {"Running": False, "ExitCode": 0}
+        ]
+        container = self.service.docker_client.containers.run.return_value
+        self.service._docker_available = True
+
+        first = await self.service.run_blast_search(["ATCGATCGATCG"], "nt")
+        await self.service.run_blast_search(["GCTAGCTAGCTA"], "nt")
+        await self.service.run_blast_search(["GCTAGCTAGCTA"], "refseq")
+
+        assert first["method"] == "docker"
+        assert first["results"][0]["subject_id"] == "sp|P1|"
+        assert first["results"][0]["identity"] == pytest.approx(0.985)
+        assert self.service.docker_client.containers.run.call_count == 2
+        assert [command[command.index("-db") + 1] for command in commands] == [
+            "/databases/nt", "/databases/nt", "/databases/refseq"
+        ]
+        assert api.exec_inspect.call_count == 4
+
+        await self.service.close()
+        assert container.stop.call_count == 2
+
     @pytest.mark.asyncio
     async def test_multiple_alignment_execution(self, sample_sequences):
         """Test multiple sequence alignment"""
@@ -71,3 +115,237 @@ class TestAnalysisToolsService:
         
         # 3 gaps out of 8 total characters = 37.5%
         assert gap_percentage == 37.5
+
+    @pytest.mark.parametrize("numpy_available", [True, False])
+    def test_alignment_stats_conservation(self, monkeypatch, numpy_available):
+        """Test conserved columns ignore gaps and all-gap columns are not conserved, with or without NumPy"""
+        if not numpy_available:
+            monkeypatch.setattr("app.services.analysis_tools.np", None)
+        aligned_sequences = [
+            {"sequence": "AT-G-C"},
+            {"sequence": "A--GTC"},
+            {"sequence": "AC-G-"}
+        ]
+
+        stats = self.service._calculate_alignment_stats(aligned_sequences)
+
+        # Columns 1, 4, 5 and 6 (the short row counts as a gap); column 3 is all gaps
+        assert stats["conserved_positions"] == 4
+        assert stats["gap_percentage"] == pytest.approx(7 / 18 * 100)
+
+        # Rows are cut or padded to the first row even when the total length matches
+        stats = self.service._calculate_alignment_stats([{"sequence": "AC"}, {"sequence": "A"}, {"sequence": "ACG"}])
+        assert stats["conserved_positions"] == 2
+        assert stats["gap_percentage"] == pytest.approx(1 / 6 * 100)
+
+    @pytest.mark.parametrize("numpy_available", [True, False])
+    def test_is_nucleotide_counts_characters(self, monkeypatch, numpy_available):
+        """Test nucleotide detection uses the share of characters, in either case"""
+        if not numpy_available:
+            monkeypatch.setattr("app.services.analysis_tools.np", None)
+        _sample_is_nucleotide.cache_clear()
+        assert self.service._is_nucleotide("ACGUNacgun" * 10)
+        assert self.service._is_nucleotide("ACGT" * 9 + "EEEE")
+        assert not self.service._is_nucleotide("ACGT" * 4 + "MKLV" * 2)
+        assert self.service._is_nucleotide("")
+
+    def test_is_nucleotide_classifies_cached_prefix(self):
+        """Test only the leading sample is classified, once per distinct sample"""
+        _sample_is_nucleotide.cache_clear()
+        sample = "ACGT" * (NUCLEOTIDE_SAMPLE_LENGTH // 4)
+
+        assert self.service._is_nucleotide(sample + "MKLV" * 1000)
+        assert self.service._is_nucleotide(sample + "EEEE")
+        assert not self.service._is_nucleotide("MKLV" * 1000 + sample)
+        assert _sample_is_nucleotide.cache_info()[:2] == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_mock_alignment_pads_to_longest(self):
+        """Test mock alignment keeps residue order and pads every sequence to the longest"""
+        sequences = [{"id": "a", "sequence": "ACGTACGTACGTACGT"}, {"id": "b", "sequence": "ACGT"}]
+
+        result = await self.service._run_alignment_mock(sequences, "muscle", {})
+
+        aligned = [seq["sequence"] for seq in result["aligned_sequences"]]
+        assert [len(seq) for seq in aligned] == [16, 16]
+        assert aligned[0] == "ACGTACGTACGTACGT"
+        assert aligned[1].replace("-", "") == "ACGT" and aligned[1].count("-") == 12
+
+    @pytest.mark.parametrize("pandas_available", [True, False])
+    def test_parse_blast_results(self, tmp_path, monkeypatch, pandas_available):
+        """Test tabular hits are typed, comments and short rows skipped, and ids kept verbatim"""
+        if not pandas_available:
+            monkeypatch.setattr("app.services.analysis_tools.pd", None)
+        results_file = tmp_path / "blast_results.txt"
+        results_file.write_text(
+            "# BLASTN 2.12.0+\n"
+            "NA\tsp|P1|X\t98.765\t120\t1\t0\t1\t120\t5\t124\t2.3e-50\t230.1\n"
+            "q2\tshort\t90.0\n"
+            "q2\tsp|P2|Y\t100.000\t60\t0\t0\t1\t60\t1\t60\t0.0\t110\n"
+        )
+
+        assert self.service._parse_blast_results(results_file) == [
+            {"query_id": "NA", "subject_id": "sp|P1|X", "identity": 0.98765, "alignment_length": 120,
+             "mismatches": 1, "gap_opens": 0, "query_start": 1, "query_end": 120, "subject_start": 5,
+             "subject_end": 124, "evalue": 2.3e-50, "bit_score": 230.1},
+            {"query_id": "q2", "subject_id": "sp|P2|Y", "identity": 1.0, "alignment_length": 60,
+             "mismatches": 0, "gap_opens": 0, "query_start": 1, "query_end": 60, "subject_start": 1,
+             "subject_end": 60, "evalue": 0.0, "bit_score": 110.0}
+        ]
+        hits = self.service._parse_blast_results(results_file)
+        assert all(type(hit["alignment_length"]) is int for hit in hits)
+        results_file.write_text("q1\ts1\t90\t10\t1\t0\t1\t10\t1\t10\t1e-5\t20\n" * 3)
+        hits = self.service._parse_blast_results(results_file)
+        assert len({id(hit["query_id"]) for hit in hits}) == len({id(hit["subject_id"]) for hit in hits}) == 1
+        results_file.write_text("# BLASTN 2.12.0+\n")
+        assert self.service._parse_blast_results(results_file) == []
+
+    def test_parse_fasta_file(self, tmp_path):
+        """Test multi-line records are joined and text before the first header is skipped"""
+        fasta_file = tmp_path / "alignment.fasta"
+        fasta_file.write_text("stray\n>seq_1 first\r\nAC-G\r\nTT\n>\nGG\n>seq_2\n\nA-GT \n")
+
+        assert self.service._parse_fasta_file(fasta_file) == [
+            {"id": "seq_1 first", "sequence": "AC-GTT", "length": 6},
+            {"id": "seq_2", "sequence": "A-GT", "length": 4}
+        ]
+
+    @pytest.mark.parametrize("numpy_available", [True, False])
+    def test_parse_alignment_file_with_stats(self, tmp_path, monkeypatch, numpy_available):
+        """Test alignment parsing returns the parsed records and their statistics together"""
+        if not numpy_available:
+            monkeypatch.setattr("app.services.analysis_tools.np", None)
+        alignment_file = tmp_path / "alignment.fasta"
+        alignment_file.write_text(">a\nAT-G\n-C\n>b\nA--GTC\n>c\nAC-G-\n")
+
+        aligned_sequences, stats = self.service._parse_alignment_file(alignment_file)
+
+        assert aligned_sequences == self.service._parse_fasta_file(alignment_file)
+        assert stats == self.service._calculate_alignment_stats(aligned_sequences)
+        assert stats["conserved_positions"] == 4
+
+    @pytest.mark.asyncio
+    async def test_local_daemon_execs_over_async_http(self, monkeypatch):
+        """Test execs are started and polled over the async socket client when the daemon is local"""
+        requests = []
+        states = iter([{"Running": True, "ExitCode": None}, {"Running": False, "ExitCode": 7}])
+
+        def handler(request):
+            requests.append((request.method, request.url.path, request.content))
+            if request.url.path.endswith("/exec"):
+                return httpx.Response(201, json={"Id": "e1"})
+            if request.url.path.endswith("/start"):
+                return httpx.Response(200)
+            return httpx.Response(200, json=next(states))
+
+        api = self.service.docker_client.api
+        api.base_url = "http+docker://localhost"
+        api.api_version = "1.43"
+        monkeypatch.setenv("DOCKER_HOST", "unix:///var/run/docker.sock")
+        http = self.service._docker_http_client()
+        assert http is not None
+        await http.aclose()
+        self.service._docker_http = httpx.AsyncClient(
+            transport=httpx.MockTransport(handler), base_url="http://docker/v1.43"
+        )
+        self.service.docker_client.containers.run.return_value.id = "c1"
+
+        with self.service._run_directory():
+            exit_code = await self.service._run_tool("biocontainers/muscle:3.8.31_cv2", ["muscle"])
+
+        assert exit_code == 7
+        assert [(method, path) for method, path, _ in requests] == [
+            ("POST", "/v1.43/containers/c1/exec"), ("POST", "/v1.43/exec/e1/start"),
+            ("GET", "/v1.43/exec/e1/json"), ("GET", "/v1.43/exec/e1/json")
+        ]
+        assert json.loads(requests[0][2]) == {"Cmd": ["muscle"]}
+        api.exec_create.assert_not_called()
+        await self.service.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("container_state", ["removed", "exited", "running"])
+    async def test_failed_exec_replaces_only_dead_container(self, monkeypatch, container_state):
+        """Test a failed exec removes its container only once the container itself is gone"""
+        monkeypatch.delenv("DOCKER_HOST", raising=False)
+        container = self.service.docker_client.containers.run.return_value
+        self.service.docker_client.api.exec_create.side_effect = docker.errors.APIError("failed")
+        if container_state == "removed":
+            container.reload.side_effect = docker.errors.NotFound("no such container")
+        container.status = container_state
+
+        with self.service._run_directory():
+            with pytest.raises(docker.errors.APIError):
+                await self.service._run_tool("biocontainers/muscle:3.8.31_cv2", ["muscle"])
+
+        if container_state == "running":
+            # Shared with other runs, so it stays pooled and untouched
+            container.remove.assert_not_called()
+            assert list(self.service._containers.values()) == [container]
+        else:
+            container.remove.assert_called_once_with(force=True)
+            assert self.service._containers == {}
+        await self.service.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("numpy_available", [True, False])
+    async def test_blast_mock_hits(self, monkeypatch, numpy_available):
+        """Test mock BLAST hits per query stay within their documented ranges, with or without NumPy"""
+        if not numpy_available:
+            monkeypatch.setattr("app.services.analysis_tools.np", None)
+        sequences = ["ATCG" * 30, "GCTA" * 5]
+
+        result = await self.service._run_blast_mock(sequences, "nr", {"evalue": "1e-5", "max_hits": 3})
+
+        assert [len(query["hits"]) for query in result["results"]] == [3, 3]
+        for sequence, query in zip(sequences, result["results"]):
+            for hit in query["hits"]:
+                assert hit["query_end"] == len(sequence)
+                assert len(sequence) - 50 <= hit["subject_end"] <= len(sequence)
+                assert 1e-10 <= hit["evalue"] <= 1e-5
+                assert 100 <= hit["length"] <= 500 and isinstance(hit["length"], int)
+
+    @pytest.mark.asyncio
+    async def test_docker_connection_attempted_once(self, monkeypatch):
+        """Test concurrent first callers share a single connection attempt"""
+        calls = []
+
+        def from_env(**kwargs):
+            calls.append(kwargs)
+            time.sleep(0.05)
+            raise docker.errors.DockerException("no daemon")
+
+        monkeypatch.setattr(docker, "from_env", from_env)
+        service = AnalysisToolsService()
+
+        results = await asyncio.gather(*[service.run_blast_search(["ATCG"], "nt") for _ in range(4)])
+
+        assert len(calls) == 1
+        assert all(result["method"] == "mock" for result in results)
+
+    def test_run_directories_share_one_work_root(self, monkeypatch, tmp_path):
+        """Test run directories live under one work root that is removed at exit"""
+        registered = []
+        monkeypatch.setattr("atexit.register", lambda *args: registered.append(args))
+        monkeypatch.setattr("tempfile.tempdir", str(tmp_path))
+
+        with self.service._run_directory() as first, self.service._run_directory() as second:
+            assert Path(first).parent == Path(second).parent == Path(self.service._work_root)
+
+        assert len(registered) == 1 and registered[0][1] == self.service._work_root
+
+    @pytest.mark.asyncio
+    async def test_alignment_commands_are_argv_lists(self):
+        """Test alignment commands pass paths as separate arguments, never inside a shell string"""
+        api = self.service.docker_client.api
+        commands = []
+        api.exec_create.side_effect = lambda container_id, command: commands.append(command) or {"Id": "e1"}
+        api.exec_inspect.return_value = {"Running": False, "ExitCode": 1}
+        self.service._docker_available = True
+
+        for method in ("muscle", "clustalw", "mafft"):
+            await self.service.run_multiple_alignment([{"id": "a", "sequence": "ACGT"}], method)
+
+        assert [command[0] for command in commands] == ["muscle", "clustalw2", "sh"]
+        assert all(" " not in arg for command in commands[:2] for arg in command)
+        assert commands[2][:4] == ["sh", "-c", 'exec mafft --auto "$1" > "$2"', "mafft"]
+        assert [Path(arg).name for arg in commands[2][4:]] == ["sequences.fasta", "alignment.fasta"]
@@ -0,0 +1,294 @@
+# backend/tests/unit/test_data_writers.py - Unit Tests for Data Writers
+import pytest
+import gzip
+import os
+import json
+from datetime import datetime
+from app.services import data_writers
+from app.services.data_writers import DataWritersService
+
+@pytest.fixture
+def writers_service(tmp_path):
+    """Data writers service writing into a temporary directory"""
+    return DataWritersService(output_directory=str(tmp_path))
+
+class TestDataWritersService:
+    """Unit tests for DataWritersService"""
+
+    @pytest.mark.asyncio
+    async def test_write_fasta(self, writers_service, tmp_path):
+        """Test writing wrapped FASTA records"""
+        sequences = [
+            {"id": "seq1", "description": "Test sequence 1", "sequence": "ATCGATCGAT"},
+            {"id": "seq2", "sequence": "GGCC"}
+        ]
+        result = await writers_service.write_sequences(
+            sequences, "fasta", "out.fasta", {"line_length": 4}
+        )
+
+        assert result["status"] == "success"
+        assert result["file_info"]["record_count"] == 2
+        content = (tmp_path / "out.fasta").read_text()
+        assert content == ">seq1 Test sequence 1\nATCG\nATCG\nAT\n>seq2\nGGCC\n"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("line_length", [0, -5])
+    async def test_write_fasta_rejects_non_positive_line_length(self, writers_service, tmp_path, line_length):
+        """Test a line length below 1 is an error, never passed to the wrapping kernel"""
+        result = await writers_service.write_sequences(
+            [{"id": "seq1", "sequence": "ACGT"}], "fasta", "out.fasta", {"line_length": line_length}
+        )
+
+        assert "line_length must be at least 1" in result["error"]
+        assert not (tmp_path / "out.fasta").exists()
+
+    @pytest.mark.asyncio
+    async def test_write_fasta_reuses_buffer(self, writers_service, tmp_path):
+        """Test a smaller write after a larger one carries no stale bytes"""
+        await writers_service.write_sequences(
+            [{"id": "long", "sequence": "ACGT" * 50}], "fasta", "long.fasta"
+        )
+        await writers_service.write_sequences(
+            [{"id": "short", "sequence": "GG"}], "fasta", "short.fasta"
+        )
+
+        assert (tmp_path / "short.fasta").read_text() == ">short\nGG\n"
+
+    @pytest.mark.asyncio
+    async def test_write_fastq_gzip(self, writers_service, tmp_path):
+        """Test gzip-compressed FASTQ output for .gz filenames"""
+        sequences = [{"id": "read1", "sequence": "ACGT", "quality": "IIII"}]
+        result = await writers_service.write_sequences(sequences, "fastq", "reads.fastq.gz")
+
+        assert result["status"] == "success"
+        with gzip.open(tmp_path / "reads.fastq.gz", "rt") as f:
+            assert f.read() == "@read1\nACGT\n+\nIIII\n"
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("strict_schema", [False, True])
+    async def test_write_fastq_default_quality(self, writers_service, tmp_path, strict_schema):
+        """Test default quality is fitted to each read length, with or without the strict schema"""
+        sequences = [
+            {"id": "short", "sequence": "ACG"},
+            {"id": "long", "sequence": "ACGTACGT", "quality": "II"}
+        ]
+        await writers_service.write_sequences(
+            sequences, "fastq", "reads.fastq", {"default_quality": "#####", "strict_schema": strict_schema}
+        )
+
+        lines = (tmp_path / "reads.fastq").read_text().splitlines()
+        assert lines[3] == "###"
+        assert lines[7] == "#####III"
+
+    @pytest.mark.asyncio
+    async def test_write_clustal(self, writers_service, tmp_path):
+        """Test Clustal blocks and conservation line"""
+        aligned = [
+            {"name": "seq1", "sequence": "ATG-CA"},
+            {"name": "seq2", "sequence": "ATGACC"},
+            {"name": "seq3", "sequence": "ACG-CG"}
+        ]
+        await writers_service.write_sequences(
+            aligned, "clustal", "aln.aln", {"block_size": 4}
+        )
+
+        lines = (tmp_path / "aln.aln").read_text().split("\n")
+        assert lines[2] == "seq1       ATG-"
+        assert lines[5] == " " * 11 + "*:**"
+        assert lines[7] == "seq1       CA"
+        assert lines[10] == " " * 11 + "*."
+
+    @pytest.mark.asyncio
+    async def test_write_clustal_ragged_rows(self, writers_service, tmp_path):
+        """Test rows of unequal length are written in full, without padding"""
+        aligned = [
+            {"name": "short", "sequence": "AC"},
+            {"name": "long", "sequence": "ACGTAA"},
+            {"name": "accent", "sequence": "Aé"}
+        ]
+        await writers_service.write_sequences(
+            aligned, "clustal", "aln.aln", {"block_size": 4}
+        )
+
+        lines = (tmp_path / "aln.aln").read_text().split("\n")
+        assert lines[2:6] == ["short      AC", "long       ACGT", "accent     A?", " " * 11 + "*:**"]
+        assert lines[7:11] == ["short      ", "long       AA", "accent     ", " " * 11 + "**"]
+
+    @pytest.mark.asyncio
+    async def test_write_bed_default_names(self, writers_service, tmp_path):
+        """Test unnamed BED features get positional names"""
+        features = [
+            {"chrom": "chr1", "chromStart": 11, "chromEnd": 20, "name": "peak", "strand": "+"},
+            {"chrom": "chr2", "chromStart": 1, "chromEnd": 5}
+        ]
+        await writers_service.write_sequences(features, "bed", "regions.bed")
+
+        lines = (tmp_path / "regions.bed").read_text().splitlines()
+        assert lines[1] == "chr1\t10\t20\tpeak\t0\t+"
+        assert lines[2] == "chr2\t0\t5\tfeature_2\t0\t."
+
+    @pytest.mark.asyncio
+    async def test_write_sam_header(self, writers_service, tmp_path):
+        """Test SAM header includes reference sequences"""
+        alignments = [{"query_name": "read1", "reference_name": "chr1", "position": 5}]
+        await writers_service.write_sequences(
+            alignments, "sam", "aln.sam",
+            {"reference_sequences": [{"name": "chr1", "length": 1000}]}
+        )
+
+        lines = (tmp_path / "aln.sam").read_text().splitlines()
+        assert lines[0] == "@HD\tVN:1.6\tSO:unsorted"
+        assert lines[2] == "@SQ\tSN:chr1\tLN:1000"
+        assert lines[3].startswith("read1\t0\tchr1\t5\t60\t")
+
+    @pytest.mark.asyncio
+    async def test_write_fasta_strict_schema(self, writers_service, tmp_path):
+        """Test strict schema requires id and sequence keys"""
+        sequences = [{"id": "seq1", "sequence": "ACGT"}]
+        result = await writers_service.write_sequences(
+            sequences, "fasta", "strict.fasta", {"strict_schema": True}
+        )
+        assert result["status"] == "success"
+        assert (tmp_path / "strict.fasta").read_text() == ">seq1\nACGT\n"
+
+        result = await writers_service.write_sequences(
+            [{"name": "seq1", "sequence": "ACGT"}], "fasta", "strict.fasta", {"strict_schema": True}
+        )
+        assert "error" in result
+
+    @pytest.mark.asyncio
+    async def test_write_gff3(self, writers_service, tmp_path):
+        """Test GFF3 header and attribute column"""
+        features = [
+            {"seqid": "chr1", "type": "gene", "start": 1000, "end": 2000, "strand": "+",
+             "id": "gene1", "attributes": {"ID": "ignored", "Note": "test"}},
+            {"seqid": "chr1", "type": "exon", "start": 1000, "end": 1200}
+        ]
+        await writers_service.write_sequences(
+            features, "gff3", "features.gff3",
+            {"reference_sequences": [{"id": "chr1", "length": 5000}]}
+        )
+
+        lines = (tmp_path / "features.gff3").read_text().splitlines()
+        assert lines[:2] == ["##gff-version 3", "##sequence-region chr1 1 5000"]
+        assert lines[2] == "chr1\tugene\tgene\t1000\t2000\t.\t+\t.\tID=gene1;Note=test"
+        assert lines[3] == "chr1\tugene\texon\t1000\t1200\t.\t.\t.\t."
+
+    @pytest.mark.asyncio
+    async def test_write_vcf(self, writers_service, tmp_path):
+        """Test VCF header and INFO/sample columns"""
+        variants = [
+            {"chromosome": "chr1", "position": 100, "ref_allele": "A", "alt_allele": "G",
+             "depth": 25, "allele_frequency": 0.5, "genotype": {"GT": "1/1", "GQ": 99}},
+            {"chromosome": "chr2", "position": 7}
+        ]
+        await writers_service.write_sequences(variants, "vcf", "calls.vcf")
+
+        lines = (tmp_path / "calls.vcf").read_text().splitlines()
+        assert lines[0] == "##fileformat=VCFv4.3"
+        assert lines[7].startswith("#CHROM\tPOS")
+        assert lines[8] == "chr1\t100\t.\tA\tG\t30\tPASS\tDP=25;AF=0.5000\tGT:GQ\t1/1:99"
+        assert lines[9] == "chr2\t7\t.\tA\tT\t30\tPASS\t.\tGT:GQ\t0/1:30"
+
+    @pytest.mark.asyncio
+    async def test_write_gtf(self, writers_service, tmp_path):
+        """Test GTF quoted attributes"""
+        features = [
+            {"seqname": "chr1", "feature": "exon", "start": 5, "end": 50, "strand": "-",
+             "gene_id": "g1", "transcript_id": "t1", "attributes": {"exon_number": 1}}
+        ]
+        await writers_service.write_sequences(features, "gtf", "genes.gtf")
+
+        content = (tmp_path / "genes.gtf").read_text()
+        assert content == 'chr1\tugene\texon\t5\t50\t.\t-\t.\tgene_id "g1"; transcript_id "t1"; exon_number "1"\n'
+
+    @pytest.mark.asyncio
+    async def test_cleanup_old_files(self, writers_service, tmp_path):
+        """Test only files older than the cutoff are removed"""
+        old_file = tmp_path / "old.fasta"
+        new_file = tmp_path / "new.fasta"
+        old_file.write_text(">a\nACGT\n")
+        new_file.write_text(">b\nACGT\n")
+        os.utime(old_file, (0, 0))
+
+        result = await writers_service.cleanup_old_files(max_age_hours=1)
+
+        assert result["cleaned_files"] == 1
+        assert not old_file.exists()
+        assert new_file.exists()
+
+    @pytest.mark.asyncio
+    async def test_write_json(self, writers_service, tmp_path):
+        """Test JSON output round-trips the records"""
+        data = [{"id": "seq1", "length": 4}]
+        await writers_service.write_sequences(data, "json", "a.json")
+
+        assert json.loads((tmp_path / "a.json").read_text()) == data
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_dump_json_format(self, writers_service, monkeypatch, use_orjson):
+        """Test datetimes match str(), non-ASCII is raw UTF-8 and orjson writes NaN as null"""
+        if not use_orjson:
+            monkeypatch.setattr(data_writers, "orjson", None)
+        elif data_writers.orjson is None:
+            pytest.skip("orjson not installed")
+        data = {"created": datetime(2024, 1, 2, 3, 4, 5), "name": "café", "score": float("nan")}
+
+        text = writers_service._dump_json(data, False).decode()
+        parsed = json.loads(text)
+
+        assert parsed["created"] == "2024-01-02 03:04:05"
+        assert "café" in text
+        assert (parsed["score"] is None) == use_orjson
+
+    @pytest.mark.asyncio
+    async def test_write_csv(self, writers_service, tmp_path):
+        """Test CSV output with and without fields needing quotes"""
+        await writers_service.write_sequences(
+            [{"id": "seq1", "length": 4}, {"id": "seq2", "gc": None}], "csv", "plain.csv"
+        )
+        assert (tmp_path / "plain.csv").read_bytes() == b"gc,id,length\r\n,seq1,4\r\n,seq2,\r\n"
+
+        await writers_service.write_sequences(
+            [{"id": "seq1", "note": 'a "b", c'}], "csv", "quoted.csv"
+        )
+        assert (tmp_path / "quoted.csv").read_bytes() == b'id,note\r\nseq1,"a ""b"", c"\r\n'
+
+    @pytest.mark.asyncio
+    async def test_write_analysis_results_excel(self, writers_service, tmp_path):
+        """Test Excel export writes summary and results sheets"""
+        from openpyxl import load_workbook
+
+        results = {
+            "analysis_type": "orf",
+            "parameters": {"min_length": 100},
+            "results": [{"start": 1, "end": 300}, {"start": 400, "end": 900, "frame": 2}]
+        }
+        result = await writers_service.write_analysis_results(results, "excel", "orf.xlsx")
+
+        assert result["status"] == "success"
+        workbook = load_workbook(tmp_path / "orf.xlsx")
+        assert workbook.sheetnames == ["Summary", "Results"]
+        assert list(workbook["Summary"].values) == [("analysis_type", "parameters_min_length"), ("orf", 100)]
+        assert list(workbook["Results"].values) == [("start", "end", "frame"), (1, 300, None), (400, 900, 2)]
+
+    @pytest.mark.asyncio
+    async def test_batch_write_sequences(self, writers_service, tmp_path):
+        """Test batch results keep input order and count failures"""
+        batches = [
+            [{"id": "seq1", "sequence": "ACGT"}],
+            [{"id": "seq2", "sequence": "GGCC"}],
+            []
+        ]
+        configs = [
+            {"format": "fasta", "filename": "one.fasta"},
+            {"format": "unknown"},
+            {"format": "fasta", "filename": "three.fasta"}
+        ]
+        result = await writers_service.batch_write_sequences(batches, configs, max_concurrency=2)
+
+        assert result["successful_writes"] == 1
+        assert result["failed_writes"] == 2
+        assert [r["batch_index"] for r in result["results"]] == [0, 1, 2]
+        assert result["results"][0]["result"]["status"] == "success"
+        assert (tmp_path / "one.fasta").exists()
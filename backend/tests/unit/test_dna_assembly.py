@@ -0,0 +1,185 @@
+# backend/tests/unit/test_dna_assembly.py - Unit Tests for DNA Assembly
+import pytest
+from collections import Counter
+from pathlib import Path
+from unittest.mock import MagicMock
+import docker
+from app.services.dna_assembly import DNAAssemblyService, _count_kmers
+
+GENOME = "ATGCGTACGTTAGCCGATCGATGGCTAACGTTCGAGCTAGGCATCGATCCGTAGCTTACG"
+
+@pytest.fixture
+def assembly_service():
+    """DNA assembly service"""
+    return DNAAssemblyService()
+
+class TestDNAAssemblyService:
+    """Unit tests for DNAAssemblyService"""
+
+    @pytest.mark.asyncio
+    async def test_assembler_1_joins_overlapping_reads(self, assembly_service):
+        """Test overlapping reads are joined into one contig in either direction"""
+        reads = [
+            {"sequence": GENOME[20:45]},
+            {"sequence": GENOME[:30]},
+            {"sequence": GENOME[35:]}
+        ]
+        parameters = {"min_overlap": 8, "min_identity": 0.95, "min_contig_length": 10}
+        result = await assembly_service.assembler_1(reads, parameters)
+
+        assert len(result["contigs"]) == 1
+        assert result["contigs"][0]["sequence"] == GENOME
+        assert result["reads_used"] == 3
+
+    @pytest.mark.asyncio
+    async def test_assembler_1_short_overlap_not_joined(self, assembly_service):
+        """Test reads overlapping by less than min_overlap stay separate"""
+        reads = [{"sequence": GENOME[:30]}, {"sequence": GENOME[25:]}]
+        parameters = {"min_overlap": 8, "min_identity": 0.95, "min_contig_length": 10}
+        result = await assembly_service.assembler_1(reads, parameters)
+
+        assert [c["sequence"] for c in result["contigs"]] == [GENOME[:30], GENOME[25:]]
+
+    @pytest.mark.asyncio
+    async def test_assembler_1_normalizes_case(self, assembly_service):
+        """Test lowercase reads are uppercased before overlapping"""
+        reads = [GENOME[:30].lower(), {"sequence": GENOME[20:]}]
+        parameters = {"min_overlap": 8, "min_identity": 0.95, "min_contig_length": 10}
+        result = await assembly_service.assembler_1(reads, parameters)
+
+        assert [c["sequence"] for c in result["contigs"]] == [GENOME]
+
+    def test_count_kmers_matches_string_counting(self):
+        """Test packed k-mer counts match plain string counting, ambiguous bases included"""
+        sequences = ["ACGTACGTAC", "GTACNNACGT", "acgtACGT", "TTT"]
+        expected = Counter(
+            sequence[i:i+4].encode() for sequence in sequences for i in range(len(sequence) - 3)
+        )
+
+        kmer_counts = _count_kmers(sequences, 4, 2)
+        assert kmer_counts.total_kmers == len(expected)
+        assert kmer_counts.counts == {kmer: count for kmer, count in expected.items() if count >= 2}
+
+    def test_batched_kmer_coverage_matches_loop(self, assembly_service):
+        """Test batched contig coverage matches the per-contig dictionary loop"""
+        kmer_counts = _count_kmers(["ACGTACGTAC", "GTACNNACGT", "acgtACGT", "TTT"], 4, 1)
+        contigs = ["ACGTACGT", "GTACNNAC", "TTT", "acgtTTTT", "ACGTNACGT"]
+
+        coverages = assembly_service._calculate_kmer_coverages(contigs, kmer_counts, 4)
+        assert coverages == [
+            assembly_service._calculate_kmer_coverage(contig.encode(), kmer_counts.counts, 4) for contig in contigs
+        ]
+
+    def test_find_overlap_and_mismatches(self, assembly_service):
+        """Test suffix/prefix overlap length and mismatch counting"""
+        assert assembly_service._find_overlap("TTTACGTACG", "ACGTACGAAA", 3) == 7
+        assert assembly_service._find_overlap("TTTACG", "CGAAAA", 3) == 0
+        assert assembly_service._count_mismatches("ACGTAC", "AGGTTCGG") == 2
+
+    def test_find_overlap_low_complexity(self, assembly_service):
+        """Test overlap on repetitive sequences where many seed positions fail"""
+        assert assembly_service._find_overlap("A" * 100, "A" * 50 + "C" * 50, 20) == 50
+        assert assembly_service._find_overlap("AC" * 50, "AC" * 30 + "GG", 20) == 60
+        assert assembly_service._find_overlap("AC" * 50, "CA" * 30, 20) == 59
+
+    def test_calculate_gc_content(self, assembly_service):
+        """Test GC content ignores case"""
+        assert assembly_service._calculate_gc_content("ACgtNN") == pytest.approx(100 / 3)
+        assert assembly_service._calculate_gc_content("") == 0.0
+
+    @pytest.mark.asyncio
+    async def test_cap3_assembly_reads_outputs(self, assembly_service, mock_docker_client):
+        """Test CAP3 contigs and singlets are parsed from the container's output files"""
+        inputs = []
+
+        def run_cap3(command):
+            run_dir = Path(assembly_service._work_root) / Path(command.split()[1]).parent.name
+            inputs.append((run_dir / "input.fasta").read_text())
+            (run_dir / "input.fasta.cap.contigs").write_text(">Contig1 merged\nACGTGGCC\n")
+            (run_dir / "input.fasta.cap.singlets").write_text(">seq_1\nGGCC\n")
+            return MagicMock(exit_code=0, output=b"Mock tool output")
+
+        mock_container = mock_docker_client.containers.run.return_value
+        mock_container.exec_run.side_effect = run_cap3
+        assembly_service.docker_client = mock_docker_client
+
+        result = await assembly_service.cap3_assembly([{"id": "r1", "sequence": "ACGT"}, "GGCC"])
+        await assembly_service.cap3_assembly(["ACGT"])
+
+        assert [(c["id"], c["type"], c["length"]) for c in result["contigs"]] == [
+            ("Contig1", "contig", 8), ("seq_1", "singlet", 4)
+        ]
+        assert result["logs"] == "Mock tool output"
+        assert inputs == [">r1\nACGT\n>seq_1\nGGCC\n", ">seq_0\nACGT\n"]
+        # One warm container serves both runs
+        assert mock_docker_client.containers.run.call_count == 1
+        assert mock_container.exec_run.call_count == 2
+
+        await assembly_service.close()
+        mock_container.stop.assert_called_once()
+
+    @pytest.mark.asyncio
+    async def test_run_tool_raises_on_nonzero_exit(self, assembly_service, mock_docker_client):
+        """Test a failed exec raises ContainerError instead of returning its output"""
+        mock_container = mock_docker_client.containers.run.return_value
+        mock_container.exec_run.return_value = MagicMock(exit_code=1, output=b"cap3: bad input")
+        assembly_service.docker_client = mock_docker_client
+
+        with assembly_service._run_directory():
+            with pytest.raises(docker.errors.ContainerError) as exc_info:
+                await assembly_service._run_tool("biocontainers/cap3:latest", "cap3 input.fasta")
+
+        assert exc_info.value.exit_status == 1
+        assert exc_info.value.stderr == "cap3: bad input"
+        await assembly_service.close()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("container_state", ["removed", "exited", "running"])
+    async def test_failed_exec_replaces_only_dead_container(self, assembly_service, mock_docker_client, container_state):
+        """Test a failed exec removes the warm container only once it is gone"""
+        mock_container = mock_docker_client.containers.run.return_value
+        mock_container.exec_run.side_effect = docker.errors.APIError("failed")
+        if container_state == "removed":
+            mock_container.reload.side_effect = docker.errors.NotFound("no such container")
+        mock_container.status = container_state
+        assembly_service.docker_client = mock_docker_client
+
+        with assembly_service._run_directory():
+            with pytest.raises(docker.errors.APIError):
+                await assembly_service._run_tool("biocontainers/cap3:latest", "cap3 input.fasta")
+
+        if container_state == "running":
+            # Shared with other runs, so it stays pooled and untouched
+            mock_container.remove.assert_not_called()
+            assert assembly_service._containers == {"biocontainers/cap3:latest": mock_container}
+        else:
+            mock_container.remove.assert_called_once_with(force=True)
+            assert assembly_service._containers == {}
+        await assembly_service.close()
+
+    @pytest.mark.asyncio
+    async def test_correctness_prefilters_many_references(self, assembly_service):
+        """Test the MinHash prefilter still finds the matching reference among many"""
+        references = [{"sequence": GENOME[i:] + GENOME[:i]} for i in range(0, 60, 6)]
+        references.append({"sequence": "ACGT" * 60})
+        contigs = [{"sequence": "ACGT" * 30, "length": 120}]
+
+        assert assembly_service._candidate_references(
+            assembly_service._kmer_profile(contigs[0]["sequence"]),
+            [assembly_service._kmer_profile(ref["sequence"]) for ref in references]
+        )[-1] == 10
+
+        result = await assembly_service._calculate_correctness(contigs, references)
+        assert result["aligned_contigs"] == 1
+        assert result["estimated_accuracy"] == 1.0
+
+    def test_extend_contig_prefers_covered_successor(self, assembly_service):
+        """Test greedy extension follows the better covered branch"""
+        overlap_graph = {b"AAC": [b"ACG", b"ACT"], b"ACT": [b"CTT"]}
+        kmer_counts = {b"AAC": 3, b"ACG": 2, b"ACT": 5, b"CTT": 4}
+        used_k_mers = set()
+
+        contig = assembly_service._extend_contig(b"AAC", overlap_graph, used_k_mers, kmer_counts)
+
+        assert contig == b"AACTT"
+        assert used_k_mers == {b"AAC", b"ACT", b"CTT"}
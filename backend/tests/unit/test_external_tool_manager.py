@@ -0,0 +1,528 @@
+# backend/tests/unit/test_external_tool_manager.py - Unit Tests for External Tool Manager
+import pytest
+import asyncio
+import base64
+import io
+import json
+import os
+import tarfile
+import threading
+import time
+import docker
+from pathlib import Path
+from unittest.mock import MagicMock
+from app.services import external_tool_manager as etm
+from app.services.external_tool_manager import ExternalToolManager
+
+def _without_execution_id(result):
+    """Tool result minus its execution_id, which each cache hit gets afresh"""
+    return {key: value for key, value in result.items() if key != "execution_id"}
+
+@pytest.fixture
+def tool_manager(mock_docker_client, monkeypatch):
+    """External tool manager backed by a mock Docker client.
+    
+    The mock warm container keeps archives copied in and out in
+    container.files. Each tool exec records its command and input files in
+    container.runs and writes container.outputs to its working directory.
+    Host binaries are never used.
+    """
+    monkeypatch.setattr(etm, "USE_NATIVE_TOOLS", False)
+    container = mock_docker_client.containers.run.return_value
+    container.files = {}
+    container.outputs = {}
+    container.runs = []
+
+    def put_archive(path, data):
+        with tarfile.open(fileobj=io.BytesIO(data)) as tar:
+            for member in tar.getmembers():
+                if member.isfile():
+                    container.files[f"/{member.name}"] = tar.extractfile(member).read().decode()
+        return True
+
+    def get_archive(path):
+        if path not in container.files:
+            raise docker.errors.NotFound(path)
+        buffer = io.BytesIO()
+        data = container.files[path].encode()
+        with tarfile.open(fileobj=buffer, mode="w") as tar:
+            info = tarfile.TarInfo(Path(path).name)
+            info.size = len(data)
+            tar.addfile(info, io.BytesIO(data))
+        return iter([buffer.getvalue()]), {}
+
+    def exec_run(command, workdir=None):
+        if command[:2] == ["rm", "-rf"]:
+            for path in [path for path in container.files if path.startswith(f"{command[2]}/")]:
+                del container.files[path]
+        else:
+            inputs = {
+                Path(path).name: content for path, content in container.files.items()
+                if path.startswith(f"{workdir}/")
+            }
+            container.runs.append((command, inputs))
+            container.files.update({f"{workdir}/{name}": data for name, data in container.outputs.items()})
+        return MagicMock(exit_code=0, output=b"Mock tool output")
+
+    container.put_archive.side_effect = put_archive
+    container.get_archive.side_effect = get_archive
+    container.exec_run.side_effect = exec_run
+
+    manager = ExternalToolManager()
+    manager.docker_client = mock_docker_client
+    return manager
+
+class TestExternalToolManager:
+    """Unit tests for ExternalToolManager"""
+
+    @pytest.mark.asyncio
+    async def test_execute_blast_search(self, tool_manager, mock_docker_client):
+        """Test BLAST input is copied in, its output copied back out and the run directory removed"""
+        container = mock_docker_client.containers.run.return_value
+        container.outputs = {"blast_results.xml": "<BlastOutput/>"}
+
+        result = await tool_manager.execute_blast_search("ACGTACGTAC", "nt")
+
+        [(command, inputs)] = container.runs
+        assert command[:3] == ["blastn", "-query", "query.fasta"]
+        assert inputs == {"query.fasta": ">query_sequence\nACGTACGTAC\n"}
+        assert result["status"] == "success"
+        assert result["output"] == "<BlastOutput/>"
+        assert result["exit_code"] == 0
+        assert result["logs"] == "Mock tool output"
+        assert container.files == {}
+
+    @pytest.mark.asyncio
+    async def test_blast_single_and_batch_share_cache(self, tool_manager, mock_docker_client):
+        """Test a query already run on its own is served from cache in a batch"""
+        container = mock_docker_client.containers.run.return_value
+        container.outputs = {"blast_results.xml": "<BlastOutput/>"}
+
+        single = await tool_manager.execute_blast_search("ACGTACGTAC", "nt", {"evalue": 1e-5})
+        [batched] = await tool_manager.execute_blast_search_batch(["ACGTACGTAC"], "nt", {"evalue": 1e-5})
+
+        assert _without_execution_id(batched) == _without_execution_id(single)
+        assert batched["execution_id"] != single["execution_id"]
+        assert len(container.runs) == 1
+
+        # Hits are copies, so changing one leaves the cached result alone
+        batched["parameters_used"]["evalue"] = 10
+        again = await tool_manager.execute_blast_search("ACGTACGTAC", "nt", {"evalue": 1e-5})
+        assert again["parameters_used"] == {"evalue": 1e-5}
+
+    @pytest.mark.asyncio
+    async def test_blast_batch_splits_report_per_query(self, tool_manager, mock_docker_client):
+        """Test batch BLAST runs once per program and splits the XML report by query"""
+        container = mock_docker_client.containers.run.return_value
+        container.outputs = {"blast_results.xml": (
+            "<BlastOutput><BlastOutput_program>blast</BlastOutput_program>"
+            "<BlastOutput_query-ID>Query_1</BlastOutput_query-ID>"
+            "<BlastOutput_query-len>10</BlastOutput_query-len><BlastOutput_iterations>"
+            "<Iteration><Iteration_query-ID>Query_1</Iteration_query-ID>"
+            "<Iteration_query-len>10</Iteration_query-len></Iteration>"
+            "<Iteration><Iteration_query-ID>Query_2</Iteration_query-ID>"
+            "<Iteration_query-len>12</Iteration_query-len></Iteration>"
+            "</BlastOutput_iterations></BlastOutput>"
+        )}
+        queries = ["ACGTACGTAC", "MKTAYIAKQR", "GGGGCCCCAA"]
+
+        results = await tool_manager.execute_blast_search_batch(queries, "nt")
+        again = await tool_manager.execute_blast_search_batch(queries, "nt")
+
+        assert [(command[0], inputs) for command, inputs in container.runs] == [
+            ("blastn", {"query.fasta": ">query_sequence\nACGTACGTAC\n>query_sequence\nGGGGCCCCAA\n"}),
+            ("blastp", {"query.fasta": ">query_sequence\nMKTAYIAKQR\n"})
+        ]
+        # Each report's query header comes from its own iteration
+        assert [result["output"] for result in results] == [
+            "<BlastOutput><BlastOutput_program>blast</BlastOutput_program>"
+            f"<BlastOutput_query-ID>{query_id}</BlastOutput_query-ID>"
+            f"<BlastOutput_query-len>{length}</BlastOutput_query-len><BlastOutput_iterations>"
+            f"<Iteration><Iteration_query-ID>{query_id}</Iteration_query-ID>"
+            f"<Iteration_query-len>{length}</Iteration_query-len></Iteration>"
+            "</BlastOutput_iterations></BlastOutput>"
+            for query_id, length in (("Query_1", 10), ("Query_1", 10), ("Query_2", 12))
+        ]
+        assert [_without_execution_id(result) for result in again] == [
+            _without_execution_id(result) for result in results
+        ]
+
+    @pytest.mark.asyncio
+    async def test_mafft_alignment_from_redirected_stdout(self, tool_manager, mock_docker_client):
+        """Test MAFFT's stdout is redirected to a file so progress logs stay out of the alignment"""
+        container = mock_docker_client.containers.run.return_value
+        container.outputs = {"alignment.fasta": ">sequence_1\nACGT\n>sequence_2\nAGGT\n"}
+
+        result = await tool_manager.execute_multiple_alignment(["ACGT", "AGGT"], "mafft")
+
+        [(command, inputs)] = container.runs
+        assert command == ["sh", "-c", 'exec "$@" > alignment.fasta', "mafft", "mafft", "--auto", "input.fasta"]
+        assert inputs == {"input.fasta": ">sequence_1\nACGT\n>sequence_2\nAGGT\n"}
+        assert result["alignment"] == ">sequence_1\nACGT\n>sequence_2\nAGGT\n"
+        assert result["logs"] == "Mock tool output"
+
+    @pytest.mark.asyncio
+    async def test_exit_code_from_docker_events(self, tool_manager, mock_docker_client):
+        """Test a run's exit code comes from the event stream, not a blocking wait"""
+        container = mock_docker_client.containers.run.return_value
+        container.id = "abc123"
+        container.status = "running"
+
+        def die_events(**kwargs):
+            time.sleep(0.05)
+            yield {"id": "abc123", "Actor": {"Attributes": {"exitCode": "3"}}}
+
+        mock_docker_client.events.side_effect = die_events
+
+        result = await tool_manager.execute_custom_container("busybox", ["false"], {})
+        tool_manager._cleanup_task.cancel()
+
+        assert result["execution"]["exit_code"] == 3
+        container.wait.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_repeated_alignment_served_from_cache(self, tool_manager, mock_docker_client):
+        """Test an identical alignment request does not start a second container"""
+        first = await tool_manager.execute_multiple_alignment(["ACGT", "AGGT"], "muscle", {"maxiters": 2})
+        second = await tool_manager.execute_multiple_alignment(["ACGT", "AGGT"], "muscle", {"maxiters": 2})
+        await tool_manager.execute_multiple_alignment(["AGGT", "ACGT"], "muscle", {"maxiters": 2})
+
+        assert second == first
+        assert len(mock_docker_client.containers.run.return_value.runs) == 2
+        assert (tool_manager.cache_hits, tool_manager.cache_misses) == (1, 2)
+
+    @pytest.mark.asyncio
+    async def test_alignment_batch_keeps_job_order(self, tool_manager, mock_docker_client):
+        """Test batch alignment results line up with their jobs, failures included"""
+        results = await tool_manager.execute_multiple_alignments_batch([
+            {"sequences": ["ACGT", "AGGT"], "tool": "muscle"},
+            {"sequences": ["ACGT", "AGGT"], "tool": "unknown"},
+            {"sequences": ["ACGT", "AGGT"], "tool": "mafft"}
+        ])
+
+        assert [result.get("tool") for result in results] == ["muscle", None, "mafft"]
+        assert "error" in results[1]
+        assert len(mock_docker_client.containers.run.return_value.runs) == 2
+
+    @pytest.mark.asyncio
+    async def test_execute_custom_container_collects_outputs(self, tool_manager, mock_docker_client):
+        """Test new files in the work directory are returned and inputs are not"""
+        def run_tool(image, command, volumes, **kwargs):
+            (Path(next(iter(volumes))) / "out.txt").write_text("done")
+            return mock_docker_client.containers.run.return_value
+
+        mock_docker_client.containers.run.side_effect = run_tool
+
+        result = await tool_manager.execute_custom_container(
+            "busybox", ["sh", "-c", "true"], {"in.txt": "data"}
+        )
+
+        execution = result["execution"]
+        assert execution["success"] is True
+        assert execution["output_files"] == {"out.txt": "done"}
+        assert execution["execution_id"] in tool_manager.execution_history
+        tool_manager._cleanup_task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_custom_container_logs_keep_tail(self, tool_manager, mock_docker_client, monkeypatch):
+        """Test only the last LOG_TAIL_BYTES of streamed container logs are kept"""
+        monkeypatch.setattr(etm, "LOG_TAIL_BYTES", 11)
+        chunks = [b"progress %d\n" % i for i in range(1000)] + [b"er", b"ror: bad\n"]
+        mock_docker_client.containers.run.return_value.logs.side_effect = lambda **kwargs: iter(chunks)
+
+        result = await tool_manager.execute_custom_container("busybox", ["true"], {})
+        tool_manager._cleanup_task.cancel()
+
+        assert result["execution"]["logs"] == "error: bad\n"
+        assert etm._log_tail([b"abc", b"def"], limit=4) == "cdef"
+        assert etm._log_tail([], limit=4) == ""
+
+    @pytest.mark.asyncio
+    async def test_tool_runs_are_bounded(self, tool_manager, mock_docker_client):
+        """Test no more than max_parallel_runs tool runs overlap"""
+        manager = ExternalToolManager(max_parallel_runs=2)
+        manager.docker_client = mock_docker_client
+        lock = threading.Lock()
+        running = [0, 0]
+
+        def slow_run(command, workdir=None):
+            if workdir is not None:
+                with lock:
+                    running[0] += 1
+                    running[1] = max(running[1], running[0])
+                time.sleep(0.02)
+                with lock:
+                    running[0] -= 1
+            return MagicMock(exit_code=0, output=b"")
+
+        mock_docker_client.containers.run.return_value.exec_run.side_effect = slow_run
+
+        await asyncio.gather(*[
+            manager.execute_multiple_alignment(["ACGT", "AGGT"], "muscle") for _ in range(6)
+        ])
+
+        assert mock_docker_client.containers.run.return_value.exec_run.call_count == 12
+        assert running[1] == 2
+
+    @pytest.mark.asyncio
+    async def test_warm_container_per_image(self, tool_manager, mock_docker_client):
+        """Test each image gets one warm container, shared by its runs and stopped on close"""
+        await asyncio.gather(*[
+            tool_manager.execute_multiple_alignment([f"ACGT{i}", "AGGT"], tool)
+            for i in range(3) for tool in ("muscle", "clustalw")
+        ])
+
+        images = [call.args[0] for call in mock_docker_client.containers.run.call_args_list]
+        assert sorted(images) == sorted(tool_manager.biocontainers[tool].image for tool in ("muscle", "clustalw"))
+        assert len(mock_docker_client.containers.run.return_value.runs) == 6
+
+        await tool_manager.close()
+        assert mock_docker_client.containers.run.return_value.stop.call_count == 2
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("container_state", ["removed", "exited", "running"])
+    async def test_failed_exec_replaces_only_dead_container(self, tool_manager, mock_docker_client, container_state):
+        """Test a failed tool exec cleans up its run directory and removes the container only once it is gone"""
+        container = mock_docker_client.containers.run.return_value
+        container.outputs = {"alignment.fasta": ">sequence_1\nACGT\n"}
+        container.get_archive.side_effect = docker.errors.APIError("failed")
+        if container_state == "removed":
+            container.reload.side_effect = docker.errors.NotFound("no such container")
+        container.status = container_state
+        image = tool_manager.biocontainers["muscle"].image
+
+        with pytest.raises(docker.errors.APIError):
+            await tool_manager._run_tool_container(image, ["muscle"], {"input.fasta": ">a\nACGT\n"}, "alignment.fasta")
+
+        assert container.files == {}
+        if container_state == "running":
+            # Shared with other runs, so it stays pooled and untouched
+            container.remove.assert_not_called()
+            assert tool_manager._warm_containers == {image: container}
+        else:
+            container.remove.assert_called_once_with(force=True)
+            assert tool_manager._warm_containers == {}
+
+    @pytest.mark.asyncio
+    async def test_image_checks_are_cached(self, tool_manager, mock_docker_client):
+        """Test repeated container listings reuse image presence checks"""
+        first = await tool_manager.list_available_containers()
+        second = await tool_manager.list_available_containers()
+
+        assert first == second
+        assert mock_docker_client.images.get.call_count == len(tool_manager.biocontainers)
+
+    @pytest.mark.asyncio
+    async def test_image_warmup_pulls_all_images(self, tool_manager, mock_docker_client):
+        """Test the warm-up task pulls every image and marks them ready"""
+        await tool_manager.start_image_warmup()
+
+        pulled = {call.args[0] for call in mock_docker_client.images.pull.call_args_list}
+        assert pulled == {container.image for container in tool_manager.biocontainers.values()}
+        assert tool_manager.images_ready
+
+    @pytest.mark.asyncio
+    async def test_custom_outputs_by_size_and_type(
+        self, tool_manager, mock_docker_client, monkeypatch, tmp_path
+    ):
+        """Test large outputs are returned by path and small binary ones as base64"""
+        monkeypatch.setattr(etm, "INLINE_OUTPUT_LIMIT", 10)
+        monkeypatch.setattr(etm, "ARTIFACTS_DIR", tmp_path)
+
+        def run_tool(image, command, volumes, **kwargs):
+            data_dir = Path(next(iter(volumes)))
+            (data_dir / "small.txt").write_text("ok")
+            (data_dir / "reads.bam").write_bytes(b"BAM\x01\xff")
+            (data_dir / "large.sam").write_text("x" * 50)
+            return mock_docker_client.containers.run.return_value
+
+        mock_docker_client.containers.run.side_effect = run_tool
+
+        result = await tool_manager.execute_custom_container("busybox", ["true"], {})
+        tool_manager._cleanup_task.cancel()
+
+        execution = result["execution"]
+        outputs = execution["output_files"]
+        assert outputs["small.txt"] == "ok"
+        assert outputs["reads.bam"] == {"base64": base64.b64encode(b"BAM\x01\xff").decode(), "size": 5}
+        json.dumps(execution)
+        assert outputs["large.sam"]["size"] == 50
+        assert Path(outputs["large.sam"]["path"]) == tmp_path / execution["execution_id"] / "large.sam"
+        assert Path(outputs["large.sam"]["path"]).read_text() == "x" * 50
+
+    @pytest.mark.asyncio
+    async def test_execution_history_is_bounded(self, tool_manager, monkeypatch):
+        """Test the oldest executions are evicted once history is full"""
+        monkeypatch.setattr(etm, "EXECUTION_HISTORY_SIZE", 3)
+
+        for i in range(5):
+            tool_manager._record_execution(f"run{i}", {"timestamp": i})
+
+        assert list(tool_manager.execution_history) == ["run2", "run3", "run4"]
+        assert not tool_manager._cleanup_task.done()
+        tool_manager._cleanup_task.cancel()
+
+    @pytest.mark.asyncio
+    async def test_mock_blast_without_docker(self):
+        """Test the mock BLAST is reproducible per sequence and sorted by E-value"""
+        manager = ExternalToolManager()
+        manager.docker_client = None
+
+        first = await manager.execute_blast_search("ACGT" * 10, "nt")
+        second = await manager.execute_blast_search("ACGT" * 10, "nt")
+        limited = await manager.execute_blast_search("ACGT" * 10, "nt", {"max_target_seqs": 2})
+
+        hits = first["results"]["hits"]
+        evalues = [hit["hsp_evalue"] for hit in hits]
+        assert 3 <= len(hits) <= 7
+        assert evalues == sorted(evalues)
+        assert second["results"]["hits"] == hits
+        assert len(limited["results"]["hits"]) == 2
+
+    def test_scan_sequence_detects_nucleotides(self):
+        """Test nucleotide detection counts every character, in either case"""
+        assert etm._scan_sequence("ACGTNacgtn" * 10)[0]
+        assert etm._scan_sequence("ACGT" * 24 + "XXXX")[0] is True
+        assert not etm._scan_sequence("ACGT" * 20 + "X" * 20)[0]
+        assert not etm._scan_sequence("MKTAYIAKQRQISFVKSHFSRQ")[0]
+        assert not etm._scan_sequence("")[0]
+
+    @pytest.mark.asyncio
+    async def test_mock_alignment_pads_sequences(self):
+        """Test the mock alignment pads every sequence to the longest"""
+        manager = ExternalToolManager()
+        manager.docker_client = None
+
+        result = await manager.execute_multiple_alignment(["ACGT", "AC"], "muscle")
+
+        assert result["alignment"] == ">sequence_1\nACGT\n>sequence_2\nAC--"
+
+    @pytest.mark.asyncio
+    async def test_docker_availability_flag(self, tool_manager, mock_docker_client):
+        """Test availability follows the client and a failed pull re-checks the daemon"""
+        assert tool_manager._is_docker_available()
+
+        mock_docker_client.images.pull.side_effect = docker.errors.APIError("daemon gone")
+        mock_docker_client.ping.side_effect = docker.errors.APIError("daemon gone")
+        assert "error" in await tool_manager.pull_container_image("blast")
+        assert not tool_manager._is_docker_available()
+
+        mock_docker_client.images.pull.side_effect = None
+        mock_docker_client.ping.side_effect = None
+        assert (await tool_manager.pull_container_image("blast"))["status"] == "success"
+        assert tool_manager._is_docker_available()
+
+        tool_manager.docker_client = None
+        assert not tool_manager._is_docker_available()
+
+    @pytest.mark.asyncio
+    async def test_cleanup_removes_oldest_executions(self, tool_manager):
+        """Test cleanup drops expired executions from the front of the history"""
+        now = asyncio.get_running_loop().time()
+        for execution_id, timestamp in [("old1", now - 7200), ("old2", now - 5400), ("new", now)]:
+            tool_manager._record_execution(execution_id, {"timestamp": timestamp})
+        tool_manager._cleanup_task.cancel()
+
+        result = await tool_manager.cleanup_old_executions(max_age_hours=1)
+
+        assert result["cleaned_executions"] == 2
+        assert list(tool_manager.execution_history) == ["new"]
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_result_cache_key_is_canonical(self, tool_manager, monkeypatch, use_orjson):
+        """Test cache keys ignore parameter order, with or without orjson"""
+        if not use_orjson:
+            monkeypatch.setattr(etm, "orjson", None)
+
+        key = tool_manager._result_cache_key("muscle", ["ACGT"], {"maxiters": 2, "diags": True, "big": 2**70})
+
+        assert key == tool_manager._result_cache_key("muscle", ["ACGT"], {"big": 2**70, "diags": True, "maxiters": 2})
+        assert key != tool_manager._result_cache_key("muscle", ["ACGT"], {"maxiters": 3, "diags": True, "big": 2**70})
+
+    @pytest.mark.asyncio
+    async def test_blast_query_whitespace_removed(self, tool_manager, mock_docker_client):
+        """Test wrapped or pasted queries are accepted and run without their whitespace"""
+        container = mock_docker_client.containers.run.return_value
+        container.outputs = {"blast_results.xml": "<BlastOutput/>"}
+
+        validation = await tool_manager.validate_tool_input("blast", "ACGTACGT\nACGT ACGT\r\n")
+        result = await tool_manager.execute_blast_search("ACGTACGT\nACGT ACGT\r\n", "nt")
+        [batched] = await tool_manager.execute_blast_search_batch(["ACGTACGTACGTACGT"], "nt")
+
+        assert validation["valid"]
+        assert result["status"] == "success"
+        assert _without_execution_id(batched) == _without_execution_id(result)
+        assert [inputs for _, inputs in container.runs] == [
+            {"query.fasta": ">query_sequence\nACGTACGTACGTACGT\n"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_malformed_queries_rejected_before_running(self, tool_manager, mock_docker_client):
+        """Test invalid sequence characters are reported and never reach a container"""
+        validation = await tool_manager.validate_tool_input("blast", "ACGT ACGT1ACGT")
+        assert not validation["valid"]
+        assert validation["errors"] == ["Query sequence has 1 invalid characters at positions 9"]
+
+        validation = await tool_manager.validate_tool_input("muscle", ["ACGT", "MKT-AY*", "AC.GT"])
+        assert validation["errors"] == ["Sequence 3 has 1 invalid characters at positions 3"]
+
+        result = await tool_manager.execute_blast_search("ACGT\nAC1GT", "nt")
+        batch = await tool_manager.execute_blast_search_batch(["ACGT ACGT\n", "AC GT.?"], "nt")
+
+        assert "invalid characters" in result["error"]
+        assert "error" not in batch[0] and "invalid characters" in batch[1]["error"]
+        assert [inputs for _, inputs in mock_docker_client.containers.run.return_value.runs] == [
+            {"query.fasta": ">query_sequence\nACGTACGT\n"}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_resource_limits_on_every_container(self, tool_manager, mock_docker_client):
+        """Test tool and custom containers all run without network and with limits"""
+        await tool_manager.execute_blast_search("ACGTACGTAC", "nt")
+        await tool_manager.execute_multiple_alignment(["ACGT", "AGGT"], "muscle")
+        await tool_manager.execute_custom_container("busybox", ["true"], {})
+        tool_manager._cleanup_task.cancel()
+
+        limits = [
+            {name: call.kwargs[name] for name in ("network_mode", "mem_limit", "cpu_quota", "pids_limit")}
+            for call in mock_docker_client.containers.run.call_args_list
+        ]
+        assert limits == [
+            {"network_mode": "none", "mem_limit": "4g", "cpu_quota": 200000, "pids_limit": 256},
+            {"network_mode": "none", "mem_limit": "2g", "cpu_quota": 100000, "pids_limit": 256},
+            {"network_mode": "none", "mem_limit": "2g", "cpu_quota": 100000, "pids_limit": 256}
+        ]
+
+    @pytest.mark.asyncio
+    async def test_docker_calls_share_one_executor(self, tool_manager, mock_docker_client):
+        """Test blocking Docker calls of every manager run on the shared executor threads"""
+        threads = []
+        mock_docker_client.ping.side_effect = lambda: threads.append(threading.current_thread().name)
+        other = ExternalToolManager()
+        other.docker_client = mock_docker_client
+
+        for manager in (tool_manager, other):
+            await manager._refresh_docker_available()
+
+        assert len(threads) == 2 and all(name.startswith("etm") for name in threads)
+        assert etm._DOCKER_EXECUTOR._max_workers == etm.MAX_PARALLEL_RUNS + 4
+
+    @pytest.mark.asyncio
+    async def test_native_binary_preferred_over_container(self, tool_manager, mock_docker_client, monkeypatch, tmp_path):
+        """Test an installed BLAST binary runs in its own directory, even without Docker"""
+        blastn = tmp_path / "blastn"
+        blastn.write_text('#!/bin/sh\necho "native $*"\ncat query.fasta > blast_results.xml\n')
+        blastn.chmod(0o755)
+        monkeypatch.setenv("PATH", f"{tmp_path}{os.pathsep}{os.environ['PATH']}")
+        monkeypatch.setattr(etm, "USE_NATIVE_TOOLS", True)
+
+        result = await tool_manager.execute_blast_search("ACGTACGTAC", "nt")
+        tool_manager.docker_client = None
+        protein = await tool_manager.execute_blast_search("MKTAYIAKQR", "nr")
+
+        assert result["exit_code"] == 0
+        assert result["output"] == ">query_sequence\nACGTACGTAC\n"
+        assert result["logs"].startswith("native -query query.fasta -db nt ")
+        # No blastp on the host and no Docker left, so the protein query is mocked
+        assert "hits" in protein["results"]
+        mock_docker_client.containers.run.assert_not_called()
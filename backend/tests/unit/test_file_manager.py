@@ -2,9 +2,9 @@
 import pytest
 import tempfile
 from pathlib import Path
-from fastapi import UploadFile
+from fastapi import UploadFile, HTTPException
 from io import BytesIO
-from app.services.file_manager import FileManager
+from app.services.file_manager import FileManager, HASH_ALGO, _new_file_hasher
 
 class TestFileManager:
     """Unit tests for FileManager"""
@@ -40,6 +40,7 @@ class TestFileManager:
         assert result["category"] == "sequences"
         assert result["user_id"] == "user123"
         assert "hash" in result
+        assert result["hash_algorithm"] == HASH_ALGO
         assert result["format_info"]["format"] == "fasta"
     
     @pytest.mark.asyncio
@@ -53,10 +54,26 @@ class TestFileManager:
             size=len(large_content)
         )
         
-        with pytest.raises(Exception) as exc_info:
+        with pytest.raises(HTTPException) as exc_info:
             await file_manager.upload_file(file_obj)
         
-        assert "exceeds maximum allowed size" in str(exc_info.value)
+        assert exc_info.value.status_code == 413
+        assert "exceeds maximum allowed size" in exc_info.value.detail
+    
+    @pytest.mark.asyncio
+    async def test_oversize_upload_aborts_while_streaming(self, file_manager):
+        """Test an upload without a declared size stops being read once past the limit"""
+        file_manager.max_file_size = 1000
+        file_manager.UPLOAD_CHUNK_SIZE = 100
+        stream = BytesIO(b"A" * 5000)
+        file_obj = UploadFile(filename="large_file.fasta", file=stream)
+        
+        with pytest.raises(HTTPException) as exc_info:
+            await file_manager.upload_file(file_obj, "user123", "sequences")
+        
+        assert exc_info.value.status_code == 413
+        assert stream.closed
+        assert not any(path.is_file() for path in file_manager.upload_dir.rglob("*"))
     
     @pytest.mark.asyncio
     async def test_file_validation_extension(self, file_manager):
@@ -73,6 +90,22 @@ class TestFileManager:
         
         assert "is not allowed" in str(exc_info.value)
     
+    @pytest.mark.asyncio
+    async def test_ingest_stores_and_hashes_in_one_pass(self, file_manager, temp_directory):
+        """Test the file is written, sized and hashed from one read over many chunks"""
+        file_content = b"ACGT" * 1000
+        file_obj = UploadFile(filename="test.fasta", file=BytesIO(file_content), size=len(file_content))
+        file_manager.UPLOAD_CHUNK_SIZE = 333
+        dst_path = temp_directory / "stored.part"
+        
+        size, file_hash, _ = await file_manager._ingest(file_obj, dst_path)
+        
+        expected = _new_file_hasher()
+        expected.update(file_content)
+        assert (size, file_hash) == (len(file_content), expected.hexdigest())
+        assert len(file_hash) == 32
+        assert dst_path.read_bytes() == file_content
+    
     @pytest.mark.asyncio
     async def test_detect_fasta_format(self, file_manager, sample_fasta_content, temp_directory):
         """Test FASTA format detection"""
@@ -84,7 +117,50 @@ class TestFileManager:
         assert format_info["format"] == "fasta"
         assert format_info["details"]["sequence_count"] == 3
         assert "DNA" in format_info["details"]["detected_types"]
-    
+
+    @pytest.mark.asyncio
+    async def test_analyze_fastq_stats(self, file_manager, temp_directory):
+        """Test FASTQ read and phred quality statistics"""
+        fastq_file = temp_directory / "test.fastq"
+        fastq_file.write_text("@r1\nACGT\n+\n!!II\n@r2\nAC\n+\n5+\n")
+
+        details = (await file_manager._analyze_fastq(fastq_file))["details"]
+
+        assert (details["read_count"], details["total_bases"]) == (2, 6)
+        assert (details["min_length"], details["max_length"]) == (2, 4)
+        assert details["quality_stats"] == {
+            "min_quality": 0, "max_quality": 40, "average_quality": pytest.approx(110 / 6)
+        }
+        assert not details["estimated"]
+
+    @pytest.mark.asyncio
+    async def test_analyze_fastq_extrapolates_past_sample(self, file_manager, temp_directory):
+        """Test FASTQ totals are estimated from the sampled reads once the cap is hit"""
+        fastq_file = temp_directory / "test.fastq"
+        fastq_file.write_text("@read\nACGTACGT\n+\nIIIIIIII\n" * 1000)
+        file_manager.MAX_SAMPLE_READS = 50
+
+        details = (await file_manager._analyze_fastq(fastq_file))["details"]
+
+        assert details["estimated"]
+        assert details["sampled_reads"] == 50
+        assert (details["read_count"], details["total_bases"]) == (1000, 8000)
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("record", [
+        b"@read\r\nACGTACGT\r\n+\r\nIIIIIIII\r\n",
+        b"@read one\nACGTACGT\n+read one\nIIIIIIII\n"
+    ])
+    async def test_analyze_fastq_estimate_uses_bytes_read(self, file_manager, temp_directory, record):
+        """Test the estimate holds for CRLF files and repeated titles on the '+' line"""
+        fastq_file = temp_directory / "test.fastq"
+        fastq_file.write_bytes(record * 1000)
+        file_manager.MAX_SAMPLE_READS = 50
+
+        details = (await file_manager._analyze_fastq(fastq_file))["details"]
+
+        assert (details["read_count"], details["total_bases"]) == (1000, 8000)
+
     @pytest.mark.asyncio
     async def test_cleanup_temp_files(self, file_manager):
         """Test temporary file cleanup"""
@@ -0,0 +1,46 @@
+# backend/tests/unit/test_multiple_alignment.py - Unit Tests for Multiple Alignment
+import pytest
+from app.services import multiple_alignment
+from app.services.multiple_alignment import MultipleAlignmentService
+
+@pytest.fixture(params=["numpy", "kernel"])
+def alignment_service(request, monkeypatch):
+    """Multiple alignment service, computing identities with NumPy or the pairwise kernel"""
+    if request.param == "kernel":
+        monkeypatch.setattr(multiple_alignment, "PARALLEL_IDENTITY_MIN_SEQUENCES", 2)
+    return MultipleAlignmentService()
+
+class TestMultipleAlignmentService:
+    """Unit tests for MultipleAlignmentService"""
+
+    def test_average_pairwise_identity(self, alignment_service):
+        """Test average identity over all pairs ignores shared gaps"""
+        sequences = ["AC-GT", "AC-GA", "TC--T"]
+
+        expected = sum(
+            alignment_service._calculate_pairwise_identity(sequences[i], sequences[j])
+            for i, j in [(0, 1), (0, 2), (1, 2)]
+        ) / 3
+
+        assert alignment_service._calculate_average_pairwise_identity(sequences) == pytest.approx(expected)
+        assert expected == pytest.approx((75 + 50 + 25) / 3)
+
+    def test_average_pairwise_identity_unequal_lengths(self, alignment_service):
+        """Test pairs of unequal length are compared over the shorter sequence"""
+        sequences = ["ACGT", "AC", "ACGA--"]
+
+        assert alignment_service._calculate_average_pairwise_identity(sequences) == pytest.approx(
+            (100 + 75 + 100) / 3
+        )
+        assert alignment_service._calculate_average_pairwise_identity(["ACGT"]) == 100.0
+
+    @pytest.mark.skipif(multiple_alignment.njit is None, reason="Numba not installed")
+    def test_warm_up_compiles_every_signature_used(self, alignment_service):
+        """Test alignments need no further compilation once the kernel is warmed up"""
+        multiple_alignment.warm_up_kernels()
+        signatures = list(multiple_alignment._pairwise_identity_total.signatures)
+
+        alignment_service._calculate_average_pairwise_identity(["ACGT", "AC-T", "TCGA"])
+        alignment_service._calculate_average_pairwise_identity(["ACGT", "AC", "ACGA--"])
+
+        assert multiple_alignment._pairwise_identity_total.signatures == signatures